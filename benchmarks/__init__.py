@@ -0,0 +1,4 @@
+"""Benchmarks for clip-util.
+
+Run a benchmark from the repository root, e.g. `python -m benchmarks.import_time`.
+"""
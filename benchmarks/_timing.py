@@ -0,0 +1,50 @@
+"""Timing helpers shared by the benchmarks."""
+
+import statistics
+import timeit
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Sequence
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> Dict[str, float]:
+    """Time `func`, returning seconds per call.
+
+    The number of calls per sample is picked with `timeit.Timer.autorange`,
+    so fast and slow functions both get samples of roughly 0.2 seconds.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    samples: List[float] = [t / number for t in timer.repeat(repeat, number)]
+    return {
+        "best": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "calls": float(number * repeat),
+    }
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration with a sensible unit."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def format_size(size: int) -> str:
+    """Format a size in bytes with a binary unit."""
+    for unit, scale in (("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if size >= scale:
+            return f"{size / scale:.1f} {unit}"
+    return f"{size} B"
+
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence[str]]) -> None:
+    """Print rows as a plain text table."""
+    widths = [
+        max(len(str(row[i])) for row in [headers, *rows]) for i in range(len(headers))
+    ]
+    for row in [headers, ["-" * width for width in widths], *rows]:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)))
@@ -0,0 +1,127 @@
+"""Multithreaded clipboard stress benchmark.
+
+Threads set and read the in-memory clipboard at once, either opening it
+themselves, racing on `open_clipboard` as the convenience functions used to,
+or through the `ClipboardBroker`. Reports throughput, failed round trips, and
+the broker's queue depth and wait times.
+
+    python -m benchmarks.broker
+"""
+
+import argparse
+import sys
+import threading
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Sequence
+
+from benchmarks._timing import format_time
+from benchmarks._timing import print_table
+from clipboard import Clipboard
+from clipboard import ClipboardBroker
+from clipboard.backends import set_backend
+from clipboard.backends.memory import MemoryBackend
+
+
+THREADS: Sequence[int] = (1, 4, 16, 64)
+
+
+def round_trip(clipboard: Clipboard, text: str) -> bool:
+    """Set, then read back, with the clipboard opened once for each."""
+    try:
+        with clipboard:
+            clipboard.set_clipboard(text)
+        with clipboard:
+            return clipboard.get_clipboard() is not None
+        return False
+    except Exception:
+        # `__enter__` raises once it runs out of tries.
+        return False
+
+
+def stress(
+    threads: int, operations: int, run: Callable[[int], bool]
+) -> Dict[str, float]:
+    """Run `operations` round trips on each of `threads` threads."""
+    failures: List[int] = []
+    start = threading.Barrier(threads + 1)
+
+    def worker() -> None:
+        start.wait()
+        failed = sum(not run(i) for i in range(operations))
+        failures.append(failed)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    return {
+        "elapsed": elapsed,
+        "per_second": threads * operations / elapsed,
+        "failed": float(sum(failures)),
+    }
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=500)
+    args = parser.parse_args(argv or None)
+
+    set_backend(MemoryBackend())
+    # Created before any thread, so the clipboard formats are registered.
+    Clipboard()
+
+    rows: List[List[str]] = []
+    for threads in THREADS:
+        direct = stress(
+            threads,
+            args.operations,
+            lambda i: round_trip(Clipboard(), f"direct {i}"),
+        )
+
+        broker = ClipboardBroker()
+        brokered = stress(
+            threads,
+            args.operations,
+            lambda i: broker.call(round_trip, Clipboard(), f"broker {i}"),
+        )
+        metrics = broker.metrics()
+        broker.shutdown()
+
+        rows.append(
+            [
+                str(threads),
+                f"{direct['per_second']:.0f}/s",
+                f"{direct['failed']:.0f}",
+                f"{brokered['per_second']:.0f}/s",
+                f"{brokered['failed']:.0f}",
+                f"{metrics['max_queue_depth']:.0f}",
+                format_time(metrics["mean_wait_time"]),
+                format_time(metrics["max_wait_time"]),
+            ]
+        )
+
+    print_table(
+        [
+            "threads",
+            "direct",
+            "failed",
+            "broker",
+            "failed",
+            "max queue",
+            "mean wait",
+            "max wait",
+        ],
+        rows,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
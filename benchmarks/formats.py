@@ -0,0 +1,124 @@
+"""Clipboard format lookup micro-benchmarks.
+
+Times membership tests on `ClipboardFormat`, `get_format_name` and
+`Clipboard._resolve_format`, for standard and registered formats, against the
+list building lookups, and uncached names, they replaced. Names are looked up
+with the in-memory backend, where that is a dictionary lookup, so caching them
+only pays off with the Windows backend's `GetClipboardFormatNameW` calls.
+
+    python -m benchmarks.formats
+"""
+
+import argparse
+import sys
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+from benchmarks._timing import format_time
+from benchmarks._timing import measure
+from benchmarks._timing import print_table
+from clipboard import Clipboard
+from clipboard import ClipboardFormat
+from clipboard import get_format_name
+from clipboard import get_format_names
+from clipboard.backends import set_backend
+from clipboard.backends.memory import MemoryBackend
+
+
+def list_contains(item: Any) -> bool:
+    """What `ClipboardFormat.__contains__` did before."""
+    return any(
+        [
+            item in ClipboardFormat.names,  # type: ignore
+            item in ClipboardFormat.values,  # type: ignore
+            item in ClipboardFormat.__members__.values(),
+        ]
+    )
+
+
+def list_resolve_format(format: Any) -> int:
+    """What `Clipboard._resolve_format` did before, with the string lookup."""
+    from clipboard.formats import ClipboardFormat
+
+    if isinstance(format, ClipboardFormat):
+        format = format.value
+    elif isinstance(format, str):
+        format = ClipboardFormat[format].value
+    if format == ClipboardFormat.HTML_Format.value:
+        format = ClipboardFormat.CF_HTML.value
+    return format
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv or None)
+
+    set_backend(MemoryBackend())
+    clipboard = Clipboard()
+    custom = clipboard.backend.register_clipboard_format("Custom Format")
+    # As on a busy clipboard, mostly formats registered by other applications.
+    available = [1, 13, 16, *range(custom - 6, custom + 1)]
+
+    cases: List[Tuple[str, Callable[[], object], Callable[[], object]]] = [
+        ("13 in", lambda: 13 in ClipboardFormat, lambda: list_contains(13)),
+        (
+            "'text' in",
+            lambda: "text" in ClipboardFormat,
+            lambda: list_contains("text"),
+        ),
+        ("0 in", lambda: 0 in ClipboardFormat, lambda: list_contains(0)),
+        (
+            "get_format_name(13)",
+            lambda: get_format_name(13),
+            lambda: ClipboardFormat(13).name if 13 in ClipboardFormat.values else None,
+        ),
+        (
+            "get_format_name(custom)",
+            lambda: get_format_name(custom),
+            lambda: clipboard.backend.get_clipboard_format_name(custom),
+        ),
+        (
+            "get_format_names(10 ids)",
+            lambda: get_format_names(available),
+            lambda: {
+                format: clipboard.backend.get_clipboard_format_name(format)
+                for format in available
+            },
+        ),
+        (
+            "_resolve_format(13)",
+            lambda: clipboard._resolve_format(13),
+            lambda: list_resolve_format(13),
+        ),
+        (
+            "_resolve_format('text')",
+            lambda: clipboard._resolve_format("text"),
+            lambda: list_resolve_format("text"),
+        ),
+        (
+            "_resolve_format(enum)",
+            lambda: clipboard._resolve_format(ClipboardFormat.CF_UNICODETEXT),
+            lambda: list_resolve_format(ClipboardFormat.CF_UNICODETEXT),
+        ),
+    ]
+
+    rows: List[List[str]] = []
+    for name, current, baseline in cases:
+        rows.append(
+            [
+                name,
+                format_time(measure(baseline, args.repeat)["median"]),
+                format_time(measure(current, args.repeat)["median"]),
+            ]
+        )
+
+    print_table(["lookup", "before", "registry"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
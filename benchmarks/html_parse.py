@@ -0,0 +1,63 @@
+"""CF_HTML parsing benchmark.
+
+Compares `parse_html_clipboard`, on the raw bytes, with decoding the whole
+payload and slicing the fragment out of the string, on 10+ MB payloads.
+
+    python -m benchmarks.html_parse
+"""
+
+import argparse
+import sys
+from typing import List
+from typing import Sequence
+
+from benchmarks._timing import format_size
+from benchmarks._timing import format_time
+from benchmarks._timing import measure
+from benchmarks._timing import print_table
+from benchmarks.html_template import make_html
+from clipboard.html_clipboard import HTML_ENCODING
+from clipboard.html_clipboard import HTMLTemplate
+from clipboard.html_clipboard import parse_html_clipboard
+
+
+SIZES: Sequence[int] = (1 << 20, 10 << 20, 32 << 20)
+
+
+def decode_and_slice(data: bytes) -> str:
+    """What consumers did before: decode it all, then parse the header."""
+    text = data.decode(HTML_ENCODING)
+    header = dict(line.split(":", 1) for line in text.splitlines()[:5] if ":" in line)
+    encoded = text.encode(HTML_ENCODING)
+    start, end = int(header["StartFragment"]), int(header["EndFragment"])
+    return encoded[start:end].decode(HTML_ENCODING)
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv or None)
+
+    rows: List[List[str]] = []
+    for size in SIZES:
+        data = HTMLTemplate(make_html(size)).encode() + b"\x00"
+        baseline = measure(lambda: decode_and_slice(data), args.repeat)
+        parse = measure(lambda: parse_html_clipboard(data), args.repeat)
+        parse_decode = measure(
+            lambda: parse_html_clipboard(data).fragment_text(), args.repeat
+        )
+        rows.append(
+            [
+                format_size(len(data)),
+                format_time(baseline["median"]),
+                format_time(parse["median"]),
+                format_time(parse_decode["median"]),
+            ]
+        )
+
+    print_table(["size", "decode + slice", "parse", "parse + fragment_text()"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
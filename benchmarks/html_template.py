@@ -0,0 +1,58 @@
+"""CF_HTML encoding benchmark.
+
+Compares `HTMLTemplate.generate()`, encoded to bytes the way `set_clipboard`
+used to, with the single pass `HTMLTemplate.encode()`.
+
+    python -m benchmarks.html_template
+"""
+
+import argparse
+import sys
+from typing import List
+from typing import Sequence
+
+from benchmarks._timing import format_size
+from benchmarks._timing import format_time
+from benchmarks._timing import measure
+from benchmarks._timing import print_table
+from clipboard.html_clipboard import HTML_ENCODING
+from clipboard.html_clipboard import HTMLTemplate
+
+
+SIZES: Sequence[int] = (1 << 10, 1 << 20, 10 << 20)
+
+
+def make_html(size: int) -> str:
+    """HTML table of roughly `size` bytes, with some non-ASCII text."""
+    row = "<tr><td>Größe</td><td>12345</td><td>naïve café</td></tr>\n"
+    count = max(1, size // len(row.encode(HTML_ENCODING)))
+    return "<table>\n" + row * count + "</table>"
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv or None)
+
+    rows: List[List[str]] = []
+    for size in SIZES:
+        html = make_html(size)
+        generate = measure(
+            lambda: HTMLTemplate(html).generate().encode(HTML_ENCODING), args.repeat
+        )
+        encode = measure(lambda: HTMLTemplate(html).encode(), args.repeat)
+        rows.append(
+            [
+                format_size(size),
+                format_time(generate["median"]),
+                format_time(encode["median"]),
+                f"{generate['median'] / encode['median']:.1f}x",
+            ]
+        )
+
+    print_table(["size", "generate().encode()", "encode()", "speedup"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
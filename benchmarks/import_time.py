@@ -0,0 +1,136 @@
+"""Import time benchmark.
+
+Measures `import clipboard`, and `from clipboard import get_clipboard`, with
+`python -X importtime` in fresh interpreters, and exits with a non-zero status
+if the median import time of either exceeds its budget, or if importing loaded
+modules that should only load on first use.
+
+    python -m benchmarks.import_time --budget-scale 2
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Sequence
+
+
+class Case(NamedTuple):
+    statement: str
+    # Maximum median import time in microseconds.
+    budget_us: int
+    # Modules that must not be loaded by the statement.
+    lazy_modules: Sequence[str]
+
+
+CASES: Sequence[Case] = (
+    Case(
+        "import clipboard",
+        10_000,
+        (
+            "ctypes",
+            "clipboard._c_interface",
+            "clipboard.backends",
+            "clipboard.clipboard",
+            "clipboard.formats",
+        ),
+    ),
+    Case(
+        "from clipboard import get_clipboard",
+        40_000,
+        (
+            "clipboard.formats",
+            "clipboard.images",
+            "clipboard.streams",
+            "clipboard.broker",
+            "concurrent.futures",
+        ),
+    ),
+)
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    """Cumulative import time, in microseconds, of every top-level import."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header
+        if name.startswith("  "):
+            continue  # imported by a module already counted
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def import_time(statement: str) -> int:
+    """Import time, in microseconds, of the `clipboard` modules `statement` loads.
+
+    `from clipboard import name` imports the package, and then the module
+    `name` is loaded from on first access, so both are counted.
+    """
+    times = import_times(statement)
+    return sum(
+        cumulative
+        for name, cumulative in times.items()
+        if name == "clipboard" or name.startswith("clipboard.")
+    )
+
+
+def loaded_modules(statement: str, lazy_modules: Sequence[str]) -> List[str]:
+    """Modules in `lazy_modules` loaded by running `statement`."""
+    code = (
+        f"import sys; {statement}; "
+        f"print('\\n'.join(m for m in {list(lazy_modules)!r} if m in sys.modules))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return process.stdout.split()
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument(
+        "--budget-scale",
+        type=float,
+        default=1.0,
+        help="Multiply every budget, e.g. on a slow machine.",
+    )
+    args = parser.parse_args(argv or None)
+
+    failed = False
+    for case in CASES:
+        budget = case.budget_us * args.budget_scale
+        samples = [import_time(case.statement) for _ in range(args.runs)]
+        median = statistics.median(samples)
+        print(
+            f"{case.statement}: median {median:.0f} us, best {min(samples)} us"
+            f" ({args.runs} runs, budget {budget:.0f} us)"
+        )
+
+        if median > budget:
+            print(f"FAIL: import time over budget by {median - budget:.0f} us")
+            failed = True
+        eager = loaded_modules(case.statement, case.lazy_modules)
+        if eager:
+            print(f"FAIL: loaded on import: {', '.join(eager)}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
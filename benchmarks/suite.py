@@ -0,0 +1,337 @@
+"""Benchmark suite, with JSON results for tracking regressions.
+
+Times CF_HTML generation, format resolution, format names, `ClipboardFormat`
+membership, PNG and CF_HDROP encoding and decoding, and
+`set_clipboard`/`get_clipboard` round trips from 1 KiB to 100 MiB. Round trips
+use the process-wide backend: the real clipboard on Windows, and the in-memory
+backend everywhere else, unless `--backend` is given.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare results.json
+
+With `--compare`, each benchmark is compared with the same one in an earlier
+results file, and the exit status is non-zero if any got slower than
+`--threshold` times.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import struct
+import sys
+import zlib
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from benchmarks._timing import format_size
+from benchmarks._timing import format_time
+from benchmarks._timing import measure
+from benchmarks._timing import print_table
+from benchmarks.html_template import make_html
+from clipboard import Clipboard
+from clipboard import ClipboardFormat
+from clipboard import get_clipboard
+from clipboard import get_format_name
+from clipboard import get_image
+from clipboard import set_clipboard
+from clipboard import set_image
+from clipboard.backends import default_backend_name
+from clipboard.backends import get_backend
+from clipboard.backends import set_backend
+from clipboard.files import decode_dropfiles
+from clipboard.files import encode_dropfiles
+from clipboard.html_clipboard import HTMLTemplate
+from clipboard.images import PNG_SIGNATURE
+from clipboard.images import Bitmap
+from clipboard.images import decode_png
+from clipboard.images import parse_dib
+
+
+ROUND_TRIP_SIZES: Sequence[int] = (
+    1 << 10,
+    64 << 10,
+    1 << 20,
+    10 << 20,
+    100 << 20,
+)
+HTML_SIZES: Sequence[int] = (1 << 10, 1 << 20)
+# Paths in the CF_HDROP lists encoded and decoded.
+FILE_COUNTS: Sequence[int] = (100, 10_000)
+# Width and height of the screenshot encoded and decoded.
+IMAGE_SIZE: Tuple[int, int] = (1280, 720)
+
+# (name, function, payload size in bytes or None)
+Benchmark = Tuple[str, Callable[[], object], Optional[int]]
+
+
+def make_text(size: int) -> str:
+    """Text of `size` characters, with some non-ASCII ones."""
+    line = "The quick brown fox jumps over the lazy dog. Größe, naïve café.\r\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+def make_screenshot(width: int, height: int) -> bytes:
+    """A 32-bit CF_DIB, of flat areas and gradients like a screenshot."""
+    header = (40, width, height, 1, 32, 0, width * height * 4, 0, 0, 0, 0)
+    rows = []
+    for y in range(height):
+        band = bytes([y % 256, 255 - y % 256, 128, 0])
+        rows.append(band * (width // 2) + bytes(range(256)) * (width * 2 // 256))
+    return struct.pack("<IiiHHIIiiII", *header) + b"".join(rows)
+
+
+def make_filtered_png(bitmap: Bitmap, filter_type: int) -> bytes:
+    """A PNG file of a 32-bit bitmap's rows, each marked with `filter_type`.
+
+    The rows are only marked, as filtering them would take longer than the
+    benchmark, and undoing the filter is the same work either way.
+    """
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(kind + data)
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+    ihdr = struct.pack(">IIBBBBB", bitmap.width, bitmap.height, 8, 6, 0, 0, 0)
+    raw = b"".join(bytes([filter_type]) + bytes(row) for row in bitmap.rows())
+    return (
+        PNG_SIGNATURE
+        + chunk(b"IHDR", ihdr)
+        + chunk(b"IDAT", zlib.compress(raw, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def image_round_trip(png: bytes) -> None:
+    """Set and get a PNG file, which is never decoded."""
+    set_image(png)
+    if get_image() != png:
+        raise RuntimeError("The clipboard changed during the benchmark.")
+
+
+def benchmarks(max_size: int) -> List[Benchmark]:
+    """Every benchmark, with round trips of up to `max_size` bytes."""
+    clipboard = Clipboard()
+    custom = clipboard.backend.register_clipboard_format("clip-util benchmark")
+
+    cases: List[Benchmark] = []
+    for size in HTML_SIZES:
+        # Bound as defaults, as the loop variables change.
+        html = make_html(size)
+        cases.append(
+            (
+                f"html.generate[{size}]",
+                lambda html=html: HTMLTemplate(html).generate(),
+                size,
+            )
+        )
+        cases.append(
+            (
+                f"html.encode[{size}]",
+                lambda html=html: HTMLTemplate(html).encode(),
+                size,
+            )
+        )
+
+    width, height = IMAGE_SIZE
+    bitmap = parse_dib(make_screenshot(width, height))
+    png = bitmap.to_png()
+    image_size = len(bitmap.pixels)
+    cases += [
+        (f"image.to_png[{width}x{height}]", bitmap.to_png, image_size),
+        (f"image.decode_png[{width}x{height}]", lambda: decode_png(png), image_size),
+        ("image.round_trip[png]", lambda: image_round_trip(png), len(png)),
+    ]
+    # The filters predicting from the left, which can not be undone a row at a
+    # time.
+    for filter_type, filter_name in ((3, "average"), (4, "paeth")):
+        filtered = make_filtered_png(bitmap, filter_type)
+        cases.append(
+            (
+                f"image.decode_png[{filter_name}]",
+                lambda filtered=filtered: decode_png(filtered),
+                image_size,
+            )
+        )
+
+    for count in FILE_COUNTS:
+        paths = [rf"C:\Users\me\Documents\file {i:05}.txt" for i in range(count)]
+        dropfiles = encode_dropfiles(paths)
+        cases += [
+            (
+                f"files.encode[{count}]",
+                lambda paths=paths: encode_dropfiles(paths),
+                len(dropfiles),
+            ),
+            (
+                f"files.decode[{count}]",
+                lambda dropfiles=dropfiles: decode_dropfiles(dropfiles),
+                len(dropfiles),
+            ),
+        ]
+
+    cases += [
+        ("resolve_format[int]", lambda: clipboard._resolve_format(13), None),
+        ("resolve_format[str]", lambda: clipboard._resolve_format("text"), None),
+        (
+            "resolve_format[enum]",
+            lambda: clipboard._resolve_format(ClipboardFormat.CF_UNICODETEXT),
+            None,
+        ),
+        ("format_name[standard]", lambda: get_format_name(13), None),
+        ("format_name[registered]", lambda: get_format_name(custom), None),
+        ("contains[int]", lambda: 13 in ClipboardFormat, None),
+        ("contains[str]", lambda: "text" in ClipboardFormat, None),
+        ("contains[missing]", lambda: 0 in ClipboardFormat, None),
+    ]
+
+    for size in ROUND_TRIP_SIZES:
+        if size > max_size:
+            continue
+        text = make_text(size)
+
+        def round_trip(text: str = text) -> None:
+            set_clipboard(text, format=ClipboardFormat.CF_UNICODETEXT)
+            if get_clipboard(format=ClipboardFormat.CF_UNICODETEXT) != text:
+                raise RuntimeError("The clipboard changed during the benchmark.")
+
+        cases.append((f"round_trip[{size}]", round_trip, size))
+
+    return cases
+
+
+def run(
+    cases: Sequence[Benchmark], repeat: int, selected: Sequence[str]
+) -> Dict[str, Dict[str, Any]]:
+    """Time the cases whose names contain one of `selected`, or all of them."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, func, size in cases:
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        result: Dict[str, Any] = dict(measure(func, repeat))
+        if size is not None:
+            result["bytes"] = size
+            result["bytes_per_second"] = size / result["median"]
+        results[name] = result
+    return results
+
+
+def environment(backend: str) -> Dict[str, str]:
+    """What the results were measured on."""
+    try:
+        from importlib.metadata import version
+
+        package_version = version("clip-util")
+    except Exception:
+        package_version = "unknown"
+    return {
+        "clip_util": package_version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "backend": backend,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> int:
+    """Print each result against the baseline, returning how many regressed."""
+    rows: List[List[str]] = []
+    regressions = 0
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"]
+        regressed = ratio > threshold
+        regressions += regressed
+        rows.append(
+            [
+                name,
+                format_time(before["median"]),
+                format_time(result["median"]),
+                f"{ratio:.2f}x",
+                "REGRESSED" if regressed else "",
+            ]
+        )
+    print_table(["benchmark", "baseline", "current", "ratio", ""], rows)
+    return regressions
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--backend",
+        default=default_backend_name(),
+        help="Backend for the round trips, 'windows' or 'memory'.",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=max(ROUND_TRIP_SIZES),
+        help="Largest round trip payload, in bytes.",
+    )
+    parser.add_argument(
+        "--select",
+        action="append",
+        default=[],
+        help="Only run benchmarks whose names contain this. Can be repeated.",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with this earlier JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Slowdown, as a ratio of medians, counted as a regression.",
+    )
+    args = parser.parse_args(argv or None)
+
+    set_backend(args.backend)
+    backend = type(get_backend()).__name__
+    results = run(benchmarks(args.max_size), args.repeat, args.select)
+
+    rows: List[List[str]] = []
+    for name, result in results.items():
+        throughput = ""
+        if "bytes" in result:
+            throughput = f"{format_size(int(result['bytes_per_second']))}/s"
+        rows.append(
+            [
+                name,
+                format_time(result["median"]),
+                format_time(result["best"]),
+                throughput,
+            ]
+        )
+    print_table(["benchmark", "median", "best", "throughput"], rows)
+
+    document = {"environment": environment(backend), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+            file.write("\n")
+    else:
+        print(json.dumps(document, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        print()
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,36 +1,189 @@
-from clipboard.clipboard import Clipboard
-from clipboard.clipboard import ClipboardFormat
-from clipboard.clipboard import get_available_formats
-from clipboard.clipboard import get_clipboard
-from clipboard.clipboard import set_clipboard
-from clipboard.errors import ClipboardError
-from clipboard.errors import EmptyClipboardError
-from clipboard.errors import FormatNotSupportedError
-from clipboard.errors import GetClipboardError
-from clipboard.errors import GetFormatsError
-from clipboard.errors import LockError
-from clipboard.errors import OpenClipboardError
-from clipboard.errors import SetClipboardError
-from clipboard.formats import get_format_name
-from clipboard.html_clipboard import HTML_ENCODING
+"""Clipboard utilities.
+
+Names are imported from their modules on first access, so `import clipboard`
+stays cheap for programs that only sometimes touch the clipboard.
+"""
+
+# Nothing is imported eagerly, not even `typing`, as it would dominate the
+# import time.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from clipboard.broker import ClipboardBroker
+    from clipboard.broker import get_broker
+    from clipboard.cache import ReadCache
+    from clipboard.clipboard import Clipboard
+    from clipboard.clipboard import get_available_formats
+    from clipboard.clipboard import get_clipboard
+    from clipboard.clipboard import get_files
+    from clipboard.clipboard import get_image
+    from clipboard.clipboard import set_clipboard
+    from clipboard.clipboard import set_files
+    from clipboard.clipboard import set_image
+    from clipboard.errors import ClipboardError
+    from clipboard.errors import DropFilesParseError
+    from clipboard.errors import EmptyClipboardError
+    from clipboard.errors import FormatNotSupportedError
+    from clipboard.errors import GetClipboardError
+    from clipboard.errors import GetFormatsError
+    from clipboard.errors import HTMLParseError
+    from clipboard.errors import ImageParseError
+    from clipboard.errors import LockError
+    from clipboard.errors import OpenClipboardError
+    from clipboard.errors import SetClipboardError
+    from clipboard.formats import ClipboardFormat
+    from clipboard.formats import FormatRegistry
+    from clipboard.formats import get_format_name
+    from clipboard.formats import get_format_names
+    from clipboard.formats import get_format_registry
+    from clipboard.formats import register_format
+    from clipboard.html_clipboard import HTML_ENCODING
+    from clipboard.images import Bitmap
+    from clipboard.images import parse_image
+    from clipboard.metrics import MetricsRegistry
+    from clipboard.metrics import disable_metrics
+    from clipboard.metrics import enable_metrics
+    from clipboard.metrics import get_metrics
+    from clipboard.monitor import ClipboardEvent
+    from clipboard.monitor import ClipboardMonitor
+    from clipboard.retry import ContentionStats
+    from clipboard.retry import RetryPolicy
+    from clipboard.retry import get_contention_stats
+    from clipboard.retry import get_retry_policy
+    from clipboard.retry import set_retry_policy
+    from clipboard.snapshot import ClipboardSnapshot
+    from clipboard.tracing import Span
+    from clipboard.tracing import add_trace_hook
+    from clipboard.tracing import remove_trace_hook
+
+
+_LAZY_ATTRIBUTES = {
+    "Clipboard": "clipboard.clipboard",
+    "ClipboardSnapshot": "clipboard.snapshot",
+    "HTML_ENCODING": "clipboard.html_clipboard",
+    "ReadCache": "clipboard.cache",
+    # Retrying
+    "ContentionStats": "clipboard.retry",
+    "RetryPolicy": "clipboard.retry",
+    "get_contention_stats": "clipboard.retry",
+    "get_retry_policy": "clipboard.retry",
+    "set_retry_policy": "clipboard.retry",
+    # Threading
+    "ClipboardBroker": "clipboard.broker",
+    "get_broker": "clipboard.broker",
+    # Monitoring
+    "ClipboardEvent": "clipboard.monitor",
+    "ClipboardMonitor": "clipboard.monitor",
+    # Tracing
+    "Span": "clipboard.tracing",
+    "add_trace_hook": "clipboard.tracing",
+    "remove_trace_hook": "clipboard.tracing",
+    # Metrics
+    "MetricsRegistry": "clipboard.metrics",
+    "disable_metrics": "clipboard.metrics",
+    "enable_metrics": "clipboard.metrics",
+    "get_metrics": "clipboard.metrics",
+    # Images
+    "Bitmap": "clipboard.images",
+    "parse_image": "clipboard.images",
+    # Formats
+    "ClipboardFormat": "clipboard.formats",
+    "FormatRegistry": "clipboard.formats",
+    "get_format_name": "clipboard.formats",
+    "get_format_names": "clipboard.formats",
+    "get_format_registry": "clipboard.formats",
+    "register_format": "clipboard.formats",
+    # Convenience Functions
+    "get_available_formats": "clipboard.clipboard",
+    "get_clipboard": "clipboard.clipboard",
+    "get_files": "clipboard.clipboard",
+    "get_image": "clipboard.clipboard",
+    "set_clipboard": "clipboard.clipboard",
+    "set_files": "clipboard.clipboard",
+    "set_image": "clipboard.clipboard",
+    # Errors
+    "ClipboardError": "clipboard.errors",
+    "DropFilesParseError": "clipboard.errors",
+    "EmptyClipboardError": "clipboard.errors",
+    "FormatNotSupportedError": "clipboard.errors",
+    "GetClipboardError": "clipboard.errors",
+    "GetFormatsError": "clipboard.errors",
+    "HTMLParseError": "clipboard.errors",
+    "ImageParseError": "clipboard.errors",
+    "LockError": "clipboard.errors",
+    "OpenClipboardError": "clipboard.errors",
+    "SetClipboardError": "clipboard.errors",
+}
+
+
+def __getattr__(name: str) -> "Any":
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(__import__(module_name, fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 
 __all__ = [
     "Clipboard",
+    "ClipboardSnapshot",
     "HTML_ENCODING",
+    "ReadCache",
+    # Retrying
+    "ContentionStats",
+    "RetryPolicy",
+    "get_contention_stats",
+    "get_retry_policy",
+    "set_retry_policy",
+    # Threading
+    "ClipboardBroker",
+    "get_broker",
+    # Monitoring
+    "ClipboardEvent",
+    "ClipboardMonitor",
+    # Tracing
+    "Span",
+    "add_trace_hook",
+    "remove_trace_hook",
+    # Metrics
+    "MetricsRegistry",
+    "disable_metrics",
+    "enable_metrics",
+    "get_metrics",
+    # Images
+    "Bitmap",
+    "parse_image",
     # Formats
     "ClipboardFormat",
+    "FormatRegistry",
     "get_format_name",
+    "get_format_names",
+    "get_format_registry",
+    "register_format",
     # Convenience Functions
     "get_available_formats",
     "get_clipboard",
+    "get_files",
+    "get_image",
     "set_clipboard",
+    "set_files",
+    "set_image",
     # Errors
     "ClipboardError",
+    "DropFilesParseError",
     "EmptyClipboardError",
     "FormatNotSupportedError",
     "GetClipboardError",
     "GetFormatsError",
+    "HTMLParseError",
+    "ImageParseError",
     "LockError",
     "OpenClipboardError",
     "SetClipboardError",
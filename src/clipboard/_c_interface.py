@@ -1,89 +1,130 @@
-"""Helper to interface with the C code."""
+"""Helper to interface with the C code.
+
+The libraries are loaded, and each function pointer resolved, on first access
+through the module's `__getattr__`. Resolved functions are cached as module
+globals, so later lookups are plain attribute access.
+"""
 
 import ctypes
 from ctypes.wintypes import BOOL
+from ctypes.wintypes import DWORD
 from ctypes.wintypes import HANDLE
 from ctypes.wintypes import HGLOBAL
+from ctypes.wintypes import HINSTANCE
+from ctypes.wintypes import HMENU
 from ctypes.wintypes import HWND
+from ctypes.wintypes import LPARAM
+from ctypes.wintypes import LPCWSTR
+from ctypes.wintypes import LPHANDLE
+from ctypes.wintypes import LPMSG
 from ctypes.wintypes import LPSTR
 from ctypes.wintypes import LPVOID
 from ctypes.wintypes import LPWSTR
 from ctypes.wintypes import UINT
+from ctypes.wintypes import WORD
+from ctypes.wintypes import WPARAM
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
 
 
 # C Libraries
-windll = ctypes.windll  # type: ignore
-user32 = windll.user32
-kernel32 = windll.kernel32
-
-# C Functions
-
-OpenClipboard = user32.OpenClipboard
-OpenClipboard.argtypes = [HWND]
-OpenClipboard.restype = BOOL
-
-CloseClipboard = user32.CloseClipboard
-CloseClipboard.argtypes = []
-CloseClipboard.restype = BOOL
-
-SetClipboardData = user32.SetClipboardData
-SetClipboardData.argtypes = [UINT, HANDLE]
-SetClipboardData.restype = HANDLE
-
-EmptyClipboard = user32.EmptyClipboard
-EmptyClipboard.argtypes = []
-EmptyClipboard.restype = BOOL
-
-# https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-getclipboarddata
-GetClipboardData = user32.GetClipboardData
-GetClipboardData.argtypes = [UINT]
-GetClipboardData.restype = HANDLE
-
+LIBRARIES: Tuple[str, ...] = ("user32", "kernel32")
 
-IsClipboardFormatAvailable = user32.IsClipboardFormatAvailable
-IsClipboardFormatAvailable.argtypes = [UINT]
-IsClipboardFormatAvailable.restype = BOOL
 
-# Returns first available clipboard format in a specified list
-GetPriorityClipboardFormat = user32.GetPriorityClipboardFormat
-GetPriorityClipboardFormat.argtypes = [UINT, ctypes.c_int]
-GetPriorityClipboardFormat.restype = ctypes.c_int
+def _load_library(name: str) -> Any:
+    # `use_last_error` makes `ctypes.get_last_error` meaningful after each call.
+    library = ctypes.WinDLL(name, use_last_error=True)  # type: ignore
+    globals()[name] = library
+    return library
 
-# w - unicode (utf-16 on windows)
-# a - ansi
-GetClipboardFormatNameA = user32.GetClipboardFormatNameA
-GetClipboardFormatNameA.argtypes = [UINT, LPSTR, ctypes.c_int]
-GetClipboardFormatNameA.restype = ctypes.c_int
 
-GetClipboardFormatNameW = user32.GetClipboardFormatNameW
-GetClipboardFormatNameW.argtypes = [UINT, LPWSTR, ctypes.c_int]
-GetClipboardFormatNameW.restype = ctypes.c_int
-
-# https://learn.microsoft.com/en-us/windows/win32/api/winbase/nf-winbase-globallock
-GlobalLock = kernel32.GlobalLock
-GlobalLock.argtypes = [HGLOBAL]
-# Fails will return NULL
-GlobalLock.restype = LPVOID
-
-# https://learn.microsoft.com/en-us/windows/win32/api/winbase/nf-winbase-globalunlock
-GlobalUnlock = kernel32.GlobalUnlock
-GlobalUnlock.argtypes = [HGLOBAL]
-GlobalUnlock.restype = BOOL
-
-GlobalSize = kernel32.GlobalSize
-GlobalSize.argtypes = [HGLOBAL]
-GlobalSize.restype = int  # SIZE_T
-
-GlobalAlloc = kernel32.GlobalAlloc
-GlobalAlloc.argtypes = [UINT, ctypes.c_int]
-GlobalAlloc.restype = HANDLE
-
-
-EnumClipboardFormats = user32.EnumClipboardFormats
-EnumClipboardFormats.argtypes = [UINT]
-EnumClipboardFormats.restype = UINT
-
-
-# Additional
-CF_HTML = ctypes.windll.user32.RegisterClipboardFormatW("HTML Format")  # type: ignore
-CF_RTF = ctypes.windll.user32.RegisterClipboardFormatW("Rich Text Format")  # type: ignore
+# C Functions
+# name -> (library, argtypes, restype)
+FUNCTIONS: Dict[str, Tuple[str, List[Any], Any]] = {
+    "OpenClipboard": ("user32", [HWND], BOOL),
+    "CloseClipboard": ("user32", [], BOOL),
+    "SetClipboardData": ("user32", [UINT, HANDLE], HANDLE),
+    "EmptyClipboard": ("user32", [], BOOL),
+    # https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-getclipboarddata
+    "GetClipboardData": ("user32", [UINT], HANDLE),
+    "IsClipboardFormatAvailable": ("user32", [UINT], BOOL),
+    # Returns first available clipboard format in a specified list
+    "GetPriorityClipboardFormat": ("user32", [UINT, ctypes.c_int], ctypes.c_int),
+    # w - unicode (utf-16 on windows)
+    # a - ansi
+    "GetClipboardFormatNameA": ("user32", [UINT, LPSTR, ctypes.c_int], ctypes.c_int),
+    "GetClipboardFormatNameW": ("user32", [UINT, LPWSTR, ctypes.c_int], ctypes.c_int),
+    # https://learn.microsoft.com/en-us/windows/win32/api/winbase/nf-winbase-globallock
+    # Fails will return NULL
+    "GlobalLock": ("kernel32", [HGLOBAL], LPVOID),
+    # https://learn.microsoft.com/en-us/windows/win32/api/winbase/nf-winbase-globalunlock
+    "GlobalUnlock": ("kernel32", [HGLOBAL], BOOL),
+    "GlobalSize": ("kernel32", [HGLOBAL], ctypes.c_size_t),
+    "GlobalAlloc": ("kernel32", [UINT, ctypes.c_size_t], HANDLE),
+    # https://learn.microsoft.com/en-us/windows/win32/api/winbase/nf-winbase-globalrealloc
+    "GlobalReAlloc": ("kernel32", [HGLOBAL, ctypes.c_size_t, UINT], HGLOBAL),
+    # Returns NULL on success
+    "GlobalFree": ("kernel32", [HGLOBAL], HGLOBAL),
+    "EnumClipboardFormats": ("user32", [UINT], UINT),
+    "RegisterClipboardFormatW": ("user32", [LPCWSTR], UINT),
+    # https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-getclipboardsequencenumber
+    "GetClipboardSequenceNumber": ("user32", [], DWORD),
+    # Clipboard Format Listener
+    # https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-addclipboardformatlistener
+    "AddClipboardFormatListener": ("user32", [HWND], BOOL),
+    "RemoveClipboardFormatListener": ("user32", [HWND], BOOL),
+    "CreateWindowExW": (
+        "user32",
+        [
+            DWORD,
+            LPCWSTR,
+            LPCWSTR,
+            DWORD,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            HWND,
+            HMENU,
+            HINSTANCE,
+            LPVOID,
+        ],
+        HWND,
+    ),
+    "DestroyWindow": ("user32", [HWND], BOOL),
+    "MsgWaitForMultipleObjects": (
+        "user32",
+        [DWORD, LPHANDLE, BOOL, DWORD, DWORD],
+        DWORD,
+    ),
+    "PeekMessageW": ("user32", [LPMSG, HWND, UINT, UINT, UINT], BOOL),
+    # Delayed Rendering
+    # https://learn.microsoft.com/en-us/windows/win32/dataxchg/clipboard-operations#delayed-rendering
+    "GetClipboardOwner": ("user32", [], HWND),
+    "GetOpenClipboardWindow": ("user32", [], HWND),
+    "GetModuleHandleW": ("kernel32", [LPCWSTR], HINSTANCE),
+    # Takes a `WNDCLASSW`, and returns an ATOM
+    "RegisterClassW": ("user32", [LPVOID], WORD),
+    "DefWindowProcW": ("user32", [HWND, UINT, WPARAM, LPARAM], LPARAM),
+    "GetMessageW": ("user32", [LPMSG, HWND, UINT, UINT], BOOL),
+    "TranslateMessage": ("user32", [LPMSG], BOOL),
+    "DispatchMessageW": ("user32", [LPMSG], LPARAM),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in LIBRARIES:
+        return _load_library(name)
+    try:
+        library_name, argtypes, restype = FUNCTIONS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    library = globals().get(library_name) or _load_library(library_name)
+    function = getattr(library, name)
+    function.argtypes = argtypes
+    function.restype = restype
+    globals()[name] = function
+    return function
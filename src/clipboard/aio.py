@@ -0,0 +1,257 @@
+"""Clipboard access for `asyncio`.
+
+Clipboard ownership is per thread on Windows, so every operating system call
+is made on the `ClipboardBroker`'s thread, and the event loop only awaits it.
+Opening the clipboard is retried with `asyncio.sleep` instead of blocking, and
+concurrent reads of the same formats share a single read.
+"""
+
+import asyncio
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from clipboard.broker import get_broker
+from clipboard.clipboard import HANDLE
+from clipboard.clipboard import Clipboard
+from clipboard.clipboard import ClipboardFormatType
+from clipboard.clipboard import Provider
+from clipboard.errors import OpenClipboardError
+from clipboard.monitor import ClipboardEvent
+from clipboard.monitor import ClipboardMonitor
+from clipboard.retry import RetryPolicy
+from clipboard.retry import get_contention_stats
+from clipboard.retry import get_retry_policy
+from clipboard.snapshot import ClipboardSnapshot
+
+
+T = TypeVar("T")
+
+# (event loop, operation key, clipboard) -> the read in progress
+_in_flight: Dict[
+    Tuple[asyncio.AbstractEventLoop, Hashable, Optional[Clipboard]],
+    "asyncio.Future[Any]",
+] = {}
+
+
+def _attempt(
+    clipboard: Clipboard, operation: Callable[[Clipboard], T]
+) -> Tuple[bool, Optional[T]]:
+    """Open the clipboard once and run `operation`, on the broker's thread.
+
+    Returns whether the clipboard could be opened, and the result.
+    """
+    if not clipboard._open():
+        clipboard._close()
+        return False, None
+    try:
+        return True, operation(clipboard)
+    finally:
+        clipboard._close()
+
+
+async def _run(
+    operation: Callable[[Clipboard], T], clipboard: Optional[Clipboard] = None
+) -> T:
+    """Run `operation` with the clipboard open, retrying without blocking.
+
+    Retries follow the clipboard's `RetryPolicy`, the process-wide one if it
+    has none.
+
+    Raises
+    ------
+    OpenClipboardError
+        If opening the clipboard failed.
+    """
+    if clipboard is None:
+        clipboard = Clipboard()
+    policy: RetryPolicy = (
+        clipboard.retry_policy
+        if clipboard.retry_policy is not None
+        else get_retry_policy()
+    )
+    loop = asyncio.get_running_loop()
+    broker = get_broker()
+    attempts: int = 0
+    waited: float = 0.0
+    for wait in policy.waits():
+        if wait:
+            slept_at = loop.time()
+            await asyncio.sleep(wait)
+            waited += loop.time() - slept_at
+        attempts += 1
+        opened, result = await asyncio.wrap_future(
+            broker.submit(_attempt, clipboard, operation)
+        )
+        if opened:
+            get_contention_stats().record(attempts, waited, opened=True)
+            return result  # type: ignore
+    get_contention_stats().record(attempts, waited, opened=False)
+    raise OpenClipboardError("Failed to open clipboard.")
+
+
+async def _shared(
+    key: Hashable,
+    operation: Callable[[Clipboard], T],
+    clipboard: Optional[Clipboard] = None,
+) -> T:
+    """Run a read, or join the same read if one is already in progress."""
+    loop = asyncio.get_running_loop()
+    in_flight_key = (loop, key, clipboard)
+    future = _in_flight.get(in_flight_key)
+    if future is None:
+        future = asyncio.ensure_future(_run(operation, clipboard))
+        _in_flight[in_flight_key] = future
+
+        def forget(done: "asyncio.Future[Any]") -> None:
+            if _in_flight.get(in_flight_key) is done:
+                del _in_flight[in_flight_key]
+
+        future.add_done_callback(forget)
+    # One awaiter being cancelled does not cancel the read for the others.
+    return await asyncio.shield(future)
+
+
+def _forget_reads() -> None:
+    """Stop sharing the reads in progress, as the clipboard is being set."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _in_flight if key[0] is loop]:
+        del _in_flight[key]
+
+
+async def get_clipboard(
+    format: Optional[ClipboardFormatType] = None,
+    clipboard: Optional[Clipboard] = None,
+) -> Optional[Union[str, bytes]]:
+    """Get the clipboard, without blocking the event loop.
+
+    Like `clipboard.get_clipboard`, the first available format is used if no
+    format is given. Given a `Clipboard`, its backend and retry policy are
+    used.
+
+    Raises
+    ------
+    FormatNotSupportedError
+        If the format is not supported.
+    GetClipboardError
+        If getting the clipboard data failed.
+    OpenClipboardError
+        If opening the clipboard failed.
+    """
+
+    def get(opened: Clipboard) -> Optional[Union[str, bytes]]:
+        resolved = format
+        if resolved is None:
+            available = opened.available_formats()
+            if not available:
+                return None
+            resolved = available[0]
+        return opened.get_clipboard(format=resolved)
+
+    return await _shared(("get", format), get, clipboard)
+
+
+async def set_clipboard(
+    content: Union[
+        str, bytes, Mapping[ClipboardFormatType, Union[str, bytes, Provider]]
+    ],
+    format: Optional[ClipboardFormatType] = None,
+    clipboard: Optional[Clipboard] = None,
+) -> Union[HANDLE, Dict[int, Optional[HANDLE]]]:
+    """Set the clipboard, without blocking the event loop.
+
+    Given a mapping of formats to content, all of them are set together, see
+    `Clipboard.set_many`. The content can be a provider, called only once
+    its format is pasted. Given a `Clipboard`, its backend and retry policy
+    are used.
+
+    Raises
+    ------
+    SetClipboardError
+        If setting the clipboard failed.
+    OpenClipboardError
+        If opening the clipboard failed.
+    """
+
+    def write(opened: Clipboard) -> Union[HANDLE, Dict[int, Optional[HANDLE]]]:
+        if isinstance(content, Mapping):
+            return opened.set_many(content)
+        return opened.set_clipboard(content=content, format=format)
+
+    _forget_reads()
+    return await _run(write, clipboard)
+
+
+async def snapshot(
+    formats: Optional[Iterable[ClipboardFormatType]] = None,
+    clipboard: Optional[Clipboard] = None,
+) -> ClipboardSnapshot:
+    """Read several formats at once, all of them by default.
+
+    See `Clipboard.snapshot`. Given a `Clipboard`, its backend and retry
+    policy are used.
+
+    Raises
+    ------
+    FormatNotSupportedError
+        If a format is not supported.
+    OpenClipboardError
+        If opening the clipboard failed.
+    """
+    if formats is not None:
+        formats = tuple(formats)
+
+    def read(opened: Clipboard) -> ClipboardSnapshot:
+        return opened.snapshot(formats=formats)
+
+    return await _shared(("snapshot", formats), read, clipboard)
+
+
+async def changes(
+    formats: Optional[Iterable[ClipboardFormatType]] = None,
+    debounce: float = 0.0,
+    clipboard: Optional[Clipboard] = None,
+) -> AsyncIterator[ClipboardEvent]:
+    """Yield an event for every change to the clipboard.
+
+    The clipboard is watched by a `ClipboardMonitor`, while the `formats` of
+    each event's snapshot are read on the broker's thread. Given a
+    `Clipboard`, its backend is watched, and its retry policy is used.
+
+    Raises
+    ------
+    FormatNotSupportedError
+        If a format is not supported.
+    """
+    watched = clipboard if clipboard is not None else Clipboard()
+    if formats is not None:
+        formats = tuple(map(watched.resolve_format, formats))
+    monitor = ClipboardMonitor(debounce=debounce, backend=watched.backend)
+    try:
+        async for event in monitor:
+            if formats is not None:
+                try:
+                    event.snapshot = await snapshot(formats, clipboard)
+                except OpenClipboardError:
+                    # Held by another application, like `ClipboardMonitor`.
+                    pass
+            yield event
+    finally:
+        # Not joined, so the event loop is not blocked.
+        monitor.stop(timeout=0)
+
+
+__all__ = [
+    "changes",
+    "get_clipboard",
+    "set_clipboard",
+    "snapshot",
+]
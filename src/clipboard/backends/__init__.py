@@ -0,0 +1,86 @@
+"""Clipboard backends.
+
+The backend is chosen the first time it is needed, so importing `clipboard`
+does not load any operating system libraries. Windows uses the Win32 clipboard
+and every other platform uses the in-memory backend. The choice can be
+overridden with the `CLIPBOARD_BACKEND` environment variable or `set_backend`.
+"""
+
+import importlib
+import os
+import sys
+import threading
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from clipboard.backends.base import ClipboardBackend
+
+
+BACKENDS: Dict[str, Tuple[str, str]] = {
+    "windows": ("clipboard.backends.windows", "WindowsBackend"),
+    "memory": ("clipboard.backends.memory", "MemoryBackend"),
+}
+
+_backend: Optional[ClipboardBackend] = None
+_backend_lock = threading.Lock()
+
+
+def default_backend_name() -> str:
+    """Name of the backend used when none has been set."""
+    name = os.environ.get("CLIPBOARD_BACKEND")
+    if name:
+        return name.lower()
+    if sys.platform == "win32":
+        return "windows"
+    return "memory"
+
+
+def load_backend(name: str) -> ClipboardBackend:
+    """Create a new backend by name.
+
+    Raises
+    ------
+    ValueError
+        If there is no backend with that name.
+    """
+    try:
+        module_name, class_name = BACKENDS[name]
+    except KeyError as exc:
+        raise ValueError(
+            f"{name} is not a clipboard backend. Choose from following {list(BACKENDS)}"
+        ) from exc
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+def get_backend() -> ClipboardBackend:
+    """Return the process-wide backend, loading it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = load_backend(default_backend_name())
+    return _backend
+
+
+def set_backend(backend: Union[str, ClipboardBackend, None]) -> None:
+    """Set the process-wide backend.
+
+    Accepts a backend instance, a backend name, or None to go back to the
+    default on next use.
+    """
+    global _backend
+    if isinstance(backend, str):
+        backend = load_backend(backend.lower())
+    with _backend_lock:
+        _backend = backend
+
+
+__all__ = [
+    "ClipboardBackend",
+    "get_backend",
+    "load_backend",
+    "set_backend",
+]
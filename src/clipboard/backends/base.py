@@ -0,0 +1,158 @@
+"""Clipboard backend interface.
+
+A backend exposes the handful of operating system calls that `Clipboard`
+needs. The method names mirror the Win32 functions they stand in for, and the
+return values follow the same conventions (handles and addresses are integers,
+`None` stands for NULL).
+"""
+
+import time
+from abc import ABC
+from abc import abstractmethod
+from typing import Callable
+from typing import Optional
+
+
+# Seconds between reads of the sequence number when polling for changes.
+POLL_INTERVAL: float = 0.05
+
+
+def poll_for_change(
+    backend: "ClipboardBackend",
+    sequence_number: int,
+    timeout: Optional[float] = None,
+    interval: float = POLL_INTERVAL,
+) -> int:
+    """Poll the sequence number until it differs from `sequence_number`.
+
+    Returns the current sequence number, which is `sequence_number` if
+    `timeout` seconds passed without a change.
+    """
+    deadline: Optional[float] = None
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+    while True:
+        current = backend.get_clipboard_sequence_number()
+        if current != sequence_number:
+            return current
+        if deadline is None:
+            time.sleep(interval)
+            continue
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return current
+        time.sleep(min(interval, remaining))
+
+
+class ClipboardBackend(ABC):
+    """Base class for clipboard backends."""
+
+    name: str = ""
+
+    # Clipboard
+
+    @abstractmethod
+    def open_clipboard(self, hwnd: Optional[int] = None) -> bool:
+        """Open the clipboard, returning True on success."""
+
+    @abstractmethod
+    def close_clipboard(self) -> bool:
+        """Close the clipboard, returning True on success."""
+
+    @abstractmethod
+    def empty_clipboard(self) -> bool:
+        """Empty the clipboard, returning True on success."""
+
+    @abstractmethod
+    def get_clipboard_data(self, format: int) -> Optional[int]:
+        """Return the handle to the data for `format`, None if it failed."""
+
+    @abstractmethod
+    def set_clipboard_data(self, format: int, handle: Optional[int]) -> Optional[int]:
+        """Place `handle` on the clipboard, returning None if it failed."""
+
+    def owner_window(self) -> Optional[int]:
+        """Window to open the clipboard with, to delay rendering formats.
+
+        None if the backend does not need one.
+        """
+        return None
+
+    def delay_render(self, format: int, render: Callable[[], Optional[int]]) -> bool:
+        """Place `format` on the open clipboard without data.
+
+        `render` is called once the format is requested, and returns the
+        handle holding the data, or None if it failed. Returns False if
+        delayed rendering is not supported, the default, in which case the
+        data has to be set right away.
+        """
+        return False
+
+    @abstractmethod
+    def is_clipboard_format_available(self, format: int) -> bool:
+        """Return True if `format` is on the clipboard."""
+
+    @abstractmethod
+    def enum_clipboard_formats(self, format: int) -> int:
+        """Return the format after `format`, or 0 when there are no more.
+
+        Passing 0 returns the first format.
+        """
+
+    @abstractmethod
+    def get_clipboard_sequence_number(self) -> int:
+        """Return the clipboard sequence number, 0 if it is unavailable.
+
+        The number changes whenever the clipboard contents change.
+        """
+
+    def wait_for_change(
+        self, sequence_number: int, timeout: Optional[float] = None
+    ) -> int:
+        """Block until the clipboard changes, returning the sequence number.
+
+        Returns as soon as the sequence number differs from `sequence_number`,
+        or after `timeout` seconds, in which case it is unchanged. Backends
+        that are notified of changes override this, the default polls.
+        """
+        return poll_for_change(self, sequence_number, timeout)
+
+    @abstractmethod
+    def register_clipboard_format(self, name: str) -> int:
+        """Register a named clipboard format, returning its identifier."""
+
+    @abstractmethod
+    def get_clipboard_format_name(self, format: int) -> Optional[str]:
+        """Return the name of a registered format, None if not registered."""
+
+    # Global Memory
+
+    @abstractmethod
+    def global_alloc(self, flags: int, size: int) -> Optional[int]:
+        """Allocate `size` bytes, returning a handle or None if it failed."""
+
+    @abstractmethod
+    def global_lock(self, handle: int) -> Optional[int]:
+        """Lock `handle`, returning the address of its memory."""
+
+    @abstractmethod
+    def global_unlock(self, handle: int) -> bool:
+        """Unlock `handle`, returning True on success."""
+
+    @abstractmethod
+    def global_size(self, handle: int) -> int:
+        """Return the size of `handle` in bytes, 0 if it failed."""
+
+    @abstractmethod
+    def global_realloc(self, handle: int, size: int, flags: int) -> Optional[int]:
+        """Resize unlocked `handle`, returning its handle or None if it failed.
+
+        The contents are kept, up to the smaller of the two sizes.
+        """
+
+    @abstractmethod
+    def global_free(self, handle: int) -> bool:
+        """Free `handle`, returning True on success.
+
+        Memory placed on the clipboard belongs to it, and must not be freed.
+        """
@@ -0,0 +1,243 @@
+"""In-memory clipboard backend.
+
+Emulates the Win32 clipboard within the current process, so the library can be
+used and tested on any platform. Allocations are real `ctypes` buffers, meaning
+the addresses returned by `global_lock` can be read and written with
+`ctypes.memmove` and `from_address` exactly like Windows global memory.
+"""
+
+import ctypes
+import threading
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+from clipboard.backends.base import ClipboardBackend
+
+
+# Registered formats live in the same range Windows uses.
+FIRST_REGISTERED_FORMAT = 0xC000
+
+
+class MemoryBackend(ClipboardBackend):
+    """Backend storing the clipboard in process memory."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+
+        # Clipboard
+        self._owner: Optional[int] = None  # thread that has it opened
+        self._data: Dict[int, Optional[int]] = {}  # format -> handle
+        # Delayed rendering, format -> function returning the handle
+        self._renderers: Dict[int, Callable[[], Optional[int]]] = {}
+        self._sequence_number: int = 1
+        # Changes are published when the clipboard is closed, like the
+        # `WM_CLIPBOARDUPDATE` message, so waiters see whole updates.
+        self._published: int = 1
+        self._changed = threading.Condition(self._lock)
+
+        # Registered Formats
+        self._registered: Dict[str, int] = {}  # casefolded name -> format
+        self._format_names: Dict[int, str] = {}
+
+        # Global Memory
+        self._next_handle: int = 0x1000
+        self._buffers: Dict[int, ctypes.Array] = {}
+        self._lock_counts: Dict[int, int] = {}
+
+    def _is_owner(self) -> bool:
+        return self._owner == threading.get_ident()
+
+    # Clipboard
+
+    def open_clipboard(self, hwnd: Optional[int] = None) -> bool:
+        with self._lock:
+            if self._owner is not None and not self._is_owner():
+                return False
+            self._owner = threading.get_ident()
+            return True
+
+    def close_clipboard(self) -> bool:
+        with self._lock:
+            if not self._is_owner():
+                return False
+            self._owner = None
+            if self._published != self._sequence_number:
+                self._published = self._sequence_number
+                self._changed.notify_all()
+            return True
+
+    def empty_clipboard(self) -> bool:
+        with self._lock:
+            if not self._is_owner():
+                return False
+            for handle in self._data.values():
+                if handle is not None:
+                    self._free(handle)
+            self._data.clear()
+            # Like `WM_DESTROYCLIPBOARD`, unrendered formats are dropped.
+            self._renderers.clear()
+            self._sequence_number += 1
+            return True
+
+    def get_clipboard_data(self, format: int) -> Optional[int]:
+        with self._lock:
+            if not self._is_owner():
+                return None
+            handle = self._data.get(format)
+            if handle is None and format in self._renderers:
+                # Like `WM_RENDERFORMAT`, rendered once it is requested.
+                handle = self._render(format)
+            return handle
+
+    def set_clipboard_data(self, format: int, handle: Optional[int]) -> Optional[int]:
+        with self._lock:
+            if not self._is_owner():
+                return None
+            if handle is not None and handle not in self._buffers:
+                return None
+            previous = self._data.pop(format, None)
+            if previous is not None and previous != handle:
+                self._free(previous)
+            self._renderers.pop(format, None)
+            self._data[format] = handle
+            self._sequence_number += 1
+            return handle
+
+    def delay_render(self, format: int, render: Callable[[], Optional[int]]) -> bool:
+        with self._lock:
+            if not self._is_owner():
+                return False
+            previous = self._data.pop(format, None)
+            if previous is not None:
+                self._free(previous)
+            self._data[format] = None
+            self._renderers[format] = render
+            self._sequence_number += 1
+            return True
+
+    def render_all_formats(self) -> None:
+        """Render every delayed format not yet rendered.
+
+        Windows asks the clipboard owner for this, with `WM_RENDERALLFORMATS`,
+        when it exits.
+        """
+        with self._lock:
+            for format in list(self._renderers):
+                self._render(format)
+
+    def _render(self, format: int) -> Optional[int]:
+        render = self._renderers.pop(format)
+        handle = render()
+        if handle is None or handle not in self._buffers:
+            return None
+        # Rendering does not change the clipboard's contents.
+        self._data[format] = handle
+        return handle
+
+    def is_clipboard_format_available(self, format: int) -> bool:
+        with self._lock:
+            return format in self._data
+
+    def enum_clipboard_formats(self, format: int) -> int:
+        with self._lock:
+            if not self._is_owner():
+                return 0
+            formats = list(self._data)
+            if format == 0:
+                return formats[0] if formats else 0
+            try:
+                index = formats.index(format)
+            except ValueError:
+                return 0
+            if index + 1 < len(formats):
+                return formats[index + 1]
+            return 0
+
+    def get_clipboard_sequence_number(self) -> int:
+        with self._lock:
+            return self._sequence_number
+
+    def wait_for_change(
+        self, sequence_number: int, timeout: Optional[float] = None
+    ) -> int:
+        with self._changed:
+            self._changed.wait_for(lambda: self._published != sequence_number, timeout)
+            return self._published
+
+    def register_clipboard_format(self, name: str) -> int:
+        if not name:
+            return 0
+        with self._lock:
+            key = name.casefold()
+            format = self._registered.get(key)
+            if format is None:
+                format = FIRST_REGISTERED_FORMAT + len(self._registered)
+                self._registered[key] = format
+                self._format_names[format] = name
+            return format
+
+    def get_clipboard_format_name(self, format: int) -> Optional[str]:
+        with self._lock:
+            return self._format_names.get(format)
+
+    # Global Memory
+
+    def global_alloc(self, flags: int, size: int) -> Optional[int]:
+        if size < 0:
+            return None
+        with self._lock:
+            handle = self._next_handle
+            self._next_handle += 8
+            # Always zero initialized
+            self._buffers[handle] = ctypes.create_string_buffer(size)
+            self._lock_counts[handle] = 0
+            return handle
+
+    def global_lock(self, handle: int) -> Optional[int]:
+        with self._lock:
+            buffer = self._buffers.get(handle)
+            if buffer is None:
+                return None
+            self._lock_counts[handle] += 1
+            return ctypes.addressof(buffer)
+
+    def global_unlock(self, handle: int) -> bool:
+        with self._lock:
+            if not self._lock_counts.get(handle):
+                return False
+            self._lock_counts[handle] -= 1
+            return True
+
+    def global_size(self, handle: int) -> int:
+        with self._lock:
+            buffer = self._buffers.get(handle)
+            if buffer is None:
+                return 0
+            return ctypes.sizeof(buffer)
+
+    def global_realloc(self, handle: int, size: int, flags: int) -> Optional[int]:
+        if size < 0:
+            return None
+        with self._lock:
+            buffer = self._buffers.get(handle)
+            if buffer is None or self._lock_counts[handle]:
+                return None
+            # Zero initialized, so added memory is always zeroed.
+            resized = ctypes.create_string_buffer(size)
+            ctypes.memmove(resized, buffer, min(size, ctypes.sizeof(buffer)))
+            self._buffers[handle] = resized
+            return handle
+
+    def global_free(self, handle: int) -> bool:
+        with self._lock:
+            if handle not in self._buffers or handle in self._data.values():
+                return False
+            self._free(handle)
+            return True
+
+    def _free(self, handle: int) -> None:
+        self._buffers.pop(handle, None)
+        self._lock_counts.pop(handle, None)
@@ -0,0 +1,331 @@
+"""Win32 clipboard backend."""
+
+import atexit
+import ctypes
+import threading
+import time
+import traceback
+from ctypes import wintypes
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+from clipboard.backends.base import ClipboardBackend
+from clipboard.backends.base import poll_for_change
+
+
+HWND_MESSAGE = -3
+WM_CLIPBOARDUPDATE = 0x031D
+QS_POSTMESSAGE = 0x0008
+PM_REMOVE = 0x0001
+INFINITE = 0xFFFFFFFF
+WM_RENDERFORMAT = 0x0305
+WM_RENDERALLFORMATS = 0x0306
+WM_DESTROYCLIPBOARD = 0x0307
+
+
+class WNDCLASSW(ctypes.Structure):
+    _fields_ = [
+        ("style", wintypes.UINT),
+        # A `WNDPROC`, which only exists on Windows, so stored as a pointer.
+        ("lpfnWndProc", ctypes.c_void_p),
+        ("cbClsExtra", ctypes.c_int),
+        ("cbWndExtra", ctypes.c_int),
+        ("hInstance", wintypes.HINSTANCE),
+        ("hIcon", wintypes.HICON),
+        ("hCursor", wintypes.HANDLE),
+        ("hbrBackground", wintypes.HBRUSH),
+        ("lpszMenuName", wintypes.LPCWSTR),
+        ("lpszClassName", wintypes.LPCWSTR),
+    ]
+
+
+class _ClipboardListener:
+    """Message-only window registered as a clipboard format listener.
+
+    Windows posts `WM_CLIPBOARDUPDATE` to the thread that created the window,
+    so each thread waiting for changes has its own listener. Windows destroys
+    it when the thread exits.
+    """
+
+    def __init__(self, c_interface) -> None:
+        self._c = c_interface
+        # A predefined class, so no window procedure has to be registered.
+        self.hwnd: Optional[int] = self._c.CreateWindowExW(
+            0, "STATIC", None, 0, 0, 0, 0, 0, HWND_MESSAGE, None, None, None
+        )
+        if self.hwnd and not self._c.AddClipboardFormatListener(self.hwnd):
+            self._c.DestroyWindow(self.hwnd)
+            self.hwnd = None
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Wait for `WM_CLIPBOARDUPDATE`, returning True if it was posted."""
+        message = wintypes.MSG()
+        deadline: Optional[float] = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+        while True:
+            if self._c.PeekMessageW(
+                ctypes.byref(message),
+                self.hwnd,
+                WM_CLIPBOARDUPDATE,
+                WM_CLIPBOARDUPDATE,
+                PM_REMOVE,
+            ):
+                return True
+            milliseconds = INFINITE
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                milliseconds = max(1, int(remaining * 1000))
+            self._c.MsgWaitForMultipleObjects(
+                0, None, False, milliseconds, QS_POSTMESSAGE
+            )
+
+    def close(self) -> None:
+        if self.hwnd:
+            self._c.RemoveClipboardFormatListener(self.hwnd)
+            self._c.DestroyWindow(self.hwnd)
+            self.hwnd = None
+
+
+class _RenderWindow:
+    """Clipboard owner window, rendering delayed formats when requested.
+
+    Windows sends `WM_RENDERFORMAT` to the window that owns the clipboard when
+    a delayed format is requested, so the window runs a message loop on its
+    own thread. Formats not rendered by the time Python exits are rendered
+    then, as the thread does not get to handle `WM_RENDERALLFORMATS`.
+    """
+
+    def __init__(self, c_interface) -> None:
+        self._c = c_interface
+        # format -> function returning the handle
+        self.renderers: Dict[int, Callable[[], Optional[int]]] = {}
+        self.hwnd: Optional[int] = None
+
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(ready,), name="clipboard-renderer", daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+        atexit.register(self.render_all)
+
+    def _run(self, ready: threading.Event) -> None:
+        try:
+            window_procedure_type = ctypes.WINFUNCTYPE(  # type: ignore
+                wintypes.LPARAM,
+                wintypes.HWND,
+                wintypes.UINT,
+                wintypes.WPARAM,
+                wintypes.LPARAM,
+            )
+            # Kept alive for as long as the window.
+            self._window_procedure_pointer = window_procedure_type(
+                self._window_procedure
+            )
+            window_class = WNDCLASSW()
+            window_class.lpfnWndProc = ctypes.cast(
+                self._window_procedure_pointer, ctypes.c_void_p
+            )
+            window_class.hInstance = self._c.GetModuleHandleW(None)
+            window_class.lpszClassName = f"clip-util renderer {id(self)}"
+            if not self._c.RegisterClassW(ctypes.byref(window_class)):
+                return
+            self.hwnd = self._c.CreateWindowExW(
+                0,
+                window_class.lpszClassName,
+                None,
+                0,
+                0,
+                0,
+                0,
+                0,
+                HWND_MESSAGE,
+                None,
+                window_class.hInstance,
+                None,
+            )
+        finally:
+            ready.set()
+
+        message = wintypes.MSG()
+        while self.hwnd and self._c.GetMessageW(ctypes.byref(message), None, 0, 0) > 0:
+            self._c.TranslateMessage(ctypes.byref(message))
+            self._c.DispatchMessageW(ctypes.byref(message))
+
+    def _window_procedure(self, hwnd, message, wparam, lparam) -> int:
+        if message == WM_RENDERFORMAT:
+            # The clipboard is already open, for whoever requested it.
+            self._render(wparam)
+            return 0
+        if message == WM_RENDERALLFORMATS:
+            self.render_all()
+            return 0
+        if message == WM_DESTROYCLIPBOARD:
+            # Emptied, so the formats are no longer on it.
+            self.renderers.clear()
+            return 0
+        return self._c.DefWindowProcW(hwnd, message, wparam, lparam)
+
+    def _render(self, format: int) -> None:
+        render = self.renderers.pop(format, None)
+        if render is None:
+            return
+        handle = render()
+        if handle is not None:
+            self._c.SetClipboardData(format, handle)
+
+    def render_all(self) -> None:
+        """Render every format not yet rendered, while still the owner."""
+        if not self.renderers or not self.hwnd:
+            return
+        if self._c.GetClipboardOwner() != self.hwnd:
+            return
+        if not self._c.OpenClipboard(self.hwnd):
+            return
+        try:
+            # Emptied by someone else since checking the owner.
+            if self._c.GetClipboardOwner() == self.hwnd:
+                for format in list(self.renderers):
+                    self._render(format)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            self._c.CloseClipboard()
+
+
+class WindowsBackend(ClipboardBackend):
+    """Backend using the Win32 clipboard through `ctypes`.
+
+    The `user32` and `kernel32` bindings are loaded when the backend is
+    created, not when `clipboard` is imported.
+    """
+
+    name = "windows"
+
+    def __init__(self) -> None:
+        from clipboard import _c_interface
+
+        self._c = _c_interface
+        self._listeners = threading.local()
+        self._render_window: Optional[_RenderWindow] = None
+        self._render_window_lock = threading.Lock()
+
+    # Clipboard
+
+    def open_clipboard(self, hwnd: Optional[int] = None) -> bool:
+        return bool(self._c.OpenClipboard(hwnd))
+
+    def close_clipboard(self) -> bool:
+        return bool(self._c.CloseClipboard())
+
+    def empty_clipboard(self) -> bool:
+        return bool(self._c.EmptyClipboard())
+
+    def get_clipboard_data(self, format: int) -> Optional[int]:
+        return self._c.GetClipboardData(format)
+
+    def set_clipboard_data(self, format: int, handle: Optional[int]) -> Optional[int]:
+        return self._c.SetClipboardData(format, handle)
+
+    def owner_window(self) -> Optional[int]:
+        if self._render_window is None:
+            with self._render_window_lock:
+                if self._render_window is None:
+                    self._render_window = _RenderWindow(self._c)
+        return self._render_window.hwnd
+
+    def delay_render(self, format: int, render: Callable[[], Optional[int]]) -> bool:
+        window = self._render_window
+        if window is None or not window.hwnd:
+            return False
+        # Only the window that opened the clipboard is asked to render.
+        if self._c.GetOpenClipboardWindow() != window.hwnd:
+            return False
+        window.renderers[format] = render
+        # NULL is returned on success as well, so the last error tells.
+        ctypes.set_last_error(0)
+        self._c.SetClipboardData(format, None)
+        if ctypes.get_last_error():
+            window.renderers.pop(format, None)
+            return False
+        return True
+
+    def is_clipboard_format_available(self, format: int) -> bool:
+        return bool(self._c.IsClipboardFormatAvailable(format))
+
+    def enum_clipboard_formats(self, format: int) -> int:
+        return self._c.EnumClipboardFormats(format)
+
+    def get_clipboard_sequence_number(self) -> int:
+        return self._c.GetClipboardSequenceNumber()
+
+    def wait_for_change(
+        self, sequence_number: int, timeout: Optional[float] = None
+    ) -> int:
+        listener: Optional[_ClipboardListener] = getattr(
+            self._listeners, "listener", None
+        )
+        if listener is None:
+            listener = _ClipboardListener(self._c)
+            self._listeners.listener = listener
+        if not listener.hwnd:
+            # No window, e.g. in a service without a desktop.
+            return poll_for_change(self, sequence_number, timeout)
+
+        current = self.get_clipboard_sequence_number()
+        if current != sequence_number:
+            return current
+        # Changed before this thread's listener existed, so not yet posted.
+        listener.wait(timeout)
+        return self.get_clipboard_sequence_number()
+
+    def register_clipboard_format(self, name: str) -> int:
+        return self._c.RegisterClipboardFormatW(name)
+
+    def get_clipboard_format_name(self, format: int) -> Optional[str]:
+        buffer_size = 256
+        buffer = ctypes.create_unicode_buffer(buffer_size)
+        return_code = self._c.GetClipboardFormatNameW(format, buffer, buffer_size)
+
+        # Failed
+        if return_code == 0:
+            last_error: int = ctypes.get_last_error()
+            if last_error == 0:
+                # No Error
+                return None
+            if last_error == 87:
+                # This indicates that the first parameter is not a valid
+                # clipboard format.
+                return None
+            raise ctypes.WinError(last_error)  # type: ignore
+
+        return buffer.value
+
+    # Global Memory
+
+    def global_alloc(self, flags: int, size: int) -> Optional[int]:
+        return self._c.GlobalAlloc(flags, size)
+
+    def global_lock(self, handle: int) -> Optional[int]:
+        return self._c.GlobalLock(handle)
+
+    def global_unlock(self, handle: int) -> bool:
+        # Zero is returned both on failure and when the lock count drops to
+        # zero, so the last error tells them apart.
+        ctypes.set_last_error(0)
+        if self._c.GlobalUnlock(handle):
+            return True
+        return ctypes.get_last_error() == 0
+
+    def global_size(self, handle: int) -> int:
+        return self._c.GlobalSize(handle)
+
+    def global_realloc(self, handle: int, size: int, flags: int) -> Optional[int]:
+        return self._c.GlobalReAlloc(handle, size, flags)
+
+    def global_free(self, handle: int) -> bool:
+        return self._c.GlobalFree(handle) is None
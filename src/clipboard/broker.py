@@ -0,0 +1,175 @@
+"""Process-wide clipboard broker.
+
+The clipboard can only be open on one thread at a time, so threads using it
+concurrently race on `OpenClipboard`, and the loser fails after its retries.
+The broker serializes that work instead: everything submitted to it runs, in
+order, on its single worker thread, and callers get a future back.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+
+T = TypeVar("T")
+
+# (future, function, args, kwargs, submitted at)
+_WorkItem = Tuple["Future[Any]", Callable[..., Any], tuple, dict, float]
+
+
+class ClipboardBroker:
+    """Run clipboard work on one worker thread, started on first use.
+
+    Work submitted from the worker thread itself, e.g. a convenience function
+    called from submitted work, is run immediately instead of queued, as
+    queueing it would deadlock.
+    """
+
+    def __init__(self, name: str = "clipboard-broker") -> None:
+        self.name: str = name
+
+        self._queue: "queue.SimpleQueue[Optional[_WorkItem]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown: bool = False
+
+        # Metrics
+        self._queue_depth: int = 0
+        self._max_queue_depth: int = 0
+        self._submitted: int = 0
+        self._completed: int = 0
+        self._failed: int = 0
+        self._wait_time: float = 0.0
+        self._max_wait_time: float = 0.0
+        self._run_time: float = 0.0
+
+    @property
+    def on_worker_thread(self) -> bool:
+        """True if called from the broker's worker thread."""
+        return self._thread is threading.current_thread()
+
+    def submit(self, function: Callable[..., T], *args, **kwargs) -> "Future[T]":
+        """Queue `function(*args, **kwargs)`, returning its future.
+
+        Raises
+        ------
+        RuntimeError
+            If the broker has been shut down.
+        """
+        future: "Future[T]" = Future()
+        if self.on_worker_thread:
+            with self._lock:
+                self._submitted += 1
+            self._run(future, function, args, kwargs, time.perf_counter())
+            return future
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit work after the broker shut down.")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._work, name=self.name, daemon=True
+                )
+                self._thread.start()
+            self._submitted += 1
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+            self._queue.put((future, function, args, kwargs, time.perf_counter()))
+        return future
+
+    def call(self, function: Callable[..., T], *args, **kwargs) -> T:
+        """Run `function(*args, **kwargs)` on the worker and wait for it.
+
+        Exceptions raised by `function` are raised to the caller.
+        """
+        return self.submit(function, *args, **kwargs).result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker once the queued work is done."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            thread = self._thread
+            self._queue.put(None)
+        if wait and thread is not None and not self.on_worker_thread:
+            thread.join()
+
+    def metrics(self) -> Dict[str, float]:
+        """Snapshot of the broker's metrics.
+
+        Wait times are from submission until the work starts, in seconds.
+        """
+        with self._lock:
+            completed = self._completed
+            return {
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "submitted": self._submitted,
+                "completed": completed,
+                "failed": self._failed,
+                "wait_time": self._wait_time,
+                "max_wait_time": self._max_wait_time,
+                "mean_wait_time": self._wait_time / completed if completed else 0.0,
+                "run_time": self._run_time,
+            }
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, function, args, kwargs, submitted_at = item
+            with self._lock:
+                self._queue_depth -= 1
+            self._run(future, function, args, kwargs, submitted_at)
+
+    def _run(
+        self,
+        future: "Future[Any]",
+        function: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        submitted_at: float,
+    ) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        started_at = time.perf_counter()
+        failed = False
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as exc:
+            failed = True
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+        finished_at = time.perf_counter()
+
+        wait_time = started_at - submitted_at
+        with self._lock:
+            self._completed += 1
+            self._failed += failed
+            self._wait_time += wait_time
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+            self._run_time += finished_at - started_at
+
+
+_broker: Optional[ClipboardBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> ClipboardBroker:
+    """Return the process-wide broker, creating it on first use."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = ClipboardBroker()
+    return _broker
@@ -0,0 +1,80 @@
+"""Read cache keyed on the clipboard sequence number."""
+
+import threading
+from collections import OrderedDict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+
+class ReadCache:
+    """Bounded LRU cache of decoded clipboard contents, by format.
+
+    Each value is stored with the clipboard sequence number it was read at,
+    and is only returned while the sequence number is unchanged. Pass it to
+    `Clipboard` or `get_clipboard` to skip re-reading an unchanged clipboard.
+    The formats on the clipboard are kept the same way, so `get_clipboard`
+    without a format does not enumerate them again either.
+    """
+
+    def __init__(self, maxsize: int = 16) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._lock = threading.Lock()
+        # format -> (sequence number, content)
+        self._entries: "OrderedDict[int, Tuple[int, Union[str, bytes]]]" = OrderedDict()
+        # (sequence number, formats)
+        self._formats: Optional[Tuple[int, Tuple[int, ...]]] = None
+
+    def get(self, format: int, sequence_number: int) -> Optional[Union[str, bytes]]:
+        """Return the cached content, None if missing or out of date."""
+        with self._lock:
+            entry = self._entries.get(format)
+            if entry is None or entry[0] != sequence_number:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(format)
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self, format: int, sequence_number: int, content: Union[str, bytes]
+    ) -> None:
+        """Cache `content`, read at `sequence_number`."""
+        with self._lock:
+            self._entries[format] = (sequence_number, content)
+            self._entries.move_to_end(format)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_formats(self, sequence_number: int) -> Optional[Tuple[int, ...]]:
+        """Return the cached formats, None if missing or out of date."""
+        with self._lock:
+            if self._formats is None or self._formats[0] != sequence_number:
+                return None
+            return self._formats[1]
+
+    def put_formats(self, sequence_number: int, formats: Iterable[int]) -> None:
+        """Cache the formats on the clipboard, enumerated at `sequence_number`."""
+        with self._lock:
+            self._formats = (sequence_number, tuple(formats))
+
+    def clear(self) -> None:
+        """Remove every entry, and the formats."""
+        with self._lock:
+            self._entries.clear()
+            self._formats = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(maxsize={self.maxsize}, size={len(self)},"
+            f" hits={self.hits}, misses={self.misses})"
+        )
@@ -6,88 +6,158 @@ FIXME: HTML_Format doesn't work for some reason. Fix this.
 """
 
 import ctypes
-import logging
-import os
+import functools
 import time
-import traceback
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import BinaryIO
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Mapping
 from typing import Optional
+from typing import TextIO
+from typing import Tuple
+from typing import TypeVar
 from typing import Union
 
-from clipboard._c_interface import HANDLE
-from clipboard._c_interface import LPVOID
-from clipboard._c_interface import CloseClipboard
-from clipboard._c_interface import EmptyClipboard
-from clipboard._c_interface import EnumClipboardFormats
-from clipboard._c_interface import GetClipboardData
-from clipboard._c_interface import GlobalAlloc
-from clipboard._c_interface import GlobalLock
-from clipboard._c_interface import GlobalSize
-from clipboard._c_interface import GlobalUnlock
-from clipboard._c_interface import OpenClipboard
-from clipboard._c_interface import SetClipboardData
+from clipboard import tracing as _tracing
+from clipboard.backends import ClipboardBackend
+from clipboard.backends import get_backend
+from clipboard.constants import DEFAULT_CHUNK_SIZE
 from clipboard.constants import HTML_ENCODING
 from clipboard.constants import UTF_ENCODING
 from clipboard.errors import EmptyClipboardError
 from clipboard.errors import FormatNotSupportedError
 from clipboard.errors import GetClipboardError
 from clipboard.errors import GetFormatsError
+from clipboard.errors import ImageParseError
 from clipboard.errors import LockError
 from clipboard.errors import OpenClipboardError
 from clipboard.errors import SetClipboardError
-from clipboard.formats import ClipboardFormat
-from clipboard.html_clipboard import HTMLTemplate
-
-
-ClipboardFormatType = Union[int, str, ClipboardFormat]  # Type Alias
+from clipboard.tracing import trace
+
+
+if TYPE_CHECKING:
+    from clipboard.cache import ReadCache
+    from clipboard.files import PathType
+    from clipboard.formats import ClipboardFormat
+    from clipboard.formats import FormatRegistry
+    from clipboard.images import ImageData
+    from clipboard.retry import RetryPolicy
+    from clipboard.snapshot import ClipboardSnapshot
+    from clipboard.streams import ClipboardWriter
+    from clipboard.tracing import Span
+
+
+# `clipboard.formats` registers formats with the backend when imported, so it
+# is only imported once the clipboard is actually used. Images, streams,
+# locales, files and the broker are likewise imported on first use, keeping
+# `from clipboard import get_clipboard` cheap.
+ClipboardFormatType = Union[int, str, "ClipboardFormat"]  # Type Alias
+HANDLE = int  # Type Alias
+# Called for the content once its format is requested, see `set_many`.
+Provider = Callable[[], Union[str, bytes]]  # Type Alias
+LPVOID = int  # Type Alias
 hMem = HANDLE  # Type Alias
 GMEM_MOVEABLE = 0x0002
 GMEM_ZEROINIT = 0x0040
 GMEM_DDESHARE = 0x2000
 
 
-logger = logging.getLogger(__name__)
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-stream_handler = logging.StreamHandler()
-stream_handler.setFormatter(formatter)
-logger.addHandler(stream_handler)
-if os.environ.get("LOGLEVEL"):
-    logger.setLevel(os.environ["LOGLEVEL"])
+def __getattr__(name: str) -> Any:
+    # `ClipboardFormat` is still importable from here, once it is first used.
+    if name == "ClipboardFormat":
+        from clipboard.formats import ClipboardFormat
+
+        globals()[name] = ClipboardFormat
+        return ClipboardFormat
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+T = TypeVar("T")
+
+
+def _call(function: Callable[..., T], *args: Any) -> T:
+    # The broker pulls in `concurrent.futures`, so it is only started the
+    # first time a convenience function is called.
+    from clipboard.broker import get_broker
 
-    file_handler = logging.FileHandler("clipboard.log")
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    return get_broker().call(function, *args)
 
 
 def get_clipboard(
     format: Optional[ClipboardFormatType] = None,
+    cache: Optional["ReadCache"] = None,
 ) -> Optional[Union[str, bytes]]:
     """Convenience wrapper to get clipboard.
 
     Instead of using the `Clipboard.default_format`, this function uses the
     first available format on the clipboard.
+
+    Given a `ReadCache`, the clipboard is only read when it has changed since
+    the last call using the same cache.
+
+    Like the other convenience functions, it runs on the process-wide
+    `ClipboardBroker`, so calls from several threads never race to open the
+    clipboard.
     """
+    return _call(_get_clipboard, format, cache)
+
+
+def _get_clipboard(
+    format: Optional[ClipboardFormatType],
+    cache: Optional["ReadCache"],
+) -> Optional[Union[str, bytes]]:
     if format is None:
-        available = get_available_formats()
+        if cache is None:
+            available = _get_available_formats()
+        else:
+            available = _get_cached_formats(cache)
         if available:
             format = available[0]
-    with Clipboard() as cb:
+    clipboard = Clipboard(cache=cache)
+    if cache is not None:
+        # Opened only on a cache miss.
+        return clipboard.get_clipboard(format=format)
+    with clipboard as cb:
         return cb.get_clipboard(format=format)
     return None
 
 
 def set_clipboard(
-    content: Union[str, bytes],
+    content: Union[
+        str, bytes, Mapping[ClipboardFormatType, Union[str, bytes, Provider]]
+    ],
     format: Optional[ClipboardFormatType] = None,
-) -> HANDLE:
+) -> Union[HANDLE, Dict[int, Optional[HANDLE]]]:
     """Convenience wrapper to set clipboard.
 
+    Given a mapping of formats to content, all of them are set together, see
+    `Clipboard.set_many`. The content can be a provider, called only once
+    its format is pasted.
+
     Raises
     ------
     SetClipboardError
         If setting the clipboard failed.
     """
+    return _call(_set_clipboard, content, format)
+
+
+def _set_clipboard(
+    content: Union[
+        str, bytes, Mapping[ClipboardFormatType, Union[str, bytes, Provider]]
+    ],
+    format: Optional[ClipboardFormatType],
+) -> Union[HANDLE, Dict[int, Optional[HANDLE]]]:
     with Clipboard() as cb:
+        if isinstance(content, Mapping):
+            return cb.set_many(content)
         return cb.set_clipboard(content=content, format=format)
     raise SetClipboardError("Setting the clipboard failed.")
 
@@ -100,20 +170,120 @@ def get_available_formats() -> list[int]:
     OpenClipboardError
         If the context manager caught an error.
     """
+    return _call(_get_available_formats)
+
+
+def _get_available_formats() -> list[int]:
     with Clipboard() as cb:
         return cb.available_formats()
     raise GetFormatsError("Failed to get available formats.")
 
 
+def _get_cached_formats(cache: "ReadCache") -> List[int]:
+    """The available formats, only enumerated once the clipboard has changed."""
+    sequence_number = get_backend().get_clipboard_sequence_number()
+    if not sequence_number:
+        return _get_available_formats()
+    formats = cache.get_formats(sequence_number)
+    if formats is None:
+        formats = tuple(_get_available_formats())
+        cache.put_formats(sequence_number, formats)
+    return list(formats)
+
+
+def get_image(image_format: str = "png") -> Optional[bytes]:
+    """Convenience wrapper to get the image on the clipboard as a file.
+
+    See `Clipboard.get_image`.
+    """
+    return _call(_get_image, image_format)
+
+
+def _get_image(image_format: str) -> Optional[bytes]:
+    with Clipboard() as cb:
+        return cb.get_image(image_format)
+    return None
+
+
+def set_image(image: "ImageData") -> Dict[int, Optional[HANDLE]]:
+    """Convenience wrapper to set an image, see `Clipboard.set_image`.
+
+    Raises
+    ------
+    ImageParseError
+        If the image can not be parsed.
+    SetClipboardError
+        If setting the clipboard failed.
+    """
+    return _call(_set_image, image)
+
+
+def _set_image(image: "ImageData") -> Dict[int, Optional[HANDLE]]:
+    return Clipboard().set_image(image)
+
+
+def get_files() -> Optional[List[str]]:
+    """Convenience wrapper to get the paths of the files on the clipboard.
+
+    See `Clipboard.get_files`.
+    """
+    return _call(_get_files)
+
+
+def _get_files() -> Optional[List[str]]:
+    with Clipboard() as cb:
+        return cb.get_files()
+    return None
+
+
+def set_files(paths: Iterable["PathType"]) -> HANDLE:
+    """Convenience wrapper to set a list of files, see `Clipboard.set_files`.
+
+    Raises
+    ------
+    ValueError
+        If a path is empty, or contains a null character.
+    SetClipboardError
+        If setting the clipboard failed.
+    """
+    return _call(_set_files, list(paths))
+
+
+def _set_files(paths: List["PathType"]) -> HANDLE:
+    return Clipboard().set_files(paths)
+
+
+class _DefaultFormat:
+    """Descriptor resolving `Clipboard.default_format` on first access."""
+
+    def __get__(self, obj, owner) -> "ClipboardFormat":
+        from clipboard.formats import ClipboardFormat
+
+        return ClipboardFormat.CF_UNICODETEXT
+
+
 class Clipboard:
     """Represents the system clipboard."""
 
-    default_format: ClipboardFormat = ClipboardFormat.CF_UNICODETEXT
+    default_format: "ClipboardFormat" = _DefaultFormat()  # type: ignore
 
     def __init__(
         self,
         format: Optional[ClipboardFormatType] = None,
+        backend: Optional[ClipboardBackend] = None,
+        cache: Optional["ReadCache"] = None,
+        retry_policy: Optional["RetryPolicy"] = None,
     ):
+        self.backend: ClipboardBackend = (
+            backend if backend is not None else get_backend()
+        )
+        # Opt-in, returns the last read while the clipboard is unchanged.
+        self.cache: Optional["ReadCache"] = cache
+        # The process-wide policy, see `set_retry_policy`, if None.
+        self.retry_policy: Optional["RetryPolicy"] = retry_policy
+        # The backend's, looked up on first use.
+        self._format_registry: Optional["FormatRegistry"] = None
+
         if format is None:
             format = self.default_format.value
         else:
@@ -126,29 +296,68 @@ class Clipboard:
 
         self.locked: bool = False
         self.opened: bool = False
+        # Window the clipboard is opened with, for delayed rendering.
+        self._owner_window: Optional[HANDLE] = None
+
+        # Attempts made, and seconds waited, by the last open.
+        self.open_attempts: int = 0
+        self.open_wait: float = 0.0
+
+        # Formats on the clipboard, enumerated once per open session.
+        self._formats: Optional[Tuple[int, ...]] = None
+        self._formats_set: Optional[FrozenSet[int]] = None
+        # LCID of the text on the clipboard, read once per open session, and 0
+        # if there is none.
+        self._locale: Optional[int] = None
 
     def available_formats(self) -> List[int]:
         """Return all available clipboard formats on clipboard.
 
         First format is the format on the clipboard, depending on your system.
         """
-        logger.info("Getting available clipboard formats")
 
         def get_formats() -> List[int]:
-            formats: list[int] = [EnumClipboardFormats(0)]
+            enum_formats = self.backend.enum_clipboard_formats
+            formats: list[int] = [enum_formats(0)]
             while formats[-1] != 0:
-                formats.append(EnumClipboardFormats(formats[-1]))
+                formats.append(enum_formats(formats[-1]))
             return formats[:-1]
 
         available_formats: List[int] = []
         if not self.opened:
             with self:
                 available_formats = self.available_formats()
+        elif self._formats is not None:
+            available_formats = list(self._formats)
         elif self.opened:
-            available_formats = get_formats()
+            with trace("enumerate") as span:
+                available_formats = get_formats()
+                span.set(formats=len(available_formats))
+            # Nothing else can change the clipboard while it is open, so the
+            # formats are kept until it is closed, emptied, or set.
+            self._formats = tuple(available_formats)
+            self._formats_set = frozenset(available_formats)
 
         return available_formats
 
+    def has_format(self, format: ClipboardFormatType) -> bool:
+        """Return True if `format` is on the clipboard.
+
+        Uses the formats already enumerated while the clipboard is open, and
+        `IsClipboardFormatAvailable` otherwise, so it never enumerates them.
+        """
+        format = self._resolve_format(format)
+        if self._formats_set is not None:
+            return format in self._formats_set
+        return self.backend.is_clipboard_format_available(format)
+
+    def _invalidate_formats(self) -> None:
+        """Forget the enumerated formats and locale, as the clipboard has
+        changed."""
+        self._formats = None
+        self._formats_set = None
+        self._locale = None
+
     def get_clipboard(
         self,
         format: Optional[ClipboardFormatType] = None,
@@ -173,73 +382,603 @@ class Clipboard:
             If locking the clipboard failed.
             If unlocking the clipboard failed.
         """
-        logger.info("Getting clipboard data")
+        with trace("get") as span:
+            if self.cache is None:
+                return self._get_clipboard(format=format)
+            return self._get_cached(format, span)
 
+    def _get_cached(
+        self, format: Optional[ClipboardFormatType], span: "Span"
+    ) -> Optional[Union[str, bytes]]:
+        """Get data from the read cache, reading the clipboard on a miss."""
+        if format is None:
+            format = self.format
+        else:
+            format = self._resolve_format(format)
+
+        # Checked without opening the clipboard. If it changes after this, the
+        # content is cached under the old number, so it is never returned.
+        sequence_number: int = self.backend.get_clipboard_sequence_number()
+        if not sequence_number:
+            return self._get_clipboard(format=format)
+        assert self.cache is not None
+        content = self.cache.get(format, sequence_number)
+        span.set(cached=content is not None)
+        if content is None:
+            content = self._get_clipboard(format=format)
+            if content is not None:
+                self.cache.put(format, sequence_number, content)
+        return content
+
+    def _get_clipboard(
+        self,
+        format: Optional[ClipboardFormatType] = None,
+    ) -> Optional[Union[str, bytes]]:
+        """Get data from clipboard, without the read cache."""
         if not self.opened:
             with self:
-                return self.get_clipboard(format=format)
+                return self._get_clipboard(format=format)
+            return None
 
         if format is None:
             format = self.format
         else:
             format = self._resolve_format(format)
 
-        formats = self.available_formats()
-        if format not in formats:
-            raise FormatNotSupportedError(
-                f"{format} is not supported for getting the clipboard."
-                f" Choose from following {formats}"
-            )
+        if not self.has_format(format):
+            synthesized = self._synthesize_text(format)
+            if synthesized is not None:
+                return synthesized
+            self._check_format(format)
+
+        return self._read_format(format)
+
+    def _synthesize_text(self, format: int) -> Optional[str]:
+        """Read CF_UNICODETEXT from CF_TEXT, or CF_OEMTEXT, in the same session.
+
+        Windows does this itself, so only other backends need it. None if the
+        format is not CF_UNICODETEXT, or there is no text to read it from.
+        """
+        from clipboard.formats import ClipboardFormat
+
+        if format != ClipboardFormat.CF_UNICODETEXT.value:
+            return None
+        for text_format in (ClipboardFormat.CF_TEXT, ClipboardFormat.CF_OEMTEXT):
+            if self.has_format(text_format.value):
+                return self._read_format(text_format.value)  # type: ignore
+        return None
+
+    def get_locale(self) -> Optional[int]:
+        """Get the locale identifier (LCID) of the text on the clipboard.
+
+        It is read from CF_LOCALE once per open session. None if it is not on
+        the clipboard.
+        """
+        if not self.opened:
+            with self:
+                return self.get_locale()
+            return None
+        return self._get_locale()
+
+    def _get_locale(self) -> Optional[int]:
+        """The LCID of the text on the open clipboard, see `get_locale`.
+
+        Read without `_locked_view`, so it can be read while other data is
+        locked.
+        """
+        if self._locale is None:
+            from clipboard.formats import ClipboardFormat
+            from clipboard.locales import parse_locale
+
+            self._locale = 0
+            format = ClipboardFormat.CF_LOCALE.value
+            handle = self.backend.get_clipboard_data(format)
+            if handle is not None and self.backend.global_size(handle) >= 4:
+                address = self.backend.global_lock(handle)
+                if address:
+                    try:
+                        self._locale = parse_locale(ctypes.string_at(address, 4)) or 0
+                    finally:
+                        self.backend.global_unlock(handle)
+        return self._locale or None
+
+    def snapshot(
+        self,
+        formats: Optional[Iterable[ClipboardFormatType]] = None,
+    ) -> "ClipboardSnapshot":
+        """Read several formats at once, all of them by default.
+
+        The clipboard is opened, and its formats enumerated, only once. Formats
+        that are not on the clipboard, or whose data can not be read (e.g. GDI
+        handles such as CF_BITMAP), are left out of the snapshot.
+
+        Raises
+        ------
+        FormatNotSupportedError
+            If a format is not supported.
+        GetClipboardError
+            If opening the clipboard failed.
+        """
+        if not self.opened:
+            with self:
+                return self.snapshot(formats=formats)
+            raise GetClipboardError("Taking a snapshot of the clipboard failed.")
+
+        available: List[int] = self.available_formats()
+        requested: List[int] = available
+        if formats is not None:
+            available_set = frozenset(available)
+            requested = [
+                format
+                for format in map(self._resolve_format, formats)
+                if format in available_set
+            ]
+
+        data: Dict[int, Union[str, bytes]] = {}
+        sizes: Dict[int, int] = {}
+        for format in requested:
+            try:
+                data[format] = self._read_format(format)
+            except (GetClipboardError, LockError):
+                continue
+            sizes[format] = self.size or 0
+
+        from clipboard.snapshot import ClipboardSnapshot
+
+        return ClipboardSnapshot(data, sizes)
+
+    def _read_format(self, format: int) -> Union[str, bytes]:
+        """Read and decode the data for `format` from the open clipboard.
+
+        Raises
+        ------
+        GetClipboardError
+            If getting the clipboard data failed.
+        LockError
+            If locking the clipboard failed.
+        """
+        with self._locked_view(format) as view:
+            if not _tracing.active:
+                return self._decode(format, view)
+            with trace("decode", self.backend, format=format, bytes=len(view)):
+                return self._decode(format, view)
+
+    def _decode(self, format: int, view: memoryview) -> Union[str, bytes]:
+        """Decode the data for `format` straight from the locked memory,
+        without copying it.
+        """
+        from clipboard.formats import ClipboardFormat
 
-        # Info
-        self.h_clip_mem = GetClipboardData(format)
-        if self.h_clip_mem is None:
-            raise GetClipboardError("The `GetClipboardData` function failed.")
-        self.address = self._lock(self.h_clip_mem)  # type: ignore
-        self.size = GlobalSize(self.address)
-        if not self.size:
-            # 0 means that the function failed.
-            raise GetClipboardError("The `GlobalSize` function failed.")
-
-        # TODO: CF_LOCALE is special and should be handled differently.
-        #   A handle to the locale identifier associated with the text in the
-        #   clipboard.
         # TODO: There are other types that could be supported as well, such as
         # audio data:
         # https://learn.microsoft.com/en-us/windows/win32/dataxchg/standard-clipboard-formats
-        string: ctypes.Array[ctypes.c_byte]
         content: Union[str, bytes]
         if format == ClipboardFormat.CF_UNICODETEXT.value:
-            string = (ctypes.c_byte * self.size).from_address(
-                int(self.address)  # type: ignore
-            )
-            content = bytearray(string)[:-2].decode(encoding=UTF_ENCODING)
+            content = str(view[:-2], UTF_ENCODING)
         elif (
             format == ClipboardFormat.CF_HTML.value
             or format == ClipboardFormat.HTML_Format.value
         ):
-            bytes_ = (ctypes.c_char * self.size).from_address(
-                int(self.address)  # type: ignore
+            content = str(view[:-1], HTML_ENCODING)
+        elif (
+            format == ClipboardFormat.CF_DIB.value
+            or format == ClipboardFormat.CF_DIBV5.value
+            or format == ClipboardFormat.CF_HDROP.value
+            or format == ClipboardFormat.CF_LOCALE.value
+        ):
+            # Binary, so never mistaken for text, see `get_image`,
+            # `get_files` and `get_locale`.
+            content = view.tobytes()
+        elif (
+            format == ClipboardFormat.CF_TEXT.value
+            or format == ClipboardFormat.CF_OEMTEXT.value
+        ):
+            # In the code page of the text's locale.
+            from clipboard.locales import decode_text
+
+            content = decode_text(
+                view,
+                self._get_locale(),
+                oem=format == ClipboardFormat.CF_OEMTEXT.value,
             )
-            content = bytes(bytes_).decode(HTML_ENCODING)[:-1]
+        elif format == ClipboardFormat.CF_PNG.value:
+            # Compressed, so returned untouched, without the memory after
+            # the file.
+            from clipboard.images import png_size
 
+            try:
+                content = view[: png_size(view)].tobytes()
+            except ImageParseError:
+                content = view.tobytes()
         else:
-            string = (ctypes.c_byte * self.size).from_address(
-                int(self.address)  # type: ignore
-            )
             try:
-                content = bytearray(string)[:-1].decode(encoding="utf-8")
+                content = str(view[:-1], "utf-8")
             except UnicodeDecodeError:
-                return bytes(string)
+                content = view.tobytes()
 
-        # FIXME: This fails frequently, likely due to a resource management
-        # error.
-        try:
-            self._unlock()
-        except LockError:
-            pass
         return content
 
+    @contextmanager
+    def view(
+        self,
+        format: Optional[ClipboardFormatType] = None,
+    ) -> Iterator[memoryview]:
+        """Read-only view of the clipboard data, without copying it.
+
+        The view is over the locked clipboard memory, so it is only valid within
+        the `with` block. The memory is unlocked on exit, and the clipboard is
+        closed if it was opened for the view. Views taken from it, e.g. slices,
+        must not be kept past the block either: copy them with `bytes()`.
+
+        Parameters
+        ----------
+        format : Optional[ClipboardFormatType]
+            The format of the clipboard data.
+            If None, the default format is used.
+
+        Raises
+        ------
+        BufferError
+            If a view taken from it was kept past the block, once the memory is
+            unlocked.
+        FormatNotSupportedError
+            If the format is not on the clipboard.
+        GetClipboardError
+            If getting the clipboard data failed.
+        LockError
+            If locking the clipboard failed.
+        OpenClipboardError
+            If opening the clipboard failed.
+        """
+        import weakref
+
+        with self._view(format) as view:
+            # Views taken from it, even released, keep the memory's exporter
+            # alive, so it is only gone once every one of them is.
+            exporter = weakref.ref(view.obj)
+            yield view
+        if exporter() is not None:
+            raise BufferError(
+                "A view of the clipboard memory was kept past the `with` block."
+            )
+
+    @contextmanager
+    def _view(
+        self,
+        format: Optional[ClipboardFormatType] = None,
+    ) -> Iterator[memoryview]:
+        """Read-only view of the clipboard data, see `view`, without checking
+        for views kept past the block.
+        """
+        if not self.opened:
+            self.__enter__()
+            try:
+                with self._view(format=format) as view:
+                    yield view
+            finally:
+                self._close()
+            return
+
+        if format is None:
+            format = self.format
+        else:
+            format = self._resolve_format(format)
+        self._check_format(format)
+
+        with self._locked_view(format) as view, view.toreadonly() as readonly:
+            yield readonly
+
+    def iter_chunks(
+        self,
+        format: Optional[ClipboardFormatType] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        decode: bool = False,
+    ) -> Iterator[Union[bytes, str]]:
+        """Read the clipboard data a chunk at a time.
+
+        Each chunk is copied from the locked clipboard memory as it is read,
+        so only one chunk is in memory at once. The clipboard is kept open,
+        and the memory locked, until the iterator is exhausted or closed.
+
+        Parameters
+        ----------
+        format : Optional[ClipboardFormatType]
+            The format of the clipboard data.
+            If None, the default format is used.
+        chunk_size : int
+            Bytes read per chunk.
+        decode : bool
+            Decode the data, as UTF-16LE for CF_UNICODETEXT and UTF-8
+            otherwise, yielding `str` chunks.
+            Either way, text is read without its null terminator, and PNG
+            without the memory after the file, as `get_clipboard` reads them.
+
+        Raises
+        ------
+        FormatNotSupportedError
+            If the format is not on the clipboard.
+        GetClipboardError
+            If getting the clipboard data failed.
+        LockError
+            If locking the clipboard failed.
+        OpenClipboardError
+            If opening the clipboard failed.
+        """
+        from clipboard.streams import iter_chunks
+        from clipboard.streams import iter_decoded
+
+        format = self.format if format is None else self._resolve_format(format)
+        with self._view(format) as view, self._content(format, view) as data:
+            if decode:
+                encoding = self._text_encoding(format)
+                yield from iter_decoded(data, encoding, chunk_size)
+            else:
+                for chunk in iter_chunks(data, chunk_size):
+                    yield chunk.tobytes()
+
+    def read_into(
+        self,
+        fileobj: Union[BinaryIO, TextIO],
+        format: Optional[ClipboardFormatType] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        decode: bool = False,
+    ) -> int:
+        """Write the clipboard data to a file object, a chunk at a time.
+
+        Binary files are written straight from the locked clipboard memory,
+        without copying it. Pass `decode=True` for text files, see
+        `iter_chunks`.
+
+        Returns
+        -------
+        int
+            Bytes, or characters if decoded, written.
+
+        Raises
+        ------
+        FormatNotSupportedError
+            If the format is not on the clipboard.
+        GetClipboardError
+            If getting the clipboard data failed.
+        LockError
+            If locking the clipboard failed.
+        OpenClipboardError
+            If opening the clipboard failed.
+        """
+        written: int = 0
+        if decode:
+            for text in self.iter_chunks(format, chunk_size, decode=True):
+                fileobj.write(text)  # type: ignore
+                written += len(text)
+            return written
+
+        from clipboard.streams import iter_chunks
+
+        format = self.format if format is None else self._resolve_format(format)
+        with self._view(format) as view, self._content(format, view) as data:
+            for chunk in iter_chunks(data, chunk_size):
+                fileobj.write(chunk)  # type: ignore
+                written += len(chunk)
+        return written
+
+    def get_image(self, image_format: str = "png") -> Optional[bytes]:
+        """Get the image on the clipboard as a file, None if there is none.
+
+        The format needing the least work is read: PNG is returned untouched
+        if it is on the clipboard and a PNG file is wanted, and CF_DIBV5, as it
+        keeps alpha, or CF_DIB are preferred for BMP files. Bitmaps are
+        converted straight from the locked clipboard memory, see
+        `clipboard.images`.
+
+        Parameters
+        ----------
+        image_format : str
+            "png" or "bmp".
+
+        Raises
+        ------
+        ValueError
+            If the image format is not "png" or "bmp".
+        ImageParseError
+            If the image can not be parsed, or converted.
+        GetClipboardError
+            If getting the clipboard data failed.
+        LockError
+            If locking the clipboard failed.
+        """
+        if image_format not in ("png", "bmp"):
+            raise ValueError(f"Images can not be read as {image_format!r}.")
+        if not self.opened:
+            with self:
+                return self.get_image(image_format)
+            return None
+
+        from clipboard.formats import ClipboardFormat
+        from clipboard.images import decode_png
+        from clipboard.images import parse_dib
+        from clipboard.images import png_size
+
+        png = ClipboardFormat.CF_PNG.value
+        bitmaps = (ClipboardFormat.CF_DIBV5.value, ClipboardFormat.CF_DIB.value)
+        formats = (png, *bitmaps) if image_format == "png" else (*bitmaps, png)
+        for format in formats:
+            if not self.has_format(format):
+                continue
+            with trace("get"), self._locked_view(format) as view:
+                if format == png:
+                    data = view[: png_size(view)]
+                    if image_format == "png":
+                        return data.tobytes()
+                    return decode_png(data).to_bmp()
+                bitmap = parse_dib(view)
+                if image_format == "png":
+                    return bitmap.to_png()
+                return bitmap.to_bmp()
+        return None
+
+    def get_files(self) -> Optional[List[str]]:
+        """Get the paths of the files on the clipboard, e.g. copied in Explorer.
+
+        The CF_HDROP data is decoded straight from the locked clipboard memory.
+        None if there are no files on the clipboard.
+
+        Raises
+        ------
+        DropFilesParseError
+            If the CF_HDROP data can not be parsed.
+        GetClipboardError
+            If getting the clipboard data failed.
+        LockError
+            If locking the clipboard failed.
+        """
+        if not self.opened:
+            with self:
+                return self.get_files()
+            return None
+
+        from clipboard.files import decode_dropfiles
+        from clipboard.formats import ClipboardFormat
+
+        format = ClipboardFormat.CF_HDROP.value
+        if not self.has_format(format):
+            return None
+        with trace("get"), self._locked_view(format) as view:
+            return decode_dropfiles(view)
+
+    def _content(self, format: int, view: memoryview) -> memoryview:
+        """Slice the data for `format` as `_decode` reads it.
+
+        Text is sliced without its terminator, and PNG without the memory after
+        the file.
+        """
+        from clipboard.formats import ClipboardFormat
+
+        if format == ClipboardFormat.CF_UNICODETEXT.value:
+            return view[:-2]
+        if (
+            format == ClipboardFormat.CF_HTML.value
+            or format == ClipboardFormat.HTML_Format.value
+        ):
+            return view[:-1]
+        if (
+            format == ClipboardFormat.CF_DIB.value
+            or format == ClipboardFormat.CF_DIBV5.value
+            or format == ClipboardFormat.CF_HDROP.value
+            or format == ClipboardFormat.CF_LOCALE.value
+        ):
+            return view[:]
+        if (
+            format == ClipboardFormat.CF_TEXT.value
+            or format == ClipboardFormat.CF_OEMTEXT.value
+        ):
+            from clipboard.locales import text_size
+
+            return view[: text_size(view)]
+        if format == ClipboardFormat.CF_PNG.value:
+            from clipboard.images import png_size
+
+            try:
+                return view[: png_size(view)]
+            except ImageParseError:
+                return view[:]
+        # Registered text formats, e.g. RTF, end with a null character.
+        if view[-1:] == b"\0":
+            return view[:-1]
+        return view[:]
+
+    def _text_encoding(self, format: int) -> str:
+        """The encoding of `format`'s data on the open clipboard."""
+        from clipboard.formats import ClipboardFormat
+
+        if format == ClipboardFormat.CF_UNICODETEXT.value:
+            return UTF_ENCODING
+        if format == ClipboardFormat.CF_HTML.value:
+            return HTML_ENCODING
+        if (
+            format == ClipboardFormat.CF_TEXT.value
+            or format == ClipboardFormat.CF_OEMTEXT.value
+        ):
+            from clipboard.locales import get_text_encoding
+
+            return get_text_encoding(
+                self._get_locale(), oem=format == ClipboardFormat.CF_OEMTEXT.value
+            )
+        return "utf-8"
+
+    @contextmanager
+    def _locked_view(self, format: int) -> Iterator[memoryview]:
+        """Lock the clipboard data for `format`, and view its memory.
+
+        The clipboard must be open.
+
+        Raises
+        ------
+        GetClipboardError
+            If getting the clipboard data failed.
+        LockError
+            If locking the clipboard failed.
+        """
+        address: LPVOID
+        if not _tracing.active:
+            address = self._lock_format(format)
+        else:
+            with trace("lock", self.backend, format=format) as span:
+                address = self._lock_format(format)
+                span.set(bytes=self.size)
+        try:
+            if not self.size:
+                # 0 means that the function failed.
+                raise GetClipboardError("The `GlobalSize` function failed.")
+
+            array = (ctypes.c_char * self.size).from_address(address)
+            with memoryview(array).cast("B") as view:
+                yield view
+        finally:
+            # FIXME: This fails frequently, likely due to a resource management
+            # error.
+            try:
+                self._unlock()
+            except LockError:
+                pass
+
+    def _lock_format(self, format: int) -> LPVOID:
+        """Lock the clipboard data for `format`, returning its address.
+
+        Its handle, address and size are kept, to unlock it.
+
+        Raises
+        ------
+        GetClipboardError
+            If getting the clipboard data failed.
+        LockError
+            If locking the clipboard failed.
+        """
+        self.h_clip_mem = self.backend.get_clipboard_data(format)
+        if self.h_clip_mem is None:
+            raise GetClipboardError("The `GetClipboardData` function failed.")
+        self.address = self._lock(self.h_clip_mem)
+        self.size = self.backend.global_size(self.h_clip_mem)
+        return self.address
+
+    def _check_format(self, format: int) -> None:
+        """Check that `format` is on the clipboard.
+
+        Raises
+        ------
+        FormatNotSupportedError
+            If the format is not on the clipboard.
+        """
+        if self.has_format(format):
+            return
+
+        # Only enumerated for the error message.
+        formats = self.available_formats()
+        if format not in formats:
+            raise FormatNotSupportedError(
+                f"{format} is not supported for getting the clipboard."
+                f" Choose from following {formats}"
+            )
+
     def set_clipboard(
         self,
         content: Union[str, bytes],
@@ -252,9 +991,8 @@ class Clipboard:
         SetClipboardError
             If setting the clipboard data failed.
         """
-        logger.info("Setting clipboard data")
-
-        set_handle: HANDLE = self._set_clipboard(content, format)
+        with trace("set"):
+            set_handle: HANDLE = self._set_clipboard(content, format)
 
         return set_handle
 
@@ -279,8 +1017,6 @@ class Clipboard:
             If the format is not supported.
         """
 
-        logger.info("_Setting clipboard data")
-
         if format is None:
             format = self.format
 
@@ -291,24 +1027,293 @@ class Clipboard:
         format = self._resolve_format(format)
         self._empty()
 
-        set_handle: HANDLE
-        alloc_handle: HANDLE
+        return self._place_format(format, content)
+
+    def open_writer(
+        self,
+        format: Optional[ClipboardFormatType] = None,
+        size_hint: int = 0,
+        empty: bool = True,
+    ) -> "ClipboardWriter":
+        """Write data for `format` a chunk at a time, see `ClipboardWriter`.
+
+        The data is written straight into the clipboard's memory, so a large
+        payload never has to be built, or encoded, all at once. It is placed
+        on the clipboard when the writer is closed.
+
+        Parameters
+        ----------
+        format : Optional[ClipboardFormatType]
+            The format of the clipboard data.
+            If None, the default format is used.
+        size_hint : int
+            Expected size of the encoded data, in bytes. The memory is grown as
+            needed, but given the exact size it is never grown or copied.
+        empty : bool
+            Empty the clipboard before placing the data on it. Pass False to
+            add the format to what is on the open clipboard.
+
+        Raises
+        ------
+        FormatNotSupportedError
+            If the format is not supported.
+        SetClipboardError
+            If allocating the memory failed.
+        """
+        from clipboard.streams import ClipboardWriter
+
+        if format is None:
+            format = self.format
+        return ClipboardWriter(
+            self, self._resolve_format(format), size_hint=size_hint, empty=empty
+        )
+
+    def set_many(
+        self,
+        contents: Mapping[ClipboardFormatType, Union[str, bytes, Provider]],
+    ) -> Dict[int, Optional[HANDLE]]:
+        """Set several formats at once, e.g. text alongside HTML and RTF.
+
+        The clipboard is opened, emptied, and closed once for all of them, so
+        every format given ends up on the clipboard.
+
+        Content can also be given as a provider, a function returning it, for
+        formats that are expensive to produce. With delayed rendering, the
+        provider is only called when the format is requested, e.g. pasted, and
+        never otherwise. Providers must not use the clipboard themselves.
+
+        Returns
+        -------
+        Dict[int, Optional[HANDLE]]
+            The handle set for each format, None for delayed formats.
+
+        Raises
+        ------
+        SetClipboardError
+            If setting the clipboard data failed.
+        OpenClipboardError
+            If opening the clipboard failed.
+        EmptyClipboardError
+            If emptying the clipboard failed.
+        FormatNotSupportedError
+            If a format is not supported.
+        """
+        with trace("set", formats=len(contents)):
+            return self._set_many(contents)
+
+    def _set_many(
+        self,
+        contents: Mapping[ClipboardFormatType, Union[str, bytes, Provider]],
+    ) -> Dict[int, Optional[HANDLE]]:
+        if not self.opened:
+            if any(map(callable, contents.values())):
+                # Delayed rendering needs the clipboard opened by its owner.
+                self._owner_window = self.backend.owner_window()
+            try:
+                with self:
+                    return self._set_many(contents)
+            finally:
+                self._owner_window = None
+            raise SetClipboardError("Setting the clipboard failed.")
+
+        # Resolve them all first, so nothing is emptied if one is invalid.
+        resolved: List[Tuple[int, Union[str, bytes, Provider]]] = [
+            (self._resolve_format(format), content)
+            for format, content in contents.items()
+        ]
+        self._empty()
+
+        return {
+            format: self._set_format(format, content) for format, content in resolved
+        }
+
+    def set_image(self, image: "ImageData") -> Dict[int, Optional[HANDLE]]:
+        """Set an image, given as a PNG or BMP file, or as CF_DIB data.
+
+        A PNG file is placed on the clipboard as PNG, untouched, with CF_DIB,
+        and CF_DIBV5 if it has alpha, only decoded from it once they are
+        requested. Bitmaps are placed on the clipboard as CF_DIB, and CF_DIBV5
+        if they have alpha, with PNG only encoded once it is requested, unless
+        the bitmap can not be encoded as PNG. See `set_many` for delayed
+        rendering.
+
+        Returns
+        -------
+        Dict[int, Optional[HANDLE]]
+            The handle set for each format, None for delayed formats.
+
+        Raises
+        ------
+        ImageParseError
+            If the image can not be parsed.
+        SetClipboardError
+            If setting the clipboard data failed.
+        """
+        from clipboard.formats import ClipboardFormat
+        from clipboard.images import PNG_SIGNATURE
+        from clipboard.images import Bitmap
+        from clipboard.images import decode_png
+        from clipboard.images import parse_dib
+        from clipboard.images import parse_image
+        from clipboard.images import png_size
+        from clipboard.images import read_png_header
+
+        png_format = ClipboardFormat.CF_PNG.value
+        dib_format = ClipboardFormat.CF_DIB.value
+        dib_v5_format = ClipboardFormat.CF_DIBV5.value
+        contents: Dict[ClipboardFormatType, Union[str, bytes, Provider]] = {}
+
+        view = memoryview(image).cast("B")
+        if view[:8] == PNG_SIGNATURE:
+            color_type = read_png_header(view)[3]
+            png = view[: png_size(view)].tobytes()
+
+            # Decoded at most once, for whichever bitmap is requested first.
+            @functools.lru_cache(maxsize=1)
+            def decoded() -> Bitmap:
+                return decode_png(png)
+
+            contents[png_format] = png
+            contents[dib_format] = lambda: decoded().to_dib()
+            if color_type in (4, 6):
+                contents[dib_v5_format] = lambda: decoded().to_dib(v5=True)
+            return self.set_many(contents)
+
+        bitmap = parse_image(view)
+        dib = bitmap.to_dib()
+        contents[dib_format] = dib
+        if bitmap.has_alpha:
+            contents[dib_v5_format] = bitmap.to_dib(v5=True)
+        # Checked now, as there is no caller to raise to once PNG is requested.
+        if bitmap.supports_png:
+            contents[png_format] = lambda: parse_dib(dib).to_png()
+        return self.set_many(contents)
+
+    def set_files(self, paths: Iterable["PathType"]) -> HANDLE:
+        """Set a list of files, to be pasted e.g. in Explorer.
+
+        The paths should be absolute. They are placed on the clipboard as
+        CF_HDROP.
+
+        Raises
+        ------
+        ValueError
+            If a path is empty, or contains a null character.
+        SetClipboardError
+            If setting the clipboard data failed.
+        """
+        from clipboard.files import encode_dropfiles
+        from clipboard.formats import ClipboardFormat
+
+        return self.set_clipboard(
+            encode_dropfiles(paths), format=ClipboardFormat.CF_HDROP
+        )
+
+    def _set_format(
+        self, format: int, content: Union[str, bytes, Provider]
+    ) -> Optional[HANDLE]:
+        """Allocate `content` and place it on the open clipboard as `format`.
+
+        Given a provider, the format is placed on the clipboard without data
+        and the provider is only called once the format is requested, if the
+        backend supports delayed rendering. It is called right away if not.
+        The handle is None while the format is not rendered.
+
+        Raises
+        ------
+        SetClipboardError
+            If setting the clipboard data failed.
+        """
+        if callable(content):
+            if self.backend.delay_render(format, self._renderer(format, content)):
+                self._invalidate_formats()
+                return None
+            content = content()
+
+        return self._place_format(format, content)
+
+    def _place_format(self, format: int, content: Union[str, bytes]) -> HANDLE:
+        """Allocate `content` and place it on the open clipboard as `format`.
+
+        Raises
+        ------
+        SetClipboardError
+            If setting the clipboard data failed.
+        """
+        alloc_handle: HANDLE = self._alloc_format(format, content)
+        set_handle: Optional[HANDLE] = self.backend.set_clipboard_data(
+            format, alloc_handle
+        )
+
+        self._invalidate_formats()
+        if set_handle is None:
+            raise SetClipboardError("Setting the clipboard failed.")
+
+        return set_handle
+
+    def _renderer(
+        self, format: int, provider: Provider
+    ) -> Callable[[], Optional[HANDLE]]:
+        """Wrap `provider` to allocate what it returns, when it is requested."""
+
+        def render() -> Optional[HANDLE]:
+            try:
+                return self._alloc_format(format, provider())
+            except Exception:
+                # Called by the backend, so there is no caller to raise to.
+                import traceback
+
+                traceback.print_exc()
+                return None
+
+        return render
+
+    def _alloc_format(self, format: int, content: Union[str, bytes]) -> HANDLE:
+        """Allocate global memory holding `content` encoded for `format`.
+
+        Raises
+        ------
+        SetClipboardError
+            If allocating the memory failed.
+        """
+        if not _tracing.active:
+            return self._alloc_content(format, content)[0]
+        with trace("copy", self.backend, format=format) as span:
+            alloc_handle, size = self._alloc_content(format, content)
+            span.set(bytes=size)
+        return alloc_handle
+
+    def _alloc_content(
+        self, format: int, content: Union[str, bytes]
+    ) -> Tuple[HANDLE, int]:
+        """Allocate `content` encoded for `format`, and its size in bytes.
+
+        Raises
+        ------
+        SetClipboardError
+            If allocating the memory failed.
+        """
+        from clipboard.formats import ClipboardFormat
+
+        alloc_handle: Optional[HANDLE]
         content_bytes: bytes
         contents_ptr: LPVOID
+        size: int
         if format == ClipboardFormat.CF_UNICODETEXT.value:
             if isinstance(content, str):
                 content_bytes = content.encode(encoding=UTF_ENCODING)
             else:
                 content_bytes = content
+            size = len(content_bytes)
 
-            alloc_handle = GlobalAlloc(
-                GMEM_MOVEABLE | GMEM_ZEROINIT, len(content_bytes) + 2
+            alloc_handle = self.backend.global_alloc(
+                GMEM_MOVEABLE | GMEM_ZEROINIT, size + 2
             )
-            contents_ptr = GlobalLock(alloc_handle)
+            if alloc_handle is None:
+                raise SetClipboardError("The `GlobalAlloc` function failed.")
+            contents_ptr = self.backend.global_lock(alloc_handle)  # type: ignore
             ctypes.memmove(contents_ptr, content_bytes, len(content_bytes))
-            GlobalUnlock(alloc_handle)
-
-            set_handle = SetClipboardData(format, alloc_handle)
+            self.backend.global_unlock(alloc_handle)
 
         elif (
             format == ClipboardFormat.CF_HTML.value
@@ -319,40 +1324,78 @@ class Clipboard:
                 content_str = content.decode(encoding=HTML_ENCODING)
             else:
                 content_str = content  # type: ignore
+            from clipboard.html_clipboard import HTMLTemplate
+
             template: HTMLTemplate = HTMLTemplate(content_str)
-            html_content_bytes: bytes = template.generate().encode(
-                encoding=HTML_ENCODING
+            parts, size = template.encode_parts()
+
+            alloc_handle = self.backend.global_alloc(
+                GMEM_MOVEABLE | GMEM_ZEROINIT, size + 1
             )
+            if alloc_handle is None:
+                raise SetClipboardError("The `GlobalAlloc` function failed.")
+            contents_ptr = self.backend.global_lock(alloc_handle)  # type: ignore
+            # Written straight into the allocation, without joining the parts.
+            offset: int = 0
+            for part in parts:
+                ctypes.memmove(contents_ptr + offset, part, len(part))
+                offset += len(part)
+            self.backend.global_unlock(alloc_handle)
+
+        elif (
+            format == ClipboardFormat.CF_TEXT.value
+            or format == ClipboardFormat.CF_OEMTEXT.value
+        ):
+            if isinstance(content, str):
+                # In the system's code page, which Windows gives CF_LOCALE.
+                from clipboard.locales import encode_text
 
-            alloc_handle = GlobalAlloc(
-                GMEM_MOVEABLE | GMEM_ZEROINIT, len(html_content_bytes) + 1
+                content_bytes = encode_text(
+                    content, oem=format == ClipboardFormat.CF_OEMTEXT.value
+                )
+            else:
+                content_bytes = content
+            size = len(content_bytes)
+
+            alloc_handle = self.backend.global_alloc(
+                GMEM_MOVEABLE | GMEM_ZEROINIT, size + 1
             )
-            contents_ptr = GlobalLock(alloc_handle)  # type: ignore
-            ctypes.memmove(contents_ptr, html_content_bytes, len(html_content_bytes))
-            GlobalUnlock(alloc_handle)
+            if alloc_handle is None:
+                raise SetClipboardError("The `GlobalAlloc` function failed.")
+            contents_ptr = self.backend.global_lock(alloc_handle)  # type: ignore
+            ctypes.memmove(contents_ptr, content_bytes, len(content_bytes))
+            self.backend.global_unlock(alloc_handle)
 
-            set_handle = SetClipboardData(format, alloc_handle)
         else:
             if isinstance(content, str):
                 # Most general content is going to be utf-8.
                 content_bytes = content.encode(encoding="utf-8")
             else:
                 content_bytes = content
+            size = len(content_bytes)
 
-            alloc_handle = GlobalAlloc(GMEM_MOVEABLE, len(content_bytes) + 1)
-            contents_ptr = GlobalLock(alloc_handle)
+            alloc_handle = self.backend.global_alloc(GMEM_MOVEABLE, size + 1)
+            if alloc_handle is None:
+                raise SetClipboardError("The `GlobalAlloc` function failed.")
+            contents_ptr = self.backend.global_lock(alloc_handle)  # type: ignore
             ctypes.memmove(contents_ptr, content_bytes, len(content_bytes))
-            GlobalUnlock(alloc_handle)
+            self.backend.global_unlock(alloc_handle)
 
-            set_handle = SetClipboardData(format, alloc_handle)
+        return alloc_handle, size
 
-        if set_handle is None:
-            raise SetClipboardError("Setting the clipboard failed.")
+    def resolve_format(self, format: ClipboardFormatType) -> int:
+        """The id of a format, given by its id, its name, or a ClipboardFormat,
+        as registered with this clipboard's backend.
 
-        return set_handle
+        Raises
+        ------
+        FormatNotSupportedError
+            If the format is not supported.
+        """
+        return self._resolve_format(format)
 
     def _resolve_format(self, format: ClipboardFormatType) -> int:
-        """Given an integer, representing a clipboard format, or a
+        """Given an integer, representing a clipboard format, its name, or a
         ClipboardFormat object, return the respective integer.
 
         Raises
@@ -361,26 +1404,21 @@ class Clipboard:
             If the format is not supported.
         """
 
-        logger.info("Resolving clipboard format")
+        registry = self._format_registry
+        if registry is None:
+            from clipboard.formats import get_format_registry
 
-        if isinstance(format, ClipboardFormat):
-            format = format.value
-        elif isinstance(format, int):
-            pass
-        elif isinstance(format, str):
-            try:
-                format = ClipboardFormat[format].value
-            except KeyError as exc:
-                formats = self.available_formats()
-                raise FormatNotSupportedError(
-                    f"{format} is not a supported clipboard format."
-                    f" Choose from following {formats}"
-                ) from exc
-
-        # FIXME: There are issues with HTML_Format, so use CF_HTML
-        if format == ClipboardFormat.HTML_Format.value:
-            format = ClipboardFormat.CF_HTML.value
-        return format  # type: ignore
+            registry = self._format_registry = get_format_registry(self.backend)
+
+        resolved = registry.resolve(format)
+        if resolved is None:
+            from clipboard.formats import ClipboardFormat
+
+            raise FormatNotSupportedError(
+                f"{format} is not a supported clipboard format."
+                f" Choose from following {list(ClipboardFormat.__members__)}"
+            )
+        return resolved
 
     def __getitem__(self, format: ClipboardFormatType):
         """Get data from clipboard, returning None if nothing is on it.
@@ -409,8 +1447,6 @@ class Clipboard:
             If emptying the clipboard failed.
             The clipboard needs to be emptied before setting new data.
         """
-        format = self._resolve_format(format)
-        self._empty()
         self.set_clipboard(content, format)
 
     def __enter__(self):
@@ -422,27 +1458,42 @@ class Clipboard:
             If opening the clipboard failed.
             Can only be raised if the clipboard isn't already opened.
         """
-        logger.info("Entering context manager")
-
-        # There is an issue with opening the clipboard repeatedly.
-        # This is likely due to a logical error when locking and unlocking.
-        #
-        # This successfully fixes the issue, although it is blunt.
-        max_tries = 3
-        tries = 0
-        while not self.opened and tries < max_tries:
-            if tries > 0:
-                time.sleep(0.01)
-            tries += 1
-            if self._open():
-                return self
-            self._close()
-
-        raise OpenClipboardError("Failed to open clipboard.")
+        if self.opened:
+            raise OpenClipboardError("Failed to open clipboard.")
+
+        from clipboard.retry import get_contention_stats
+        from clipboard.retry import get_retry_policy
+
+        policy: "RetryPolicy" = (
+            self.retry_policy if self.retry_policy is not None else get_retry_policy()
+        )
+        self.open_attempts = 0
+        self.open_wait = 0.0
+        with trace("open") as span:
+            for wait in policy.waits():
+                if wait:
+                    slept_at = time.perf_counter()
+                    time.sleep(wait)
+                    self.open_wait += time.perf_counter() - slept_at
+                self.open_attempts += 1
+                if self._open():
+                    get_contention_stats().record(
+                        self.open_attempts, self.open_wait, opened=True
+                    )
+                    span.set(attempts=self.open_attempts, wait=self.open_wait)
+                    return self
+                self._close()
+
+            get_contention_stats().record(
+                self.open_attempts, self.open_wait, opened=False
+            )
+            span.set(attempts=self.open_attempts, wait=self.open_wait)
+            raise OpenClipboardError("Failed to open clipboard.")
 
     def __exit__(self, exception_type, exception_value, exception_traceback) -> bool:
-        logger.info("Exiting context manager")
         if exception_type is not None:
+            import traceback
+
             traceback.print_exception(
                 exception_type, exception_value, exception_traceback
             )
@@ -451,21 +1502,24 @@ class Clipboard:
         return True
 
     def _open(self, handle: Optional[HANDLE] = None) -> bool:
-        logger.info("_Opening clipboard")
-        opened: bool = bool(OpenClipboard(handle))
+        if handle is None:
+            handle = self._owner_window
+        opened: bool = self.backend.open_clipboard(handle)
         self.opened = opened
+        self._invalidate_formats()
         return opened
 
     def _close(self) -> bool:
-        logger.info("_Closing clipboard")
         self.opened = False
-        # FIXME: This fails frequently, likely due to a resource management
-        # error.
-        try:
-            self._unlock()
-        except LockError:
-            pass
-        return CloseClipboard()
+        self._invalidate_formats()
+        with trace("close"):
+            # FIXME: This fails frequently, likely due to a resource management
+            # error.
+            try:
+                self._unlock()
+            except LockError:
+                pass
+            return self.backend.close_clipboard()
 
     def _lock(self, handle: HANDLE) -> LPVOID:
         """Lock clipboard.
@@ -475,8 +1529,7 @@ class Clipboard:
         LockError
             If locking the clipboard failed.
         """
-        logger.info("_Locking clipboard")
-        locked: LPVOID = GlobalLock(handle)
+        locked: Optional[LPVOID] = self.backend.global_lock(handle)
         self.locked = bool(locked)
         if locked is None:
             raise LockError("The `GlobalLock` function failed.")
@@ -491,7 +1544,6 @@ class Clipboard:
         LockError
             If unlocking the clipboard failed.
         """
-        logger.info("_Unlocking clipboard")
         if handle is None:
             handle = self.h_clip_mem
 
@@ -503,7 +1555,7 @@ class Clipboard:
             # Clipboard is already unlocked
             return True
 
-        unlocked: bool = bool(GlobalUnlock(handle))  # non-zero
+        unlocked: bool = self.backend.global_unlock(handle)
         self.locked = not unlocked
         if not unlocked:
             raise LockError("The `GlobalUnlock` function failed.")
@@ -517,13 +1569,14 @@ class Clipboard:
         EmptyClipboardError
             If emptying the clipboard failed.
         """
-        logger.info("_Emptying clipboard")
         if not self.opened:
             with self:
                 return self._empty()
         elif self.opened:
-            # FIXME: A false means that this failed.
-            return bool(EmptyClipboard())
+            self._invalidate_formats()
+            with trace("empty"):
+                # FIXME: A false means that this failed.
+                return self.backend.empty_clipboard()
         else:
             raise EmptyClipboardError("Emptying the clipboard failed.")
 
@@ -2,3 +2,5 @@
 
 UTF_ENCODING: str = "UTF-16LE"
 HTML_ENCODING: str = "UTF-8"
+# Bytes read, or written, at a time when streaming clipboard data.
+DEFAULT_CHUNK_SIZE: int = 1024 * 1024
@@ -31,3 +31,15 @@ class LockError(Exception):
 
 class GetFormatsError(Exception):
     """Exception raised when getting clipboard formats fails."""
+
+
+class HTMLParseError(Exception):
+    """Exception raised when parsing CF_HTML data fails."""
+
+
+class ImageParseError(Exception):
+    """Exception raised when parsing, or converting, an image fails."""
+
+
+class DropFilesParseError(Exception):
+    """Exception raised when parsing CF_HDROP data fails."""
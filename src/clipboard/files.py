@@ -0,0 +1,100 @@
+"""Code for handling CF_HDROP clipboard data, lists of files.
+
+CF_HDROP holds a DROPFILES structure, then the paths, each ending with a null
+character, and one more null character ending the list. The paths are wide
+(UTF-16) characters when the structure's `fWide` is set, and in the ANSI code
+page otherwise.
+"""
+
+import os
+import re
+import struct
+from typing import Iterable
+from typing import List
+from typing import Union
+
+from clipboard.constants import UTF_ENCODING
+from clipboard.errors import DropFilesParseError
+from clipboard.locales import DEFAULT_ANSI_ENCODING
+
+
+# pFiles, pt.x, pt.y, fNC, fWide
+_DROPFILES = struct.Struct("<IiiII")
+DROPFILES_SIZE: int = _DROPFILES.size
+
+_ANSI_END_PATTERN = re.compile(rb"\0\0")
+
+PathType = Union[str, "os.PathLike[str]"]  # Type Alias
+
+
+def encode_dropfiles(paths: Iterable[PathType]) -> bytes:
+    """Encode paths as CF_HDROP data, with wide characters.
+
+    The paths are joined once, so building a list of many thousands of paths
+    takes linear time. They should be absolute, for the applications pasting
+    them.
+
+    Raises
+    ------
+    ValueError
+        If a path is empty or contains a null character, as it would end the
+        list.
+    """
+    names: List[str] = [os.fspath(path) for path in paths]
+    for name in names:
+        if not name or "\0" in name:
+            raise ValueError(f"{name!r} can not be put on the clipboard.")
+
+    # Each path ends with a null character, and the list with another.
+    text = "\0".join(names) + "\0\0"
+    header = _DROPFILES.pack(DROPFILES_SIZE, 0, 0, 0, 1)
+    return header + text.encode(UTF_ENCODING)
+
+
+def decode_dropfiles(
+    data: Union[bytes, bytearray, memoryview],
+    encoding: str = DEFAULT_ANSI_ENCODING,
+) -> List[str]:
+    """Decode CF_HDROP data to its paths, without copying it first.
+
+    Anything after the end of the list, such as the rest of the clipboard
+    memory, is ignored.
+
+    Parameters
+    ----------
+    encoding : str
+        Encoding of the paths in lists that are not wide, which are rare. The
+        system's ANSI code page by default.
+
+    Raises
+    ------
+    DropFilesParseError
+        If the data is too short, or the list has no end.
+    """
+    view: memoryview = memoryview(data).cast("B")
+    if len(view) < DROPFILES_SIZE:
+        raise DropFilesParseError("The data is too short for a DROPFILES structure.")
+    offset, _, _, _, wide = _DROPFILES.unpack_from(view)
+    if not DROPFILES_SIZE <= offset <= len(view):
+        raise DropFilesParseError(f"The file list's offset, {offset}, is not valid.")
+
+    text: str
+    if wide:
+        end = offset + (len(view) - offset) // 2 * 2
+        # Anything after the list can be invalid UTF-16, hence "surrogatepass".
+        text = str(view[offset:end], UTF_ENCODING, "surrogatepass")
+        # A list of no paths is only its last null character.
+        if text[:1] == "\0":
+            return []
+        length = text.find("\0\0")
+        if length < 0:
+            raise DropFilesParseError("The file list has no end.")
+        text = text[:length]
+    else:
+        if view[offset : offset + 1] == b"\0":
+            return []
+        match = _ANSI_END_PATTERN.search(view, offset)
+        if match is None:
+            raise DropFilesParseError("The file list has no end.")
+        text = str(view[offset : match.start()], encoding)
+    return text.split("\0")
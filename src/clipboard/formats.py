@@ -1,27 +1,198 @@
 """Clipboard Formats"""
 
-import ctypes
+import threading
+import weakref
+from collections import OrderedDict
 from enum import Enum
 from enum import EnumMeta
 from typing import Any
+from typing import Dict
+from typing import Iterable
 from typing import Optional
+from typing import Union
 
-from clipboard._c_interface import CF_HTML
-from clipboard._c_interface import CF_RTF
-from clipboard._c_interface import GetClipboardFormatNameA
+from clipboard.backends import ClipboardBackend
+from clipboard.backends import get_backend
+
+
+# Names of formats looked up with the backend, kept by `FormatRegistry`.
+NAME_CACHE_SIZE: int = 1024
+
+
+class FormatRegistry:
+    """Clipboard format ids and names for a backend, indexed both ways.
+
+    Registered format ids are stable for the session, so a format is only
+    registered with the backend the first time, and its name is kept with it.
+    Names of formats registered by other applications are looked up with the
+    backend once, and kept in a bounded LRU cache.
+    Use `get_format_registry` rather than creating it directly.
+    """
+
+    def __init__(
+        self, backend: ClipboardBackend, maxsize: int = NAME_CACHE_SIZE
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.backend: ClipboardBackend = backend
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._lock = threading.Lock()
+        # Registered names are case insensitive, so indexed casefolded.
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        # Looked up with the backend, least recently used first.
+        self._cache: "OrderedDict[int, str]" = OrderedDict()
+
+    def register(self, name: str) -> int:
+        """Register a format by name, returning its id, or 0 if it failed."""
+        key = name.casefold()
+        format = self._ids.get(key)
+        if format is not None:
+            return format
+
+        format = self.backend.register_clipboard_format(name)
+        if format:
+            with self._lock:
+                self._ids.setdefault(key, format)
+                self._names.setdefault(format, name)
+        return format
+
+    def name(self, format: int) -> Optional[str]:
+        """Get the name of a format by its id, None if it is not found."""
+        member = _MEMBERS_BY_VALUE.get(format)
+        if member is not None:
+            return member.name
+        name = self._names.get(format)
+        if name is not None:
+            return name
+
+        with self._lock:
+            name = self._cache.get(format)
+            if name is not None:
+                self._cache.move_to_end(format)
+                self.hits += 1
+                return name
+            self.misses += 1
+
+        name = self.backend.get_clipboard_format_name(format)
+        # Ids not found are not cached, as they may be registered later.
+        if name is not None:
+            with self._lock:
+                self._cache[format] = name
+                self._cache.move_to_end(format)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        return name
+
+    def names(self, formats: Iterable[int]) -> Dict[int, Optional[str]]:
+        """Get the names of many formats by their ids, see `name`."""
+        return {format: self.name(format) for format in formats}
+
+    def warm(self, formats: Iterable[int]) -> None:
+        """Look up and cache the names of formats, e.g. at startup."""
+        for format in formats:
+            self.name(format)
+
+    def cached_names(self) -> Dict[int, str]:
+        """The names known without asking the backend, by format id.
+
+        Standard formats are left out.
+        """
+        with self._lock:
+            return {**self._cache, **self._names}
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hits and misses of the name cache, and its size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "maxsize": self.maxsize,
+                "size": len(self._cache),
+            }
+
+    def clear_cache(self) -> None:
+        """Forget the names looked up with the backend.
+
+        Names of formats registered with `register` are kept.
+        """
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def resolve(self, format: Union[int, str, "ClipboardFormat"]) -> Optional[int]:
+        """Get the id of a format, given its id, name or `ClipboardFormat`.
+
+        Names are those of `ClipboardFormat`, or of formats registered with
+        `register`. None if the name is not found.
+        """
+        resolved: Optional[int] = None
+        if isinstance(format, ClipboardFormat):
+            resolved = format.value
+        elif isinstance(format, int):
+            resolved = format
+        elif isinstance(format, str):
+            member = _MEMBERS_BY_NAME.get(format)
+            if member is not None:
+                resolved = member.value
+            else:
+                resolved = self._ids.get(format.casefold())
+
+        # FIXME: There are issues with HTML_Format, so use CF_HTML
+        if resolved == _HTML_FORMAT:
+            resolved = CF_HTML
+        return resolved
+
+
+_registries: "weakref.WeakKeyDictionary[ClipboardBackend, FormatRegistry]" = (
+    weakref.WeakKeyDictionary()
+)
+_registries_lock = threading.Lock()
+
+
+def get_format_registry(
+    backend: Optional[ClipboardBackend] = None,
+) -> FormatRegistry:
+    """Return the format registry of a backend, the process-wide one by default."""
+    if backend is None:
+        backend = get_backend()
+    registry = _registries.get(backend)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(backend)
+            if registry is None:
+                registry = _registries[backend] = FormatRegistry(backend)
+    return registry
+
+
+def register_format(name: str) -> int:
+    """Register a format by name, returning its id, or 0 if it failed.
+
+    The id is cached, see `FormatRegistry`.
+    """
+    return get_format_registry().register(name)
+
+
+CF_HTML: int = register_format("HTML Format")
+CF_RTF: int = register_format("Rich Text Format")
+CF_PNG: int = register_format("PNG")
 
 
 class ExtendedEnum(EnumMeta):
     """Extended Enum Meta Class"""
 
     def __contains__(cls, item: Any):
-        return any(
-            [
-                item in cls.names,  # type: ignore
-                item in cls.values,  # type: ignore
-                item in ClipboardFormat.__members__.values(),
-            ]
-        )
+        if isinstance(item, cls):
+            return True
+        try:
+            return item in _MEMBERS_BY_NAME or item in _MEMBERS_BY_VALUE
+        except TypeError:
+            # Unhashable
+            return False
 
 
 class classproperty:
@@ -40,15 +211,30 @@ class ClipboardFormat(Enum, metaclass=ExtendedEnum):
     """ANSI text format. Lines end with CR-LF. Ends with null character."""
     CF_UNICODETEXT = 13
     """Unicode text format. Lines end with CR-LF. Ends with a null character."""
+    CF_OEMTEXT = 7
+    """OEM text format. Lines end with CR-LF. Ends with a null character."""
     CF_LOCALE = 16
+    """The locale identifier (LCID) of the text on the clipboard, which gives
+    the code page of CF_TEXT and CF_OEMTEXT."""
     CF_DIB = 8
     """A memory object containing a
     [BITMAPINFO](https://learn.microsoft.com/en-us/windows/win32/api/wingdi/
     ns-wingdi-bitmapinfo) structure followed by the bitmap bits."""
+    CF_HDROP = 15
+    """A list of files, as a
+    [DROPFILES](https://learn.microsoft.com/en-us/windows/win32/api/shlobj_core/
+    ns-shlobj_core-dropfiles) structure followed by the paths."""
+    CF_DIBV5 = 17
+    """A memory object containing a
+    [BITMAPV5HEADER](https://learn.microsoft.com/en-us/windows/win32/api/wingdi/
+    ns-wingdi-bitmapv5header) structure followed by the bitmap color space
+    information and the bitmap bits."""
 
     # Registered Formats
     CF_HTML = CF_HTML
     CF_RTF = CF_RTF
+    CF_PNG = CF_PNG
+    """A PNG file, as put on the clipboard by browsers and image editors."""
     HTML_Format = 49418
 
     # Aliases
@@ -56,6 +242,7 @@ class ClipboardFormat(Enum, metaclass=ExtendedEnum):
     html = HTML_Format  # alias
     HTML = html  # alias
     rtf = CF_RTF  # alias
+    png = CF_PNG  # alias
 
     @classproperty
     def values(cls):
@@ -78,6 +265,18 @@ class ClipboardFormat(Enum, metaclass=ExtendedEnum):
         else:
             return False
 
+    def __hash__(self):
+        # Equal to its value, so it hashes like it too, e.g. as a dict key.
+        return hash(self.value)
+
+
+# Indexes, built once, as the members never change. Names include aliases.
+_MEMBERS_BY_NAME: Dict[str, ClipboardFormat] = dict(ClipboardFormat.__members__)
+_MEMBERS_BY_VALUE: Dict[int, ClipboardFormat] = {
+    member.value: member for member in ClipboardFormat
+}
+_HTML_FORMAT: int = ClipboardFormat.HTML_Format.value
+
 
 def get_format_name(format_code: int) -> Optional[str]:
     """Get the name of the format by its number.
@@ -85,37 +284,23 @@ def get_format_name(format_code: int) -> Optional[str]:
     C function does not work for standard types (e.g. 1 for CF_TEXT).
     So, this function will use ClipboardFormat for those in the standard.
 
+    Names are cached, see `FormatRegistry`.
+
     Returns
     -------
     str, optional
         The name of the format.
         None if the format is not found.
     """
-    # Built-In
-    if format_code in ClipboardFormat.values:  # pylint: disable=unsupported-membership-test
-        return ClipboardFormat(format_code).name
-
-    buffer_size = 256
-    buffer = ctypes.create_string_buffer(buffer_size)
-    return_code = GetClipboardFormatNameA(
-        format_code,
-        buffer,
-        buffer_size,
-    )
-
-    # Failed
-    if return_code == 0:
-        last_error: int = ctypes.get_last_error()
-        if last_error == 0:
-            # No Error
-            return None
-        if last_error == 87:
-            # This indicates that the first parameter is not a valid clipboard format.
-            return None
-        error = ctypes.WinError(last_error)
-        raise error
-
-    # ansi string
-    format_name: str = buffer.value.decode("utf-8")
-
-    return format_name
+    return get_format_registry().name(format_code)
+
+
+def get_format_names(format_codes: Iterable[int]) -> Dict[int, Optional[str]]:
+    """Get the names of many formats by their numbers.
+
+    Returns
+    -------
+    dict
+        The name of each format, None if it is not found.
+    """
+    return get_format_registry().names(format_codes)
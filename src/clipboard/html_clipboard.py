@@ -1,12 +1,40 @@
 """Code for handling HTML clipboard data."""
 
+import re
+from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from clipboard.errors import HTMLParseError
 
 
 ENCODING = "UTF-8"
 HTML_ENCODING = ENCODING
 
+# Encoded pieces of the template surrounding the fragments.
+_HTML_START: bytes = "<html>\n<body>\n<!--StartFragment-->\n".encode(HTML_ENCODING)
+_FRAGMENT_SEPARATOR: bytes = "\n<!--EndFragment-->\n<!--StartFragment-->\n".encode(
+    HTML_ENCODING
+)
+_HTML_END: bytes = "\n<!--EndFragment-->\n</body>\n</html>".encode(HTML_ENCODING)
+
+# Comments marking the fragment, used when the header has no fragment offsets.
+# Regular expressions can search a memoryview, unlike `bytes.find`.
+_FRAGMENT_START_PATTERN = re.compile(rb"<!--\s*StartFragment\s*-->", re.IGNORECASE)
+_FRAGMENT_END_PATTERN = re.compile(rb"<!--\s*EndFragment\s*-->", re.IGNORECASE)
+
+# Header keys holding byte offsets.
+_OFFSET_KEYS: Tuple[str, ...] = (
+    "starthtml",
+    "endhtml",
+    "startfragment",
+    "endfragment",
+    "startselection",
+    "endselection",
+)
+
 
 class HTMLTemplate:
     """Windows HTML template for storing clipboard HTML data."""
@@ -29,6 +57,7 @@ class HTMLTemplate:
         # Optional
         self.start_selection: Optional[str] = None
         self.end_selection: Optional[str] = None
+        self.source_url: Optional[str] = None
 
         # Target Content
         self.content: str = content
@@ -48,6 +77,110 @@ class HTMLTemplate:
 
         return result
 
+    def encode(self) -> bytes:
+        """Generate the HTML template as encoded bytes.
+
+        Unlike `generate`, the byte counts are calculated from the lengths of
+        the encoded parts, so the document is only built once. Fragments are
+        written as-is, without normalizing their line endings.
+        """
+        return b"".join(self.encode_parts()[0])
+
+    def encode_into(self, buffer: Union[bytearray, memoryview], offset: int = 0) -> int:
+        """Write the encoded HTML template into a writable buffer.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+
+        Raises
+        ------
+        ValueError
+            If the buffer is too small.
+        """
+        parts, size = self.encode_parts()
+        view = memoryview(buffer).cast("B")
+        if offset + size > len(view):
+            raise ValueError(f"Buffer too small, {size} bytes needed after {offset}.")
+
+        position = offset
+        for part in parts:
+            view[position : position + len(part)] = part
+            position += len(part)
+
+        return size
+
+    def encode_parts(self) -> Tuple[List[bytes], int]:
+        """Encode each part of the template once, and set the byte counts.
+
+        Writing the parts, in order, gives the encoded template. This allows
+        the size to be known before allocating memory for it.
+
+        Returns
+        -------
+        Tuple[List[bytes], int]
+            The parts, in order, and their total size in bytes.
+        """
+        fragments: List[str] = self.fragments if self.fragments else [self.content]
+        encoded: List[bytes] = [
+            fragment.encode(HTML_ENCODING) for fragment in fragments
+        ]
+        fragments_size: int = sum(len(fragment) for fragment in encoded) + len(
+            _FRAGMENT_SEPARATOR
+        ) * (len(encoded) - 1)
+
+        # The header has a fixed size, as the byte counts are zero padded.
+        header_size: int = len(self._encode_header())
+        self.start_html = header_size
+        self.start_fragment = self.start_html + len(_HTML_START)
+        self.end_fragment = self.start_fragment + fragments_size
+        self.end_html = self.end_fragment + len(_HTML_END)
+
+        parts: List[bytes] = [self._encode_header(), _HTML_START]
+        for index, fragment in enumerate(encoded):
+            if index:
+                parts.append(_FRAGMENT_SEPARATOR)
+            parts.append(fragment)
+        parts.append(_HTML_END)
+
+        return parts, self.end_html
+
+    def encode_framing(self, fragment_size: int) -> Tuple[bytes, bytes, bytes]:
+        """Encode what surrounds a single fragment of `fragment_size` bytes.
+
+        For writing a fragment that is not in memory all at once, and whose
+        size is only known at the end. The header has the same size whatever
+        the fragment size, so it can be written first and rewritten later.
+
+        Returns
+        -------
+        Tuple[bytes, bytes, bytes]
+            The header, what goes before the fragment, and what goes after it.
+        """
+        header_size: int = len(self._encode_header())
+        self.start_html = header_size
+        self.start_fragment = self.start_html + len(_HTML_START)
+        self.end_fragment = self.start_fragment + fragment_size
+        self.end_html = self.end_fragment + len(_HTML_END)
+
+        return self._encode_header(), _HTML_START, _HTML_END
+
+    def _encode_header(self) -> bytes:
+        """Encode the header, using the current byte counts."""
+        lines: List[str] = [
+            f"Version:{self.version}",
+            f"StartHTML:{max(self.start_html, 0):0>{self.byte_padding}}",
+            f"EndHTML:{max(self.end_html, 0):0>{self.byte_padding}}",
+            f"StartFragment:{max(self.start_fragment, 0):0>{self.byte_padding}}",
+            f"EndFragment:{max(self.end_fragment, 0):0>{self.byte_padding}}",
+        ]
+        if self.source_url is not None:
+            lines.append(f"SourceURL:{self.source_url}")
+        lines.append("")
+
+        return "\n".join(lines).encode(HTML_ENCODING)
+
     @staticmethod
     def _generate_fragments(fragments: List) -> str:
         """Generate the HTML fragments."""
@@ -80,7 +213,7 @@ class HTMLTemplate:
         end_html_byte = self.end_html
         start_fragment_byte = self.start_fragment
         end_fragment_byte = self.end_fragment
-        source_url = None
+        source_url = self.source_url
 
         if source_url is not None:
             lines.insert(0, f"SourceURL:{source_url}")
@@ -171,3 +304,187 @@ class HTMLTemplate:
         result = content_bytes.decode(encoding=HTML_ENCODING)
 
         return result
+
+
+class HTMLClipboardData:
+    """Parsed CF_HTML clipboard data.
+
+    The sections are `memoryview`s into the original data, so nothing is copied
+    or decoded until one of the `*_text` methods is called.
+    """
+
+    def __init__(
+        self,
+        data: memoryview,
+        version: Optional[str],
+        html: Tuple[int, int],
+        fragment: Tuple[int, int],
+        selection: Optional[Tuple[int, int]] = None,
+        source_url: Optional[str] = None,
+    ) -> None:
+        self.data: memoryview = data
+        self.version: Optional[str] = version
+        self.source_url: Optional[str] = source_url
+
+        # Byte Counts
+        self.start_html, self.end_html = html
+        self.start_fragment, self.end_fragment = fragment
+        self.start_selection, self.end_selection = selection or fragment
+
+    @property
+    def html(self) -> memoryview:
+        """The HTML document, without the header."""
+        return self.data[self.start_html : self.end_html]
+
+    @property
+    def fragment(self) -> memoryview:
+        """The fragment, between the StartFragment and EndFragment comments."""
+        return self.data[self.start_fragment : self.end_fragment]
+
+    @property
+    def selection(self) -> memoryview:
+        """The selection, which is the fragment unless given in the header."""
+        return self.data[self.start_selection : self.end_selection]
+
+    def html_text(self, errors: str = "strict") -> str:
+        """Decode the HTML document."""
+        return str(self.html, HTML_ENCODING, errors)
+
+    def fragment_text(self, errors: str = "strict") -> str:
+        """Decode the fragment."""
+        return str(self.fragment, HTML_ENCODING, errors)
+
+    def selection_text(self, errors: str = "strict") -> str:
+        """Decode the selection."""
+        return str(self.selection, HTML_ENCODING, errors)
+
+
+def parse_html_clipboard(
+    data: Union[bytes, bytearray, memoryview],
+) -> HTMLClipboardData:
+    """Parse CF_HTML clipboard data, without copying it.
+
+    Accepts the header variations produced by browsers and Office: CRLF or LF
+    line endings, space or zero padded offsets, offsets of -1 for missing
+    sections, missing StartHTML/EndHTML, and trailing null characters. When
+    the fragment offsets are missing, the fragment comments are used instead.
+
+    Raises
+    ------
+    HTMLParseError
+        If the data does not start with a CF_HTML header, or has no fragment.
+    """
+    view: memoryview = memoryview(data).cast("B")
+    headers, header_end = _parse_header(view)
+    if "version" not in headers and not any(key in headers for key in _OFFSET_KEYS):
+        raise HTMLParseError("The data does not start with a CF_HTML header.")
+
+    # Ignore the null characters terminating the data.
+    size: int = len(view)
+    while size and view[size - 1] == 0:
+        size -= 1
+
+    offsets: Dict[str, Optional[int]] = {
+        key: _parse_offset(headers.get(key), size) for key in _OFFSET_KEYS
+    }
+
+    html: Tuple[int, int] = (
+        offsets["starthtml"] if offsets["starthtml"] is not None else header_end,
+        offsets["endhtml"] if offsets["endhtml"] is not None else size,
+    )
+    if html[0] > html[1]:
+        html = (header_end, size)
+
+    fragment: Optional[Tuple[int, int]] = None
+    start_fragment = offsets["startfragment"]
+    end_fragment = offsets["endfragment"]
+    if start_fragment is not None and end_fragment is not None:
+        if start_fragment <= end_fragment:
+            fragment = (start_fragment, end_fragment)
+    if fragment is None:
+        fragment = _find_fragment(view, header_end, size)
+
+    selection: Optional[Tuple[int, int]] = None
+    start_selection = offsets["startselection"]
+    end_selection = offsets["endselection"]
+    if start_selection is not None and end_selection is not None:
+        if start_selection <= end_selection:
+            selection = (start_selection, end_selection)
+
+    return HTMLClipboardData(
+        data=view,
+        version=headers.get("version"),
+        html=html,
+        fragment=fragment,
+        selection=selection,
+        source_url=headers.get("sourceurl"),
+    )
+
+
+def _parse_header(view: memoryview) -> Tuple[Dict[str, str], int]:
+    """Parse the `Key:Value` header lines.
+
+    Only the start of the data is copied, growing it if a line, such as a long
+    SourceURL, does not fit.
+
+    Returns
+    -------
+    Tuple[Dict[str, str], int]
+        The header values, by lowercase key, and the offset the header ends at.
+    """
+    headers: Dict[str, str] = {}
+    limit: int = 1024
+    head: bytes = bytes(view[:limit])
+    position: int = 0
+    while position < len(head):
+        line_end: int = head.find(b"\n", position)
+        if line_end == -1:
+            if len(head) < len(view):
+                limit *= 2
+                head = bytes(view[:limit])
+                continue
+            line_end = len(head)
+
+        line: bytes = head[position:line_end].rstrip(b"\r")
+        key, separator, value = line.partition(b":")
+        if not separator or not key.isalpha():
+            break
+        headers[key.decode("ascii").lower()] = value.strip().decode(
+            HTML_ENCODING, "replace"
+        )
+        position = line_end + 1
+
+    return headers, min(position, len(view))
+
+
+def _parse_offset(value: Optional[str], size: int) -> Optional[int]:
+    """Parse a byte offset, None if missing, negative, or out of range."""
+    if value is None:
+        return None
+    try:
+        offset = int(value)
+    except ValueError:
+        return None
+    if offset < 0:
+        return None
+    return min(offset, size)
+
+
+def _find_fragment(view: memoryview, start: int, end: int) -> Tuple[int, int]:
+    """Find the fragment using its comments, without copying the data.
+
+    Raises
+    ------
+    HTMLParseError
+        If the fragment comments are missing.
+    """
+    start_match = _FRAGMENT_START_PATTERN.search(view, start, end)
+    if start_match is None:
+        raise HTMLParseError("The CF_HTML data has no fragment.")
+    end_match = None
+    for end_match in _FRAGMENT_END_PATTERN.finditer(view, start_match.end(), end):
+        pass  # The last one marks the end.
+    if end_match is None:
+        raise HTMLParseError("The CF_HTML data has no fragment.")
+
+    return start_match.end(), end_match.start()
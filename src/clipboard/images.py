@@ -0,0 +1,886 @@
+"""Clipboard images.
+
+CF_DIB and CF_DIBV5 hold a device independent bitmap: a BITMAPINFOHEADER, or
+a BITMAPV5HEADER, then the color masks and table, if any, and the pixels.
+Rows are padded to 4 bytes, and stored bottom-up unless the height is
+negative.
+
+`parse_dib` views that data without copying it, and `Bitmap` converts it to
+BMP and PNG files, and back, with only the standard library. PNG files are
+written, and read, a row at a time.
+"""
+
+import functools
+import itertools
+import struct
+import zlib
+from typing import BinaryIO
+from typing import Callable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from clipboard.errors import ImageParseError
+
+
+# Compression
+BI_RGB: int = 0
+BI_BITFIELDS: int = 3
+BI_ALPHABITFIELDS: int = 6
+
+BITMAPFILEHEADER_SIZE: int = 14
+BITMAPINFOHEADER_SIZE: int = 40
+BITMAPV5HEADER_SIZE: int = 124
+# BITMAPV2INFOHEADER and after have the masks in the header.
+_HEADER_SIZES: Tuple[int, ...] = (40, 52, 56, 108, 124)
+
+LCS_SRGB: int = 0x73524742
+LCS_GM_IMAGES: int = 4
+
+PNG_SIGNATURE: bytes = b"\x89PNG\r\n\x1a\n"
+# Compressed data, at least, per IDAT chunk written.
+PNG_CHUNK_SIZE: int = 64 * 1024
+
+# Red, green, blue and alpha masks of the usual 32-bit BGRA pixels.
+BGRA_MASKS: Tuple[int, int, int, int] = (
+    0x00FF0000,
+    0x0000FF00,
+    0x000000FF,
+    0xFF000000,
+)
+# Red, green and blue masks of 16-bit BI_RGB pixels, 5 bits each.
+RGB555_MASKS: Tuple[int, int, int, int] = (0x7C00, 0x03E0, 0x001F, 0)
+
+# PNG color type -> samples per pixel
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+_INFO_HEADER = struct.Struct("<IiiHHIIiiII")
+_V5_FIELDS = struct.Struct("<IIIII36xIIIIIII")
+_FILE_HEADER = struct.Struct("<2sIHHI")
+_IHDR = struct.Struct(">IIBBBBB")
+
+ImageData = Union[bytes, bytearray, memoryview]  # Type Alias
+
+
+class Bitmap:
+    """A device independent bitmap, as on the clipboard as CF_DIB or CF_DIBV5.
+
+    The header, color table and pixels are `memoryview`s into the original
+    data, so nothing is copied until it is converted.
+    """
+
+    def __init__(
+        self,
+        data: memoryview,
+        header_size: int,
+        width: int,
+        height: int,
+        bit_count: int,
+        compression: int,
+        masks: Tuple[int, int, int, int],
+        colors: int,
+        pixels_offset: int,
+    ) -> None:
+        self.data: memoryview = data
+        self.header_size: int = header_size
+        self.width: int = width
+        # Negative for top-down rows.
+        self.top_down: bool = height < 0
+        self.height: int = abs(height)
+        self.bit_count: int = bit_count
+        self.compression: int = compression
+        # Red, green, blue and alpha, 0 if not given.
+        self.masks: Tuple[int, int, int, int] = masks
+        self.colors: int = colors
+        self.pixels_offset: int = pixels_offset
+
+    @property
+    def stride(self) -> int:
+        """Bytes per row, including the padding to 4 bytes."""
+        return (self.width * self.bit_count + 31) // 32 * 4
+
+    @property
+    def row_size(self) -> int:
+        """Bytes per row, without the padding."""
+        return (self.width * self.bit_count + 7) // 8
+
+    @property
+    def header(self) -> memoryview:
+        return self.data[: self.header_size]
+
+    @property
+    def palette(self) -> memoryview:
+        """The color table, of RGBQUADs (blue, green, red, reserved)."""
+        end = self.pixels_offset
+        return self.data[end - 4 * self.colors : end]
+
+    @property
+    def pixels(self) -> memoryview:
+        """Every row, padding included, in the order they are stored."""
+        return self.data[
+            self.pixels_offset : self.pixels_offset + self.stride * self.height
+        ]
+
+    @functools.cached_property
+    def has_alpha(self) -> bool:
+        """True if the pixels have an alpha channel.
+
+        32-bit BI_RGB bitmaps have no alpha mask, but applications put alpha
+        in the fourth byte anyway, so it is used unless it is all 0. Checked
+        once, as it scans the pixels.
+        """
+        if self.bit_count != 32:
+            return False
+        if self.compression == BI_RGB:
+            # Sliced as bytes, as slicing the view with a step is far slower.
+            alpha = self.pixels.tobytes()[3::4]
+            return alpha.count(0) != len(alpha)
+        return bool(self.masks[3])
+
+    def row(self, y: int) -> memoryview:
+        """Row `y`, counted from the top, without its padding."""
+        if not 0 <= y < self.height:
+            raise IndexError("Row out of range.")
+        if not self.top_down:
+            y = self.height - 1 - y
+        start = self.pixels_offset + y * self.stride
+        return self.data[start : start + self.row_size]
+
+    def rows(self) -> Iterator[memoryview]:
+        """Every row, from the top, without padding."""
+        for y in range(self.height):
+            yield self.row(y)
+
+    def to_dib(self, v5: bool = False) -> bytes:
+        """The bitmap with a BITMAPINFOHEADER, for CF_DIB, or a BITMAPV5HEADER,
+        for CF_DIBV5.
+
+        Rows are kept in the order they are stored.
+        """
+        compression = BI_RGB
+        masks: Tuple[int, ...] = ()
+        if self.bit_count in (16, 32) and self.compression != BI_RGB:
+            compression = BI_BITFIELDS
+            masks = self.masks
+            if not v5 and masks[:3] == BGRA_MASKS[:3]:
+                # Alpha, if any, is in the fourth byte, as applications expect.
+                compression = BI_RGB
+        elif v5 and self.has_alpha:
+            compression = BI_BITFIELDS
+            masks = BGRA_MASKS
+
+        height = -self.height if self.top_down else self.height
+        header = _dib_header(
+            self.width, height, self.bit_count, compression, self.colors, v5, masks
+        )
+        if not v5 and compression == BI_BITFIELDS:
+            header += struct.pack("<III", *masks[:3])
+        return b"".join([header, self.palette, self.pixels])
+
+    def to_bmp(self) -> bytes:
+        """The bitmap as a BMP file."""
+        size = BITMAPFILEHEADER_SIZE + len(self.data)
+        offset = BITMAPFILEHEADER_SIZE + self.pixels_offset
+        return b"".join([_FILE_HEADER.pack(b"BM", size, 0, 0, offset), self.data])
+
+    def iter_png(self, level: int = 6) -> Iterator[bytes]:
+        """Encode the bitmap as a PNG file, a part at a time.
+
+        Rows are filtered and compressed one at a time, so only one row, and
+        the compressed data of an IDAT chunk, are in memory at once.
+
+        Raises
+        ------
+        ImageParseError
+            If the bitmap's bit count or compression is not supported.
+        """
+        color_type, bit_depth, convert = self._png_layout()
+        yield PNG_SIGNATURE + _png_chunk(
+            b"IHDR",
+            _IHDR.pack(self.width, self.height, bit_depth, color_type, 0, 0, 0),
+        )
+        if color_type == 3:
+            yield _png_chunk(b"PLTE", _rgbquads_to_rgb(self.palette))
+
+        compressor = zlib.compressobj(level)
+        pending: List[bytes] = []
+        pending_size: int = 0
+        prior: Optional[bytes] = None
+        for row in self.rows():
+            current = convert(row)
+            if prior is None:
+                pending.append(compressor.compress(b"\x00"))
+                pending.append(compressor.compress(current))
+            else:
+                pending.append(compressor.compress(b"\x02"))
+                pending.append(compressor.compress(_subtract(current, prior)))
+            prior = current
+            pending_size += len(pending[-1]) + len(pending[-2])
+            if pending_size >= PNG_CHUNK_SIZE:
+                yield _png_chunk(b"IDAT", b"".join(pending))
+                pending = []
+                pending_size = 0
+        pending.append(compressor.flush())
+        yield _png_chunk(b"IDAT", b"".join(pending))
+        yield _png_chunk(b"IEND", b"")
+
+    def to_png(self, level: int = 6) -> bytes:
+        """The bitmap as a PNG file, see `iter_png`."""
+        return b"".join(self.iter_png(level))
+
+    def write_png(self, fileobj: BinaryIO, level: int = 6) -> int:
+        """Write the bitmap as a PNG file, returning its size, see `iter_png`."""
+        written: int = 0
+        for part in self.iter_png(level):
+            fileobj.write(part)
+            written += len(part)
+        return written
+
+    @property
+    def supports_png(self) -> bool:
+        """True if the bitmap can be encoded as PNG, see `iter_png`."""
+        try:
+            self._png_layout()
+        except ImageParseError:
+            return False
+        return True
+
+    def _png_layout(self) -> Tuple[int, int, Callable[[memoryview], bytes]]:
+        """PNG color type and bit depth, and the conversion of each row."""
+        if self.bit_count in (1, 4, 8) and self.colors:
+            return 3, self.bit_count, bytes
+
+        if self.bit_count == 24 and self.compression == BI_RGB:
+
+            def bgr_to_rgb(row: memoryview) -> bytes:
+                converted = bytearray(row)
+                converted[0::3] = row[2::3]
+                converted[2::3] = row[0::3]
+                return bytes(converted)
+
+            return 2, 8, bgr_to_rgb
+
+        if self.bit_count == 16:
+            masks = self.masks if self.compression != BI_RGB else RGB555_MASKS
+            found = [_mask_tables(mask) for mask in masks[:3]]
+            tables = [table for table in found if table is not None]
+            if len(tables) != 3:
+                raise ImageParseError(
+                    "Only contiguous color masks of up to 8 bits are supported."
+                )
+            width = self.width
+
+            def unpack_rgb(row: memoryview) -> bytes:
+                data = row.tobytes()
+                low, high = data[0::2], data[1::2]
+                converted = bytearray(width * 3)
+                for channel, (low_table, high_table, scale) in enumerate(tables):
+                    # The bits taken from each byte are disjoint, so they are
+                    # combined for the whole row at once.
+                    value = int.from_bytes(low.translate(low_table), "little")
+                    value |= int.from_bytes(high.translate(high_table), "little")
+                    converted[channel::3] = value.to_bytes(width, "little").translate(
+                        scale
+                    )
+                return bytes(converted)
+
+            return 2, 8, unpack_rgb
+
+        if self.bit_count == 32:
+            masks = self.masks if self.compression != BI_RGB else BGRA_MASKS
+            offsets = [_byte_offset(mask) for mask in masks]
+            if None in offsets[:3]:
+                raise ImageParseError("Only byte aligned color masks are supported.")
+            red, green, blue, alpha = offsets
+            channels = 4 if self.has_alpha and alpha is not None else 3
+            size = self.width * channels
+
+            def to_rgb(row: memoryview) -> bytes:
+                converted = bytearray(size)
+                converted[0::channels] = row[red::4]
+                converted[1::channels] = row[green::4]
+                converted[2::channels] = row[blue::4]
+                if channels == 4:
+                    converted[3::4] = row[alpha::4]
+                return bytes(converted)
+
+            return (6 if channels == 4 else 2), 8, to_rgb
+
+        raise ImageParseError(
+            f"{self.bit_count}-bit bitmaps, with compression {self.compression},"
+            " are not supported."
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(width={self.width}, height={self.height},"
+            f" bit_count={self.bit_count}, compression={self.compression})"
+        )
+
+
+def parse_dib(data: ImageData) -> Bitmap:
+    """Parse CF_DIB or CF_DIBV5 data, without copying it.
+
+    Raises
+    ------
+    ImageParseError
+        If the data is not a bitmap with a supported header, or is too short.
+    """
+    view: memoryview = memoryview(data).cast("B")
+    if len(view) < BITMAPINFOHEADER_SIZE:
+        raise ImageParseError("The data is too short for a bitmap header.")
+    (
+        header_size,
+        width,
+        height,
+        _,
+        bit_count,
+        compression,
+        _,
+        _,
+        _,
+        colors_used,
+        _,
+    ) = _INFO_HEADER.unpack_from(view)
+    if header_size not in _HEADER_SIZES:
+        raise ImageParseError(
+            f"Bitmap headers of {header_size} bytes are not supported."
+        )
+    if width <= 0 or height == 0:
+        raise ImageParseError("The bitmap has no pixels.")
+    if bit_count not in (1, 4, 8, 16, 24, 32):
+        raise ImageParseError(f"{bit_count}-bit bitmaps are not supported.")
+    if compression not in (BI_RGB, BI_BITFIELDS, BI_ALPHABITFIELDS):
+        raise ImageParseError(f"Bitmap compression {compression} is not supported.")
+
+    offset = header_size
+    masks: Tuple[int, int, int, int] = (0, 0, 0, 0)
+    if header_size >= 52:
+        red, green, blue = struct.unpack_from("<III", view, 40)
+        alpha = struct.unpack_from("<I", view, 52)[0] if header_size >= 56 else 0
+        masks = (red, green, blue, alpha)
+    elif compression != BI_RGB:
+        # Given after the header.
+        count = 4 if compression == BI_ALPHABITFIELDS else 3
+        if len(view) < offset + 4 * count:
+            raise ImageParseError("The data is too short for the color masks.")
+        fields = struct.unpack_from(f"<{count}I", view, offset)
+        masks = (*fields, 0)[:4]  # type: ignore
+        offset += 4 * count
+    if compression == BI_RGB and bit_count == 32:
+        masks = BGRA_MASKS[:3] + (0,)
+
+    colors = 0
+    if bit_count <= 8:
+        colors = colors_used or 1 << bit_count
+    pixels_offset = offset + 4 * colors
+    stride = (width * bit_count + 31) // 32 * 4
+    end = pixels_offset + stride * abs(height)
+    if len(view) < end:
+        raise ImageParseError("The data is too short for the bitmap's pixels.")
+    if header_size == BITMAPV5HEADER_SIZE:
+        # An embedded color profile can follow the pixels.
+        profile_offset, profile_size = struct.unpack_from("<II", view, 112)
+        if profile_offset and profile_offset + profile_size <= len(view):
+            end = max(end, profile_offset + profile_size)
+
+    # Clipboard memory can be larger than the bitmap, so anything after it
+    # is cut off.
+    return Bitmap(
+        data=view[:end],
+        header_size=header_size,
+        width=width,
+        height=height,
+        bit_count=bit_count,
+        compression=compression,
+        masks=masks,
+        colors=colors,
+        pixels_offset=pixels_offset,
+    )
+
+
+def parse_bmp(data: ImageData) -> Bitmap:
+    """Parse a BMP file, without copying it.
+
+    Raises
+    ------
+    ImageParseError
+        If the data is not a BMP file, see `parse_dib`.
+    """
+    view: memoryview = memoryview(data).cast("B")
+    if len(view) < BITMAPFILEHEADER_SIZE or view[:2] != b"BM":
+        raise ImageParseError("The data is not a BMP file.")
+    return parse_dib(view[BITMAPFILEHEADER_SIZE:])
+
+
+def read_png_header(data: ImageData) -> Tuple[int, int, int, int]:
+    """Width, height, bit depth and color type of a PNG file, from its IHDR.
+
+    Raises
+    ------
+    ImageParseError
+        If the data is not a PNG file, or can not be decoded, see
+        `decode_png`.
+    """
+    view: memoryview = memoryview(data).cast("B")
+    if view[:8] != PNG_SIGNATURE:
+        raise ImageParseError("The data is not a PNG file.")
+
+    kind, ihdr = next(_iter_png_chunks(view), (b"", view[:0]))
+    if kind != b"IHDR" or len(ihdr) < _IHDR.size:
+        raise ImageParseError("The PNG file does not start with an IHDR chunk.")
+    width, height, depth, color_type, _, _, interlace = _IHDR.unpack_from(ihdr)
+    if interlace:
+        raise ImageParseError("Interlaced PNG files are not supported.")
+    if color_type not in _PNG_CHANNELS or not width or not height:
+        raise ImageParseError(f"PNG color type {color_type} is not valid.")
+    if depth not in (8, 16) and not (color_type == 3 and depth in (1, 4, 8)):
+        raise ImageParseError(f"PNG bit depth {depth} is not supported.")
+    return width, height, depth, color_type
+
+
+def png_size(data: ImageData) -> int:
+    """Size of the PNG file at the start of `data`, up to the end of IEND.
+
+    Clipboard memory can be larger than what was put in it, so this finds
+    where the file ends, reading only the chunk headers.
+
+    Raises
+    ------
+    ImageParseError
+        If the data is not a PNG file, or has no IEND chunk.
+    """
+    view: memoryview = memoryview(data).cast("B")
+    if view[:8] != PNG_SIGNATURE:
+        raise ImageParseError("The data is not a PNG file.")
+    offset = len(PNG_SIGNATURE)
+    while offset + 8 <= len(view):
+        length, kind = struct.unpack_from(">I4s", view, offset)
+        offset += 12 + length
+        if kind == b"IEND" and offset <= len(view):
+            return offset
+    raise ImageParseError("The PNG file has no IEND chunk.")
+
+
+def decode_png(data: ImageData) -> Bitmap:
+    """Decode a PNG file to a bottom-up bitmap.
+
+    The image data is decompressed, never past the size of the image, and
+    unfiltered with whole-row or whole-diagonal integer operations, see
+    `_unfilter_rows`, then converted into the bitmap a row at a time. RGBA
+    and gray with alpha become 32-bit bitmaps with a BITMAPV5HEADER, RGB
+    24-bit, and gray and palette images 8-bit or less, with a color table.
+    16-bit samples are reduced to 8 bits.
+
+    Raises
+    ------
+    ImageParseError
+        If the data is not a PNG file, is interlaced, or has a bit depth
+        below 8 other than for palette images of 1 or 4 bits.
+    """
+    view: memoryview = memoryview(data).cast("B")
+    width, height, depth, color_type = read_png_header(view)
+    channels = _PNG_CHANNELS[color_type]
+    chunks = _iter_png_chunks(view)
+    next(chunks)  # IHDR
+
+    # The bitmap's layout.
+    bit_count = {0: 8, 2: 24, 3: depth, 4: 32, 6: 32}[color_type]
+    alpha = color_type in (4, 6)
+    colors = 1 << bit_count if color_type in (0, 3) else 0
+    stride = (width * bit_count + 31) // 32 * 4
+    header = _dib_header(
+        width,
+        height,
+        bit_count,
+        BI_BITFIELDS if alpha else BI_RGB,
+        colors,
+        v5=alpha,
+        masks=BGRA_MASKS if alpha else (),
+    )
+    pixels_offset = len(header) + 4 * colors
+    dib = bytearray(pixels_offset + stride * height)
+    dib[: len(header)] = header
+    if color_type == 0:
+        gray = bytes(range(256))
+        dib[len(header) : pixels_offset : 4] = gray
+        dib[len(header) + 1 : pixels_offset : 4] = gray
+        dib[len(header) + 2 : pixels_offset : 4] = gray
+
+    convert = _png_row_converter(color_type, depth, width)
+    row_size = (width * channels * depth + 7) // 8
+    filter_bpp = max(1, channels * depth // 8)
+    # Each row is its filter type, then its bytes.
+    size = height * (row_size + 1)
+    decompressor = zlib.decompressobj()
+    filtered = bytearray()
+    for kind, chunk in chunks:
+        if kind == b"PLTE" and color_type == 3:
+            palette = _rgb_to_rgbquads(chunk)[: 4 * colors]
+            dib[len(header) : len(header) + len(palette)] = palette
+        elif kind == b"IDAT" and len(filtered) < size:
+            # Never decompressed past the end of the image.
+            filtered += decompressor.decompress(
+                decompressor.unconsumed_tail + chunk, size - len(filtered)
+            )
+        elif kind == b"IEND":
+            break
+    if len(filtered) < size:
+        raise ImageParseError("The PNG file's image data is incomplete.")
+
+    for y, row in enumerate(_unfilter_rows(filtered, height, row_size, filter_bpp)):
+        start = pixels_offset + (height - 1 - y) * stride
+        converted = convert(row)
+        dib[start : start + len(converted)] = converted
+    return parse_dib(dib)
+
+
+def parse_image(data: ImageData) -> Bitmap:
+    """Parse a PNG or BMP file, or CF_DIB data, by its signature.
+
+    Raises
+    ------
+    ImageParseError
+        If the data is not an image, or is not supported.
+    """
+    view: memoryview = memoryview(data).cast("B")
+    if view[:8] == PNG_SIGNATURE:
+        return decode_png(view)
+    if view[:2] == b"BM":
+        return parse_bmp(view)
+    return parse_dib(view)
+
+
+def _dib_header(
+    width: int,
+    height: int,
+    bit_count: int,
+    compression: int,
+    colors: int,
+    v5: bool = False,
+    masks: Tuple[int, ...] = (),
+) -> bytes:
+    """A BITMAPINFOHEADER, or a BITMAPV5HEADER with `masks` in it."""
+    stride = (width * bit_count + 31) // 32 * 4
+    size = BITMAPV5HEADER_SIZE if v5 else BITMAPINFOHEADER_SIZE
+    header = _INFO_HEADER.pack(
+        size,
+        width,
+        height,
+        1,
+        bit_count,
+        compression,
+        stride * abs(height),
+        0,
+        0,
+        colors,
+        0,
+    )
+    if v5:
+        red, green, blue, alpha = (*masks, 0, 0, 0, 0)[:4]
+        header += _V5_FIELDS.pack(
+            red, green, blue, alpha, LCS_SRGB, 0, 0, 0, LCS_GM_IMAGES, 0, 0, 0
+        )
+    return header
+
+
+def _byte_offset(mask: int) -> Optional[int]:
+    """Offset of the byte a mask selects, None if it is not a whole byte."""
+    for offset in range(4):
+        if mask == 0xFF << (8 * offset):
+            return offset
+    return None
+
+
+def _mask_tables(mask: int) -> Optional[Tuple[bytes, bytes, bytes]]:
+    """Translation tables for a 16-bit color mask, None if it is not supported.
+
+    The channel's bits from the low byte, from the high byte, and the scaling
+    of the channel's value to 8 bits.
+    """
+    if not 0 < mask < 1 << 16:
+        return None
+    shift = (mask & -mask).bit_length() - 1
+    bits = (mask >> shift).bit_length()
+    if mask >> shift != (1 << bits) - 1 or bits > 8:
+        return None
+    maximum = (1 << bits) - 1
+    low = bytes((byte & mask) >> shift for byte in range(256))
+    high = bytes(((byte << 8) & mask) >> shift for byte in range(256))
+    scale = bytes(
+        (min(value, maximum) * 255 + maximum // 2) // maximum for value in range(256)
+    )
+    return low, high, scale
+
+
+def _rgbquads_to_rgb(palette: memoryview) -> bytes:
+    rgb = bytearray(len(palette) // 4 * 3)
+    rgb[0::3] = palette[2::4]
+    rgb[1::3] = palette[1::4]
+    rgb[2::3] = palette[0::4]
+    return bytes(rgb)
+
+
+def _rgb_to_rgbquads(palette: memoryview) -> bytes:
+    count = len(palette) // 3
+    quads = bytearray(count * 4)
+    quads[0::4] = palette[2 : count * 3 : 3]
+    quads[1::4] = palette[1 : count * 3 : 3]
+    quads[2::4] = palette[0 : count * 3 : 3]
+    return bytes(quads)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(data, zlib.crc32(kind))
+    return b"".join([struct.pack(">I", len(data)), kind, data, struct.pack(">I", crc)])
+
+
+def _iter_png_chunks(view: memoryview) -> Iterator[Tuple[bytes, memoryview]]:
+    """Type and data of each chunk, after the signature.
+
+    Raises
+    ------
+    ImageParseError
+        If a chunk is cut short.
+    """
+    offset = len(PNG_SIGNATURE)
+    while offset + 8 <= len(view):
+        length, kind = struct.unpack_from(">I4s", view, offset)
+        start = offset + 8
+        if start + length + 4 > len(view):
+            raise ImageParseError("The PNG file is cut short.")
+        yield kind, view[start : start + length]
+        offset = start + length + 4
+
+
+def _png_row_converter(
+    color_type: int, depth: int, width: int
+) -> Callable[[bytes], Union[bytes, bytearray]]:
+    """Convert an unfiltered PNG row to the bitmap's pixel layout."""
+
+    def convert(row: bytes) -> Union[bytes, bytearray]:
+        if depth == 16:
+            # The high byte of each sample.
+            row = row[0::2]
+        if color_type == 2:
+            converted = bytearray(row)
+            converted[0::3] = row[2::3]
+            converted[2::3] = row[0::3]
+            return converted
+        if color_type == 6:
+            converted = bytearray(row)
+            converted[0::4] = row[2::4]
+            converted[2::4] = row[0::4]
+            return converted
+        if color_type == 4:
+            converted = bytearray(width * 4)
+            converted[0::4] = converted[1::4] = converted[2::4] = row[0::2]
+            converted[3::4] = row[1::2]
+            return converted
+        # Gray, with the color table, or palette indices.
+        return row
+
+    return convert
+
+
+@functools.lru_cache(maxsize=16)
+def _high_bits(size: int) -> int:
+    """The high bit of each of `size` bytes, as a little endian integer."""
+    return int.from_bytes(b"\x80" * size, "little")
+
+
+def _subtract(row: bytes, prior: bytes) -> bytes:
+    """Subtract `prior` from `row`, byte by byte, modulo 256.
+
+    The PNG Up filter. Done on whole rows as integers, so without a Python
+    loop over the bytes.
+    """
+    size = len(row)
+    high = _high_bits(size)
+    x = int.from_bytes(row, "little")
+    y = int.from_bytes(prior, "little")
+    difference = ((x | high) - (y & ~high)) ^ ((x ^ ~y) & high)
+    return difference.to_bytes(size, "little")
+
+
+def _add(row: bytes, prior: bytes) -> bytes:
+    """Add `prior` to `row`, byte by byte, modulo 256, undoing `_subtract`."""
+    size = len(row)
+    high = _high_bits(size)
+    x = int.from_bytes(row, "little")
+    y = int.from_bytes(prior, "little")
+    total = ((x & ~high) + (y & ~high)) ^ ((x ^ y) & high)
+    return total.to_bytes(size, "little")
+
+
+def _unfilter_rows(
+    data: bytearray, height: int, row_size: int, bpp: int
+) -> List[bytes]:
+    """Undo the PNG filters of `height` rows, each its filter type then its bytes.
+
+    Images filtered only with None, Sub and Up are undone a row at a time. The
+    Average and Paeth filters predict each byte from the unfiltered one `bpp`
+    before it, so images using them are undone a diagonal at a time instead,
+    see `_unfilter_diagonals`.
+
+    Raises
+    ------
+    ImageParseError
+        If a filter type is not valid.
+    """
+    stride = row_size + 1
+    kinds = bytes(data[0 : height * stride : stride])
+    if kinds and max(kinds) > 4:
+        raise ImageParseError(f"PNG filter type {max(kinds)} is not valid.")
+
+    if row_size > bpp and (3 in kinds or 4 in kinds):
+        rows = bytearray(height * row_size)
+        for y in range(height):
+            rows[y * row_size : (y + 1) * row_size] = data[
+                y * stride + 1 : (y + 1) * stride
+            ]
+        _unfilter_diagonals(rows, kinds, row_size, bpp)
+        return [bytes(rows[y * row_size : (y + 1) * row_size]) for y in range(height)]
+
+    unfiltered: List[bytes] = []
+    prior = bytes(row_size)
+    for y, kind in enumerate(kinds):
+        prior = _unfilter(kind, data[y * stride + 1 : (y + 1) * stride], prior, bpp)
+        unfiltered.append(prior)
+    return unfiltered
+
+
+def _unfilter_diagonals(rows: bytearray, kinds: bytes, row_size: int, bpp: int) -> None:
+    """Undo the PNG filters of whole rows, in place, without a loop over bytes.
+
+    Each byte is predicted from the unfiltered bytes `bpp` to its left, above
+    and above left, so the bytes of one diagonal, the same pixel plus row,
+    only depend on earlier diagonals. Each diagonal is undone at once, as an
+    integer with a 16-bit lane per byte, leaving room for the Paeth filter's
+    sums and differences. Rows must be wider than one pixel.
+    """
+    height = len(kinds)
+    width = row_size // bpp
+    lanes = height * bpp
+    row_bits = 16 * bpp
+    ones = int.from_bytes(b"\x01\x00" * lanes, "little")
+    low = 0xFF * ones
+    # Added to differences, so they are never negative.
+    bias, double_bias = 0x100 * ones, 0x200 * ones
+    top = 0x8000 * ones
+    full = (1 << 16 * lanes) - 1
+
+    def rows_filtered(filter_type: int) -> int:
+        """Every lane of the rows with `filter_type` set."""
+        lane, empty = b"\xff\xff" * bpp, bytes(2 * bpp)
+        masks = (lane if kind == filter_type else empty for kind in kinds)
+        return int.from_bytes(b"".join(masks), "little")
+
+    def absolute(value: int, bits: int) -> int:
+        """|x| in each lane, given x + 2**bits in each lane."""
+        positive = (value >> bits) & ones
+        negative = ones - positive
+        magnitude = value & magnitudes[bits]
+        return (magnitude ^ (negative << bits) - negative) + negative
+
+    def less_equal(x: int, y: int) -> int:
+        """1 in each lane where `x` is at most `y`."""
+        return (((y | top) - x) >> 15) & ones
+
+    magnitudes = {8: low, 9: low | bias}
+    sub, up, average, paeth = map(rows_filtered, range(1, 5))
+    step = row_size - bpp
+    buffer = bytearray(2 * lanes)
+    # The previous two diagonals.
+    before = before_last = 0
+    for diagonal in range(width + height - 1):
+        first = max(0, diagonal - width + 1)
+        last = min(diagonal, height - 1)
+        valid = ((1 << row_bits * (last + 1 - first)) - 1) << row_bits * first
+        start = diagonal * bpp + first * step
+        stop = diagonal * bpp + last * step + 1
+        lane_start, lane_stop = 2 * first * bpp, 2 * (last + 1) * bpp
+        for channel in range(bpp):
+            buffer[lane_start + 2 * channel : lane_stop : 2 * bpp] = rows[
+                start + channel : stop + channel : step
+            ]
+
+        left = before
+        above = (before << row_bits) & full
+        above_left = (before_last << row_bits) & full
+        prediction = (left & sub) | (above & up)
+        if average & valid:
+            prediction |= ((left + above) >> 1) & low & average
+        if paeth & valid:
+            # Distances of the estimate, left + above - above left, from each.
+            to_left = absolute((above | bias) - above_left, 8)
+            to_above = absolute((left | bias) - above_left, 8)
+            to_above_left = absolute(left + above + double_bias - 2 * above_left, 9)
+            use_left = less_equal(to_left, to_above) & less_equal(
+                to_left, to_above_left
+            )
+            use_above = (ones ^ use_left) & less_equal(to_above, to_above_left)
+            use_above_left = ones ^ use_left ^ use_above
+            predictor = (
+                (left & use_left * 0xFF)
+                | (above & use_above * 0xFF)
+                | (above_left & use_above_left * 0xFF)
+            )
+            prediction |= predictor & paeth
+
+        current = (int.from_bytes(buffer, "little") + prediction) & low & valid
+        unfiltered = current.to_bytes(2 * lanes, "little")
+        for channel in range(bpp):
+            rows[start + channel : stop + channel : step] = unfiltered[
+                lane_start + 2 * channel : lane_stop : 2 * bpp
+            ]
+        before, before_last = current, before
+
+
+def _unfilter(kind: int, row: bytearray, prior: bytes, bpp: int) -> bytes:
+    """Undo a PNG row filter.
+
+    Raises
+    ------
+    ImageParseError
+        If the filter type is not valid.
+    """
+    if kind == 0:
+        return bytes(row)
+    if kind == 2:
+        return _add(bytes(row), prior)
+    if kind == 1:
+        # Each byte adds the one `bpp` before it, so every `bpp`th byte is a
+        # running sum.
+        for start in range(bpp):
+            row[start::bpp] = bytes(
+                map((255).__and__, itertools.accumulate(row[start::bpp]))
+            )
+        return bytes(row)
+    if kind == 3:
+        for i in range(len(row)):
+            left = row[i - bpp] if i >= bpp else 0
+            row[i] = (row[i] + ((left + prior[i]) >> 1)) & 0xFF
+        return bytes(row)
+    if kind == 4:
+        for i in range(len(row)):
+            if i >= bpp:
+                left, upper_left = row[i - bpp], prior[i - bpp]
+            else:
+                left = upper_left = 0
+            up = prior[i]
+            estimate = left + up - upper_left
+            distance_left = abs(estimate - left)
+            distance_up = abs(estimate - up)
+            distance_upper_left = abs(estimate - upper_left)
+            if distance_left <= distance_up and distance_left <= distance_upper_left:
+                predictor = left
+            elif distance_up <= distance_upper_left:
+                predictor = up
+            else:
+                predictor = upper_left
+            row[i] = (row[i] + predictor) & 0xFF
+        return bytes(row)
+    raise ImageParseError(f"PNG filter type {kind} is not valid.")
@@ -0,0 +1,188 @@
+"""Code for handling CF_LOCALE, and the CF_TEXT and CF_OEMTEXT it applies to.
+
+CF_LOCALE holds the locale identifier (LCID) of the text on the clipboard.
+CF_TEXT is in the ANSI code page of that locale, and CF_OEMTEXT in its OEM
+code page, e.g. 1252 and 850 for German. Without CF_LOCALE, the system's code
+pages are used.
+
+Code pages are looked up in a table built once, by the locale's language,
+and the encoding of each locale is cached, so repeated reads never pay for
+the lookup.
+"""
+
+import codecs
+import functools
+import re
+import struct
+import sys
+from typing import Dict
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+
+LCID_EN_US: int = 0x0409
+
+if sys.platform == "win32":
+    # The system's ANSI and OEM code pages.
+    DEFAULT_ANSI_ENCODING: str = "mbcs"
+    DEFAULT_OEM_ENCODING: str = "oem"
+else:
+    # Those of en-US, as Windows would use.
+    DEFAULT_ANSI_ENCODING = "cp1252"
+    DEFAULT_OEM_ENCODING = "cp437"
+
+_NULL_PATTERN = re.compile(b"\0")
+
+
+class CodePages(NamedTuple):
+    """The ANSI and OEM code pages of a locale."""
+
+    ansi: int
+    oem: int
+
+
+_WESTERN = CodePages(1252, 850)
+_CENTRAL_EUROPEAN = CodePages(1250, 852)
+_CYRILLIC = CodePages(1251, 866)
+_SERBIAN_CYRILLIC = CodePages(1251, 855)
+_TURKIC = CodePages(1254, 857)
+_ARABIC = CodePages(1256, 720)
+_BALTIC = CodePages(1257, 775)
+
+# Primary language id, the low 10 bits of the LCID -> code pages
+_CODE_PAGES_BY_LANGUAGE: Dict[int, CodePages] = {
+    0x01: _ARABIC,  # Arabic
+    0x02: _CYRILLIC,  # Bulgarian
+    0x03: _WESTERN,  # Catalan
+    0x05: _CENTRAL_EUROPEAN,  # Czech
+    0x06: _WESTERN,  # Danish
+    0x07: _WESTERN,  # German
+    0x08: CodePages(1253, 737),  # Greek
+    0x09: _WESTERN,  # English
+    0x0A: _WESTERN,  # Spanish
+    0x0B: _WESTERN,  # Finnish
+    0x0C: _WESTERN,  # French
+    0x0D: CodePages(1255, 862),  # Hebrew
+    0x0E: _CENTRAL_EUROPEAN,  # Hungarian
+    0x0F: _WESTERN,  # Icelandic
+    0x10: _WESTERN,  # Italian
+    0x11: CodePages(932, 932),  # Japanese
+    0x12: CodePages(949, 949),  # Korean
+    0x13: _WESTERN,  # Dutch
+    0x14: _WESTERN,  # Norwegian
+    0x15: _CENTRAL_EUROPEAN,  # Polish
+    0x16: _WESTERN,  # Portuguese
+    0x18: _CENTRAL_EUROPEAN,  # Romanian
+    0x19: _CYRILLIC,  # Russian
+    0x1A: _CENTRAL_EUROPEAN,  # Croatian, Serbian and Bosnian (Latin)
+    0x1B: _CENTRAL_EUROPEAN,  # Slovak
+    0x1C: _CENTRAL_EUROPEAN,  # Albanian
+    0x1D: _WESTERN,  # Swedish
+    0x1E: CodePages(874, 874),  # Thai
+    0x1F: _TURKIC,  # Turkish
+    0x20: _ARABIC,  # Urdu
+    0x21: _WESTERN,  # Indonesian
+    0x22: _CYRILLIC,  # Ukrainian
+    0x23: _CYRILLIC,  # Belarusian
+    0x24: _CENTRAL_EUROPEAN,  # Slovenian
+    0x25: _BALTIC,  # Estonian
+    0x26: _BALTIC,  # Latvian
+    0x27: _BALTIC,  # Lithuanian
+    0x29: _ARABIC,  # Persian
+    0x2A: CodePages(1258, 1258),  # Vietnamese
+    0x2C: _TURKIC,  # Azerbaijani (Latin)
+    0x2D: _WESTERN,  # Basque
+    0x2F: _CYRILLIC,  # Macedonian
+    0x36: _WESTERN,  # Afrikaans
+    0x38: _WESTERN,  # Faroese
+    0x3E: _WESTERN,  # Malay
+    0x3F: _CYRILLIC,  # Kazakh
+    0x40: _CYRILLIC,  # Kyrgyz
+    0x41: CodePages(1252, 437),  # Swahili
+    0x43: _TURKIC,  # Uzbek (Latin)
+    0x44: _CYRILLIC,  # Tatar
+    0x50: _CYRILLIC,  # Mongolian
+    0x56: _WESTERN,  # Galician
+}
+
+# LCIDs whose code pages differ from their language's
+_CODE_PAGES_BY_LCID: Dict[int, CodePages] = {
+    0x0404: CodePages(950, 950),  # Chinese (Taiwan)
+    0x0409: CodePages(1252, 437),  # English (United States)
+    0x0804: CodePages(936, 936),  # Chinese (China)
+    0x0816: CodePages(1252, 860),  # Portuguese (Portugal)
+    0x082C: _CYRILLIC,  # Azerbaijani (Cyrillic)
+    0x0843: _CYRILLIC,  # Uzbek (Cyrillic)
+    0x0C04: CodePages(950, 950),  # Chinese (Hong Kong)
+    0x0C0C: CodePages(1252, 863),  # French (Canada)
+    0x0C1A: _SERBIAN_CYRILLIC,  # Serbian (Cyrillic)
+    0x1004: CodePages(936, 936),  # Chinese (Singapore)
+    0x1404: CodePages(950, 950),  # Chinese (Macao)
+    0x201A: _SERBIAN_CYRILLIC,  # Bosnian (Cyrillic)
+    0x281A: _SERBIAN_CYRILLIC,  # Serbian (Cyrillic, Serbia)
+}
+
+
+def get_code_pages(lcid: int) -> Optional[CodePages]:
+    """The ANSI and OEM code pages of a locale, None if it is not known.
+
+    Locales only written in Unicode, such as Hindi, have no code pages.
+    """
+    code_pages = _CODE_PAGES_BY_LCID.get(lcid)
+    if code_pages is None:
+        code_pages = _CODE_PAGES_BY_LANGUAGE.get(lcid & 0x3FF)
+    return code_pages
+
+
+@functools.lru_cache(maxsize=None)
+def get_text_encoding(lcid: Optional[int] = None, oem: bool = False) -> str:
+    """The encoding of CF_TEXT, or CF_OEMTEXT, for a locale.
+
+    The system's encoding if there is no locale, or it has no code pages.
+    """
+    default = DEFAULT_OEM_ENCODING if oem else DEFAULT_ANSI_ENCODING
+    code_pages = get_code_pages(lcid) if lcid else None
+    if code_pages is None:
+        return default
+
+    encoding = f"cp{code_pages.oem if oem else code_pages.ansi}"
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return default
+
+
+def parse_locale(data: Union[bytes, bytearray, memoryview]) -> Optional[int]:
+    """The LCID held by CF_LOCALE data, None if it is too short."""
+    if len(data) < 4:
+        return None
+    return struct.unpack_from("<I", data)[0]
+
+
+def text_size(data: Union[bytes, bytearray, memoryview]) -> int:
+    """Size of CF_TEXT, or CF_OEMTEXT, data up to its first null character."""
+    match = _NULL_PATTERN.search(data)
+    return len(data) if match is None else match.start()
+
+
+def decode_text(
+    data: Union[bytes, bytearray, memoryview],
+    lcid: Optional[int] = None,
+    oem: bool = False,
+) -> str:
+    """Decode CF_TEXT, or CF_OEMTEXT, data in the code page of its locale.
+
+    The text ends at the first null character, so the rest of the clipboard
+    memory is ignored. Bytes not in the code page are replaced.
+    """
+    view: memoryview = memoryview(data).cast("B")
+    return str(view[: text_size(view)], get_text_encoding(lcid, oem), "replace")
+
+
+def encode_text(text: str, lcid: Optional[int] = None, oem: bool = False) -> bytes:
+    """Encode text as CF_TEXT, or CF_OEMTEXT, without the null character.
+
+    Characters not in the code page are replaced with "?", like Windows does.
+    """
+    return text.encode(get_text_encoding(lcid, oem), "replace")
@@ -0,0 +1,352 @@
+"""In-process clipboard metrics.
+
+Counters and fixed-bucket histograms of clipboard operations, kept by a
+`MetricsRegistry` fed with the spans of `clipboard.tracing`. Metrics are
+opt-in: nothing is recorded until `enable_metrics` adds the process-wide
+registry as a trace hook.
+
+    registry = enable_metrics()
+    ...
+    print(registry.to_prometheus())
+"""
+
+import bisect
+import math
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from clipboard.errors import OpenClipboardError
+from clipboard.tracing import Span
+from clipboard.tracing import add_trace_hook
+from clipboard.tracing import remove_trace_hook
+
+
+# Upper bounds, in seconds, of the latency buckets.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+# Upper bounds of the attempts needed to open the clipboard.
+ATTEMPT_BUCKETS: Tuple[float, ...] = (1, 2, 3, 5, 10, 20, 50)
+
+Labels = Tuple[Tuple[str, str], ...]  # Type Alias
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """A value that only goes up, per set of labels."""
+
+    type: str = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name: str = name
+        self.documentation: str = documentation
+
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Add `amount`, which can not be negative.
+
+        Raises
+        ------
+        ValueError
+            If `amount` is negative.
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be increased.")
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """The count for a set of labels."""
+        with self._lock:
+            return self._values.get(_labels(labels), 0)
+
+    def snapshot(self) -> Dict[Labels, float]:
+        """The count of every set of labels."""
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> List[str]:
+        """Lines of the Prometheus text format."""
+        return [
+            f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+            for labels, value in sorted(self.snapshot().items())
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Observations counted in fixed buckets, per set of labels.
+
+    Parameters
+    ----------
+    buckets : Sequence[float]
+        Upper bounds of the buckets, in increasing order. A bucket for
+        everything above the last is added.
+
+    Raises
+    ------
+    ValueError
+        If the buckets are empty or not increasing.
+    """
+
+    type: str = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]) -> None:
+        if not buckets or any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError("Buckets must be increasing, and not empty.")
+        self.name: str = name
+        self.documentation: str = documentation
+        self.buckets: Tuple[float, ...] = (*buckets, math.inf)
+
+        self._lock = threading.Lock()
+        # labels -> (count per bucket, sum)
+        self._values: Dict[Labels, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Count `value` in its bucket."""
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def quantile(self, q: float, **labels: Any) -> Optional[float]:
+        """Estimate a quantile, e.g. 0.99, like Prometheus' `histogram_quantile`.
+
+        Observations are taken to be spread evenly within their bucket. None if
+        there are no observations.
+        """
+        with self._lock:
+            entry = self._values.get(_labels(labels))
+            counts = list(entry[0]) if entry is not None else []
+        return self._quantile(counts, q)
+
+    def _quantile(self, counts: List[int], q: float) -> Optional[float]:
+        count = sum(counts)
+        if not count:
+            return None
+
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                upper = self.buckets[index]
+                lower = self.buckets[index - 1] if index else 0.0
+                if upper == math.inf:
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-2]
+
+    def snapshot(self) -> Dict[Labels, Dict[str, Any]]:
+        """Count, sum, cumulative buckets and quantiles of every set of labels."""
+        with self._lock:
+            values = {
+                key: (list(counts), total)
+                for key, (counts, total) in self._values.items()
+            }
+
+        snapshot: Dict[Labels, Dict[str, Any]] = {}
+        for key, (counts, total) in values.items():
+            cumulative: Dict[float, int] = {}
+            running = 0
+            for bucket, bucket_count in zip(self.buckets, counts):
+                running += bucket_count
+                cumulative[bucket] = running
+            snapshot[key] = {
+                "count": running,
+                "sum": total,
+                "buckets": cumulative,
+                "p50": self._quantile(counts, 0.5),
+                "p99": self._quantile(counts, 0.99),
+            }
+        return snapshot
+
+    def samples(self) -> List[str]:
+        """Lines of the Prometheus text format."""
+        lines: List[str] = []
+        for key, value in sorted(self.snapshot().items()):
+            for bucket, count in value["buckets"].items():
+                labels = _format_labels((*key, ("le", _format_value(bucket))))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(value['sum'])}")
+            lines.append(f"{self.name}_count{labels} {value['count']}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """Clipboard metrics, recorded from the spans of `clipboard.tracing`.
+
+    It is a trace hook, so it can be added with `add_trace_hook`, though
+    `enable_metrics` does that for the process-wide registry.
+    """
+
+    def __init__(self) -> None:
+        self.opens = Counter("clipboard_opens_total", "Clipboard opens.")
+        self.open_errors = Counter(
+            "clipboard_open_errors_total",
+            "Clipboard opens that failed with OpenClipboardError.",
+        )
+        self.open_retries = Counter(
+            "clipboard_open_retries_total", "Retries needed to open the clipboard."
+        )
+        self.open_attempts = Histogram(
+            "clipboard_open_attempts",
+            "Attempts needed to open the clipboard.",
+            ATTEMPT_BUCKETS,
+        )
+        self.read_bytes = Counter(
+            "clipboard_read_bytes_total", "Bytes read from the clipboard, by format."
+        )
+        self.written_bytes = Counter(
+            "clipboard_written_bytes_total",
+            "Bytes written to the clipboard, by format.",
+        )
+        self.latency = Histogram(
+            "clipboard_operation_seconds",
+            "Duration of getting and setting the clipboard.",
+            LATENCY_BUCKETS,
+        )
+        self.errors = Counter(
+            "clipboard_operation_errors_total",
+            "Gets and sets of the clipboard that raised, by error.",
+        )
+        self.metrics: Tuple[Any, ...] = (
+            self.opens,
+            self.open_errors,
+            self.open_retries,
+            self.open_attempts,
+            self.read_bytes,
+            self.written_bytes,
+            self.latency,
+            self.errors,
+        )
+
+    def __call__(self, span: Span) -> None:
+        """Record a finished span."""
+        name = span.name
+        attributes = span.attributes
+        if name == "get" or name == "set":
+            self.latency.observe(span.duration, operation=name)
+            if span.error is not None:
+                self.errors.inc(operation=name, error=type(span.error).__name__)
+        elif name == "open":
+            attempts = attributes.get("attempts", 1)
+            self.opens.inc()
+            self.open_retries.inc(max(attempts - 1, 0))
+            self.open_attempts.observe(attempts)
+            if isinstance(span.error, OpenClipboardError):
+                self.open_errors.inc()
+        elif name == "lock":
+            self.read_bytes.inc(attributes.get("bytes", 0), format=_format_name(span))
+        elif name == "copy":
+            self.written_bytes.inc(
+                attributes.get("bytes", 0), format=_format_name(span)
+            )
+
+    def snapshot(self) -> Dict[str, Dict[Labels, Any]]:
+        """Every metric, by name, with its values by labels."""
+        return {metric.name: metric.snapshot() for metric in self.metrics}
+
+    def to_prometheus(self) -> str:
+        """Every metric, in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forget everything recorded."""
+        for metric in self.metrics:
+            metric.reset()
+
+
+def _format_name(span: Span) -> str:
+    """The name of the span's format, as known to the span's backend."""
+    from clipboard.formats import get_format_registry
+
+    format: int = span.attributes["format"]
+    return get_format_registry(span.backend).name(format) or str(format)
+
+
+_metrics: MetricsRegistry = MetricsRegistry()
+_enabled: bool = False
+_enabled_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _metrics
+
+
+def enable_metrics() -> MetricsRegistry:
+    """Start recording the process-wide metrics, returning their registry."""
+    global _enabled
+    with _enabled_lock:
+        if not _enabled:
+            add_trace_hook(_metrics)
+            _enabled = True
+    return _metrics
+
+
+def disable_metrics() -> None:
+    """Stop recording the process-wide metrics, keeping what was recorded."""
+    global _enabled
+    with _enabled_lock:
+        if _enabled:
+            remove_trace_hook(_metrics)
+            _enabled = False
@@ -0,0 +1,299 @@
+"""Clipboard change monitor.
+
+Changes are delivered by the backend instead of polling the clipboard: on
+Windows a message-only window is registered with `AddClipboardFormatListener`,
+and the in-memory backend notifies waiters when the clipboard is closed. Other
+backends fall back to polling the clipboard sequence number, which is cheap as
+it never opens the clipboard.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import AsyncIterator
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from clipboard.backends import ClipboardBackend
+from clipboard.backends import get_backend
+from clipboard.backends.base import POLL_INTERVAL
+from clipboard.backends.base import poll_for_change
+from clipboard.broker import get_broker
+from clipboard.errors import GetClipboardError
+from clipboard.errors import OpenClipboardError
+from clipboard.snapshot import ClipboardSnapshot
+
+
+if TYPE_CHECKING:
+    from clipboard.clipboard import ClipboardFormatType
+
+
+logger = logging.getLogger(__name__)
+
+# Longest the watcher waits before checking whether it was stopped.
+WAKE_INTERVAL: float = 0.1
+
+
+class ClipboardEvent:
+    """A change to the clipboard.
+
+    Attributes
+    ----------
+    sequence_number : int
+        Clipboard sequence number after the change.
+    timestamp : float
+        When the change was seen, as given by `time.time`.
+    snapshot : Optional[ClipboardSnapshot]
+        The formats the monitor was asked to fetch, read after the change.
+        None if no formats were asked for, or the clipboard could not be read.
+    """
+
+    def __init__(
+        self,
+        sequence_number: int,
+        timestamp: float,
+        snapshot: Optional[ClipboardSnapshot] = None,
+    ) -> None:
+        self.sequence_number: int = sequence_number
+        self.timestamp: float = timestamp
+        self.snapshot: Optional[ClipboardSnapshot] = snapshot
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(sequence_number={self.sequence_number},"
+            f" snapshot={self.snapshot!r})"
+        )
+
+
+# Receives each event, then None once the monitor stops.
+_Subscriber = Callable[[Optional[ClipboardEvent]], None]
+
+
+class ClipboardMonitor:
+    """Watch the clipboard for changes.
+
+    Events are delivered to callbacks, on the monitor's thread, and to every
+    blocking (`for event in monitor`) or async (`async for event in monitor`)
+    iterator. Iterating starts the monitor, and iteration ends when it stops.
+
+    Parameters
+    ----------
+    callback : Optional[Callable[[ClipboardEvent], None]]
+        Called with each event.
+    formats : Optional[Iterable[ClipboardFormatType]]
+        Formats read into each event's snapshot. None reads nothing, so the
+        clipboard is never opened by the monitor.
+    debounce : float
+        Seconds the clipboard has to stay unchanged before an event is sent,
+        so bursts of changes are sent as one event.
+    backend : Optional[ClipboardBackend]
+        Backend to watch, the process-wide one by default.
+    poll : bool
+        Poll the sequence number, even if the backend is notified of changes.
+    poll_interval : float
+        Seconds between polls.
+
+    Raises
+    ------
+    FormatNotSupportedError
+        If a format is not supported.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[ClipboardEvent], None]] = None,
+        formats: Optional[Iterable["ClipboardFormatType"]] = None,
+        debounce: float = 0.0,
+        backend: Optional[ClipboardBackend] = None,
+        poll: bool = False,
+        poll_interval: float = POLL_INTERVAL,
+    ) -> None:
+        from clipboard.clipboard import Clipboard
+
+        self.backend: ClipboardBackend = (
+            backend if backend is not None else get_backend()
+        )
+        self._clipboard = Clipboard(backend=self.backend)
+        # Resolved now, so invalid formats are reported to the caller.
+        self.formats: Optional[Tuple[int, ...]] = None
+        if formats is not None:
+            self.formats = tuple(map(self._clipboard.resolve_format, formats))
+        self.debounce: float = debounce
+        self.poll: bool = poll
+        self.poll_interval: float = poll_interval
+
+        self._callbacks: List[Callable[[ClipboardEvent], None]] = []
+        if callback is not None:
+            self._callbacks.append(callback)
+        self._subscribers: List[_Subscriber] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """True while the monitor is watching the clipboard."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_callback(self, callback: Callable[[ClipboardEvent], None]) -> None:
+        """Call `callback` with each event."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[ClipboardEvent], None]) -> None:
+        """Stop calling `callback`.
+
+        Raises
+        ------
+        ValueError
+            If `callback` was not added.
+        """
+        with self._lock:
+            self._callbacks.remove(callback)
+
+    def start(self) -> "ClipboardMonitor":
+        """Start watching the clipboard, if not already."""
+        with self._lock:
+            if self.running:
+                return self
+            self._stopping.clear()
+            # Read here, so changes made after `start` returns are seen.
+            sequence_number = self.backend.get_clipboard_sequence_number()
+            self._thread = threading.Thread(
+                target=self._watch,
+                args=(sequence_number,),
+                name="clipboard-monitor",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop watching the clipboard, ending every iterator."""
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def __enter__(self) -> "ClipboardMonitor":
+        return self.start()
+
+    def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
+        self.stop()
+
+    def __iter__(self) -> Iterator[ClipboardEvent]:
+        events: "queue.SimpleQueue[Optional[ClipboardEvent]]" = queue.SimpleQueue()
+        # Subscribed before starting, so no event is missed.
+        self._subscribe(events.put)
+        self.start()
+        return self._iterate(events)
+
+    def _iterate(
+        self, events: "queue.SimpleQueue[Optional[ClipboardEvent]]"
+    ) -> Iterator[ClipboardEvent]:
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            self._unsubscribe(events.put)
+
+    def __aiter__(self) -> AsyncIterator[ClipboardEvent]:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        events: "asyncio.Queue[Optional[ClipboardEvent]]" = asyncio.Queue()
+
+        def put(event: Optional[ClipboardEvent]) -> None:
+            try:
+                loop.call_soon_threadsafe(events.put_nowait, event)
+            except RuntimeError:
+                # The event loop is closed.
+                pass
+
+        self._subscribe(put)
+        self.start()
+        return self._aiterate(events, put)
+
+    async def _aiterate(
+        self, events, put: _Subscriber
+    ) -> AsyncIterator[ClipboardEvent]:
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            self._unsubscribe(put)
+
+    def _subscribe(self, subscriber: _Subscriber) -> None:
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+    def _unsubscribe(self, subscriber: _Subscriber) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def _wait_for_change(self, sequence_number: int, timeout: float) -> int:
+        if self.poll:
+            return poll_for_change(
+                self.backend, sequence_number, timeout, self.poll_interval
+            )
+        return self.backend.wait_for_change(sequence_number, timeout)
+
+    def _watch(self, sequence_number: int) -> None:
+        try:
+            while not self._stopping.is_set():
+                current = self._wait_for_change(sequence_number, WAKE_INTERVAL)
+                if current == sequence_number:
+                    continue
+                # Wait for the clipboard to settle.
+                while self.debounce > 0 and not self._stopping.is_set():
+                    settled = self._wait_for_change(current, self.debounce)
+                    if settled == current:
+                        break
+                    current = settled
+                if self._stopping.is_set():
+                    break
+                sequence_number = current
+                self._dispatch(self._event(sequence_number))
+        finally:
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for subscriber in subscribers:
+                subscriber(None)
+
+    def _event(self, sequence_number: int) -> ClipboardEvent:
+        snapshot: Optional[ClipboardSnapshot] = None
+        if self.formats is not None:
+            try:
+                # On the broker, so it never races other threads' opens.
+                snapshot = get_broker().call(self._clipboard.snapshot, self.formats)
+            except (GetClipboardError, OpenClipboardError):
+                # Held by another application for too long.
+                logger.warning("Reading the clipboard after a change failed.")
+            except RuntimeError:
+                logger.warning("The clipboard broker has shut down.")
+        return ClipboardEvent(sequence_number, time.time(), snapshot)
+
+    def _dispatch(self, event: ClipboardEvent) -> None:
+        with self._lock:
+            callbacks = list(self._callbacks)
+            subscribers = list(self._subscribers)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Clipboard monitor callback failed.")
+        for subscriber in subscribers:
+            subscriber(event)
@@ -0,0 +1,185 @@
+"""Retrying to open the clipboard.
+
+Other applications, such as clipboard managers and remote desktop clipboard
+sync, hold the clipboard open for a while, so opening it has to be retried.
+How is set by a `RetryPolicy`, per `Clipboard` or process-wide, and every open
+is recorded in `ContentionStats` to show how contended the clipboard is.
+"""
+
+import itertools
+import random
+import threading
+import time
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+
+
+class RetryPolicy:
+    """How opening the clipboard is retried.
+
+    The first retry waits `delay` seconds, and each one after waits `backoff`
+    times longer, up to `max_delay`. With `jitter`, each wait is randomly
+    shortened or lengthened by up to that fraction of it, so processes that
+    failed together do not retry together.
+
+    Parameters
+    ----------
+    max_attempts : Optional[int]
+        Attempts, including the first. None for no limit, if there is a
+        deadline.
+    deadline : Optional[float]
+        Seconds after the first attempt when no more are made. None for no
+        limit, if attempts are limited.
+    delay : float
+        Seconds before the first retry.
+    backoff : float
+        Factor each wait is multiplied by.
+    max_delay : float
+        Longest wait, in seconds.
+    jitter : float
+        Fraction of each wait, between 0 and 1, it is randomly changed by.
+
+    Raises
+    ------
+    ValueError
+        If neither attempts nor the deadline are limited, or a value is out of
+        range.
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = 3,
+        deadline: Optional[float] = None,
+        delay: float = 0.01,
+        backoff: float = 1.0,
+        max_delay: float = 1.0,
+        jitter: float = 0.0,
+    ) -> None:
+        if max_attempts is None and deadline is None:
+            raise ValueError("Either max_attempts or deadline must be set.")
+        if max_attempts is not None and max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if delay < 0 or max_delay < 0 or (deadline is not None and deadline < 0):
+            raise ValueError("Delays and the deadline can not be negative.")
+        if backoff < 1:
+            raise ValueError("backoff must be at least 1.")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1.")
+
+        self.max_attempts: Optional[int] = max_attempts
+        self.deadline: Optional[float] = deadline
+        self.delay: float = delay
+        self.backoff: float = backoff
+        self.max_delay: float = max_delay
+        self.jitter: float = jitter
+
+    def waits(self) -> Iterator[float]:
+        """Seconds to wait before each attempt, 0 before the first.
+
+        The deadline is measured from the first `next`, so the attempts have
+        to be made as they are yielded.
+        """
+        start = time.monotonic()
+        waited = 0.0
+        delay = self.delay
+        attempts = (
+            range(self.max_attempts)
+            if self.max_attempts is not None
+            else itertools.count()
+        )
+        for attempt in attempts:
+            if attempt == 0:
+                yield 0.0
+                continue
+
+            wait = min(delay, self.max_delay)
+            delay *= self.backoff
+            if self.jitter:
+                wait *= 1 + random.uniform(-self.jitter, self.jitter)
+            if self.deadline is not None:
+                # Attempts take time too, and the waits count even if not slept.
+                elapsed = max(time.monotonic() - start, waited)
+                remaining = self.deadline - elapsed
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining)
+            waited += wait
+            yield wait
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(max_attempts={self.max_attempts},"
+            f" deadline={self.deadline}, delay={self.delay},"
+            f" backoff={self.backoff}, max_delay={self.max_delay},"
+            f" jitter={self.jitter})"
+        )
+
+
+class ContentionStats:
+    """Attempts and waiting needed to open the clipboard, over many opens."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.opens: int = 0
+        self.failures: int = 0
+        self.attempts: int = 0
+        self.max_attempts: int = 0
+        self.wait_time: float = 0.0
+        self.max_wait_time: float = 0.0
+
+    def record(self, attempts: int, wait: float, opened: bool) -> None:
+        """Record an open that took `attempts` and waited `wait` seconds."""
+        with self._lock:
+            self.opens += 1
+            self.failures += not opened
+            self.attempts += attempts
+            self.max_attempts = max(self.max_attempts, attempts)
+            self.wait_time += wait
+            self.max_wait_time = max(self.max_wait_time, wait)
+
+    def reset(self) -> None:
+        """Forget every recorded open."""
+        with self._lock:
+            self.opens = 0
+            self.failures = 0
+            self.attempts = 0
+            self.max_attempts = 0
+            self.wait_time = 0.0
+            self.max_wait_time = 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        """The recorded values, as a dictionary."""
+        with self._lock:
+            return {
+                "opens": self.opens,
+                "failures": self.failures,
+                "attempts": self.attempts,
+                "retries": self.attempts - self.opens,
+                "max_attempts": self.max_attempts,
+                "wait_time": self.wait_time,
+                "max_wait_time": self.max_wait_time,
+            }
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.snapshot()})"
+
+
+_retry_policy: RetryPolicy = RetryPolicy()
+_contention_stats: ContentionStats = ContentionStats()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide retry policy."""
+    return _retry_policy
+
+
+def set_retry_policy(policy: Optional[RetryPolicy]) -> None:
+    """Set the process-wide retry policy, or None to go back to the default."""
+    global _retry_policy
+    _retry_policy = policy if policy is not None else RetryPolicy()
+
+
+def get_contention_stats() -> ContentionStats:
+    """Return the process-wide record of clipboard opens."""
+    return _contention_stats
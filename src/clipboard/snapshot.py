@@ -0,0 +1,51 @@
+"""Clipboard snapshots."""
+
+from types import MappingProxyType
+from typing import Dict
+from typing import Iterator
+from typing import Mapping
+from typing import Tuple
+from typing import Union
+
+
+class ClipboardSnapshot(Mapping[int, Union[str, bytes]]):
+    """Immutable copy of the clipboard contents, by format.
+
+    Formats are kept in clipboard order, so the first one is the primary
+    format, like `Clipboard.available_formats`.
+    """
+
+    def __init__(
+        self,
+        data: Dict[int, Union[str, bytes]],
+        sizes: Dict[int, int],
+    ) -> None:
+        self._data: Mapping[int, Union[str, bytes]] = MappingProxyType(dict(data))
+        self._sizes: Mapping[int, int] = MappingProxyType(dict(sizes))
+
+    @property
+    def formats(self) -> Tuple[int, ...]:
+        """Formats in the snapshot."""
+        return tuple(self._data)
+
+    @property
+    def sizes(self) -> Mapping[int, int]:
+        """Size of each format's clipboard memory, in bytes."""
+        return self._sizes
+
+    @property
+    def total_size(self) -> int:
+        """Size of all the clipboard memory read, in bytes."""
+        return sum(self._sizes.values())
+
+    def __getitem__(self, format: int) -> Union[str, bytes]:
+        return self._data[format]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(formats={list(self._data)})"
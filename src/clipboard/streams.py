@@ -0,0 +1,318 @@
+"""Streaming clipboard data.
+
+Large payloads are written chunk by chunk straight into the clipboard's global
+memory, instead of being built as one `str`, encoded to one `bytes`, and then
+copied, so memory use stays close to the size of the payload.
+"""
+
+import codecs
+import ctypes
+from typing import TYPE_CHECKING
+from typing import BinaryIO
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+from typing import Union
+
+from clipboard.constants import DEFAULT_CHUNK_SIZE
+from clipboard.constants import HTML_ENCODING
+from clipboard.constants import UTF_ENCODING
+from clipboard.errors import SetClipboardError
+from clipboard.html_clipboard import HTMLTemplate
+from clipboard.tracing import trace
+
+
+if TYPE_CHECKING:
+    from clipboard.clipboard import Clipboard
+
+
+GMEM_MOVEABLE = 0x0002
+GMEM_ZEROINIT = 0x0040
+
+# Allocated when there is no size hint, and grown by doubling.
+MIN_CAPACITY: int = 64 * 1024
+
+
+def iter_chunks(
+    view: memoryview, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[memoryview]:
+    """Slice `view` into chunks of at most `chunk_size` bytes, without copying.
+
+    Raises
+    ------
+    ValueError
+        If `chunk_size` is not positive.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    for start in range(0, len(view), chunk_size):
+        with view[start : start + chunk_size] as chunk:
+            yield chunk
+
+
+def iter_decoded(
+    view: memoryview, encoding: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Decode `view` a chunk at a time.
+
+    Characters split between chunks are decoded with the next one.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in iter_chunks(view, chunk_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+class ClipboardWriter:
+    """Writes one format's data into clipboard memory, a chunk at a time.
+
+    Text is encoded as it is written, UTF-16LE for CF_UNICODETEXT and UTF-8
+    otherwise, and bytes are written as-is. CF_HTML content is the fragment,
+    wrapped in the CF_HTML header and document on close. The memory grows as
+    needed, and is placed on the clipboard by `close`, which empties the
+    clipboard first, like `Clipboard.set_clipboard`.
+
+    Use `Clipboard.open_writer` rather than creating it directly.
+
+    Raises
+    ------
+    SetClipboardError
+        If allocating the memory failed.
+    """
+
+    def __init__(
+        self,
+        clipboard: "Clipboard",
+        format: int,
+        size_hint: int = 0,
+        empty: bool = True,
+    ) -> None:
+        from clipboard.formats import ClipboardFormat
+
+        self.clipboard: "Clipboard" = clipboard
+        self.format: int = format
+        self.empty: bool = empty
+        self.closed: bool = False
+
+        self._backend = clipboard.backend
+        self._html: Optional[HTMLTemplate] = None
+        self._html_end: bytes = b""
+        self._terminator: bytes = b"\x00"
+        encoding: str = "utf-8"
+        if format == ClipboardFormat.CF_UNICODETEXT.value:
+            encoding = UTF_ENCODING
+            self._terminator = b"\x00\x00"
+        elif format == ClipboardFormat.CF_HTML.value:
+            encoding = HTML_ENCODING
+            self._html = HTMLTemplate()
+        self._encoder = codecs.getincrementalencoder(encoding)()
+
+        framing: bytes = b""
+        if self._html is not None:
+            header, html_start, self._html_end = self._html.encode_framing(0)
+            framing = header + html_start
+        # Kept free at the end, for what is written on close.
+        self._tail: int = len(self._html_end) + len(self._terminator)
+
+        self._size: int = 0
+        self._capacity: int = max(size_hint + len(framing) + self._tail, MIN_CAPACITY)
+        handle = self._backend.global_alloc(
+            GMEM_MOVEABLE | GMEM_ZEROINIT, self._capacity
+        )
+        if handle is None:
+            raise SetClipboardError("The `GlobalAlloc` function failed.")
+        self._handle: int = handle
+        self._view: Optional[memoryview] = None
+        self._lock()
+
+        self._write_bytes(framing)
+        self._start: int = self._size
+
+    @property
+    def size(self) -> int:
+        """Bytes of content written so far."""
+        return self._size - self._start
+
+    def write(self, chunk: Union[str, bytes, bytearray, memoryview]) -> int:
+        """Write a chunk, returning its length.
+
+        Raises
+        ------
+        ValueError
+            If the writer is closed.
+        SetClipboardError
+            If growing the memory failed.
+        """
+        if self.closed:
+            raise ValueError("Writing to a closed clipboard writer.")
+        if isinstance(chunk, str):
+            self._write_bytes(self._encoder.encode(chunk))
+        else:
+            self._write_bytes(chunk)
+        return len(chunk)
+
+    def writelines(
+        self, chunks: Iterable[Union[str, bytes, bytearray, memoryview]]
+    ) -> None:
+        """Write every chunk from an iterable, e.g. a generator."""
+        for chunk in chunks:
+            self.write(chunk)
+
+    def write_from(
+        self,
+        fileobj: Union[BinaryIO, TextIO],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Write everything read from a file object, returning the size read.
+
+        Binary files are read straight into the clipboard memory when they
+        support `readinto`, so their bytes must already be encoded for the
+        format, e.g. UTF-16LE for CF_UNICODETEXT.
+        """
+        total: int = 0
+        readinto = getattr(fileobj, "readinto", None)
+        while readinto is not None:
+            available = self._capacity - self._tail - self._size
+            if available <= 0:
+                # Full, which is expected with an exact size hint, so only
+                # grown if there is more to read.
+                chunk = fileobj.read(chunk_size)
+                if not chunk:
+                    return total
+                total += self.write(chunk)
+                continue
+            assert self._view is not None
+            end = self._size + min(chunk_size, available)
+            read = readinto(self._view[self._size : end])
+            if not read:
+                return total
+            self._size += read
+            total += read
+
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                return total
+            total += self.write(chunk)
+
+    def close(self) -> Optional[int]:
+        """Finish the data and place it on the clipboard, returning its handle.
+
+        The clipboard is opened, if it is not already.
+
+        Raises
+        ------
+        SetClipboardError
+            If setting the clipboard data failed.
+        OpenClipboardError
+            If opening the clipboard failed.
+        """
+        if self.closed:
+            return None
+        # Traced like the copy of `Clipboard.set_clipboard`, with every byte
+        # written, without the terminator.
+        with trace("copy", self._backend, format=self.format) as span:
+            self._write_bytes(self._encoder.encode("", final=True))
+            # What was kept free is written now.
+            self._tail = 0
+
+            if self._html is not None:
+                fragment_size = self._size - self._start
+                header, _, html_end = self._html.encode_framing(fragment_size)
+                self._write_bytes(html_end)
+                assert self._view is not None
+                self._view[: len(header)] = header
+            span.set(bytes=self._size)
+            self._write_bytes(self._terminator)
+
+            self.closed = True
+            self._unlock()
+            # Give back what was allocated but not written.
+            if self._size < self._capacity:
+                resized = self._backend.global_realloc(
+                    self._handle, self._size, GMEM_MOVEABLE
+                )
+                if resized is not None:
+                    self._handle = resized
+
+        try:
+            return self._set()
+        except BaseException:
+            self._backend.global_free(self._handle)
+            raise
+
+    def abort(self) -> None:
+        """Free the memory, without placing it on the clipboard."""
+        if self.closed:
+            return
+        self.closed = True
+        self._unlock()
+        self._backend.global_free(self._handle)
+
+    def _set(self) -> Optional[int]:
+        clipboard = self.clipboard
+        if not clipboard.opened:
+            with clipboard:
+                return self._set()
+            raise SetClipboardError("Setting the clipboard failed.")
+
+        if self.empty:
+            clipboard._empty()
+        handle = self._backend.set_clipboard_data(self.format, self._handle)
+        clipboard._invalidate_formats()
+        if handle is None:
+            raise SetClipboardError("Setting the clipboard failed.")
+        return handle
+
+    def _write_bytes(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        with memoryview(data) as source, source.cast("B") as source_bytes:
+            size = len(source_bytes)
+            if not size:
+                return
+            self._reserve(self._size + size + self._tail)
+            assert self._view is not None
+            self._view[self._size : self._size + size] = source_bytes
+            self._size += size
+
+    def _reserve(self, needed: int) -> None:
+        """Grow the memory to at least `needed` bytes."""
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2)
+        self._unlock()
+        handle = self._backend.global_realloc(
+            self._handle, capacity, GMEM_MOVEABLE | GMEM_ZEROINIT
+        )
+        if handle is None:
+            self._lock()
+            raise SetClipboardError("The `GlobalReAlloc` function failed.")
+        self._handle = handle
+        self._capacity = capacity
+        self._lock()
+
+    def _lock(self) -> None:
+        address = self._backend.global_lock(self._handle)
+        if address is None:
+            raise SetClipboardError("The `GlobalLock` function failed.")
+        array = (ctypes.c_char * self._capacity).from_address(address)
+        self._view = memoryview(array).cast("B")
+
+    def _unlock(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            self._backend.global_unlock(self._handle)
+
+    def __enter__(self) -> "ClipboardWriter":
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
+        if exception_type is not None:
+            self.abort()
+        else:
+            self.close()
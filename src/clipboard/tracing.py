@@ -0,0 +1,172 @@
+"""Tracing clipboard operations.
+
+Opening, enumerating, locking, copying, decoding and closing are each traced
+as a `Span`, with its duration and, where there is one, its format and size in
+bytes. Finished spans are passed to the hooks added with `add_trace_hook`, to
+log them, or to feed metrics or a tracer.
+
+Nothing is traced while there are no hooks, when `trace` only checks that
+there are none. The library never logs spans itself.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+
+if TYPE_CHECKING:
+    from clipboard.backends import ClipboardBackend
+
+
+TraceHook = Callable[["Span"], None]  # Type Alias
+
+_hooks: Tuple[TraceHook, ...] = ()
+# True while there are hooks. Checked on hot paths, before building the
+# attributes of a span, which `trace` would only discard.
+active: bool = False
+_hooks_lock = threading.Lock()
+_current_span: "ContextVar[Optional[Span]]" = ContextVar("clipboard_span", default=None)
+
+
+class Span:
+    """A traced clipboard operation.
+
+    Attributes
+    ----------
+    name : str
+        The operation, e.g. "open", "lock" or "decode".
+    attributes : Dict[str, Any]
+        Details of the operation, e.g. "format" and "bytes".
+    backend : Optional[ClipboardBackend]
+        The backend of the clipboard, to look up the names of its formats.
+        None if not given.
+    parent : Optional[Span]
+        The span this one was started in, e.g. the "get" a "lock" is part of.
+    start : float
+        When it started, from `time.perf_counter`.
+    duration : float
+        Seconds it took, set once it has ended.
+    error : Optional[BaseException]
+        What it raised, if anything.
+    """
+
+    __slots__ = (
+        "name",
+        "attributes",
+        "backend",
+        "parent",
+        "start",
+        "duration",
+        "error",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        attributes: Dict[str, Any],
+        backend: Optional["ClipboardBackend"] = None,
+    ) -> None:
+        self.name: str = name
+        self.attributes: Dict[str, Any] = attributes
+        self.backend: Optional["ClipboardBackend"] = backend
+        self.parent: Optional[Span] = None
+        self.start: float = 0.0
+        self.duration: float = 0.0
+        self.error: Optional[BaseException] = None
+
+    def set(self, **attributes: Any) -> None:
+        """Add details, e.g. the size once it is known."""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
+        self.duration = time.perf_counter() - self.start
+        self.error = exception_value
+        _current_span.reset(self._token)
+        for hook in _hooks:
+            try:
+                hook(self)
+            except Exception:
+                # Only imported once a hook fails, as `trace` is imported with
+                # the clipboard.
+                import logging
+
+                logging.getLogger(__name__).exception("Clipboard trace hook failed.")
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self.name!r}, {self.attributes},"
+            f" duration={self.duration})"
+        )
+
+
+class _NoSpan:
+    """Stands in for a `Span` while nothing is traced."""
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def trace(
+    name: str, backend: Optional["ClipboardBackend"] = None, **attributes: Any
+) -> Span:
+    """Trace an operation, used as a context manager.
+
+    Returns a stand-in that does nothing if there are no hooks.
+    """
+    if not _hooks:
+        return _NO_SPAN  # type: ignore
+    return Span(name, attributes, backend)
+
+
+def current_span() -> Optional[Span]:
+    """The span of the operation in progress, in this context."""
+    return _current_span.get()
+
+
+def add_trace_hook(hook: TraceHook) -> None:
+    """Call `hook` with every span once it ends, on the thread it ran on."""
+    global _hooks, active
+    with _hooks_lock:
+        _hooks = (*_hooks, hook)
+        active = True
+
+
+def remove_trace_hook(hook: TraceHook) -> None:
+    """Stop calling a hook added with `add_trace_hook`.
+
+    Raises
+    ------
+    ValueError
+        If the hook was not added.
+    """
+    global _hooks, active
+    with _hooks_lock:
+        if hook not in _hooks:
+            raise ValueError("The trace hook was not added.")
+        index = _hooks.index(hook)
+        _hooks = _hooks[:index] + _hooks[index + 1 :]
+        active = bool(_hooks)
@@ -0,0 +1,115 @@
+"""asyncio API tests."""
+
+import asyncio
+import unittest
+from typing import Optional
+
+from clipboard import Clipboard
+from clipboard import ClipboardFormat
+from clipboard import OpenClipboardError
+from clipboard import RetryPolicy
+from clipboard import aio
+from clipboard.backends import get_backend
+from clipboard.backends import set_backend
+from clipboard.backends.memory import MemoryBackend
+from clipboard.retry import get_retry_policy
+
+
+class CountingBackend(MemoryBackend):
+    """Counts the calls opening the clipboard."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.open_calls: int = 0
+
+    def open_clipboard(self, hwnd: Optional[int] = None) -> bool:
+        self.open_calls += 1
+        return super().open_clipboard(hwnd)
+
+
+class TestAsyncClipboard(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.previous = get_backend()
+        self.backend = CountingBackend()
+        set_backend(self.backend)
+
+    def tearDown(self) -> None:
+        set_backend(self.previous)
+
+    async def test_get_set(self) -> None:
+        await aio.set_clipboard("Hello")
+        self.assertEqual(await aio.get_clipboard(), "Hello")
+        self.assertEqual(await aio.get_clipboard("text"), "Hello")
+
+    async def test_empty(self) -> None:
+        self.assertIsNone(await aio.get_clipboard())
+
+    async def test_snapshot(self) -> None:
+        await aio.set_clipboard({"text": "Hello", "html": "<p>Hello</p>"})
+        snapshot = await aio.snapshot(["text"])
+        self.assertEqual(dict(snapshot), {ClipboardFormat.CF_UNICODETEXT: "Hello"})
+
+    async def test_shared_reads(self) -> None:
+        await aio.set_clipboard("Hello")
+        self.backend.open_calls = 0
+        results = await asyncio.gather(*(aio.get_clipboard("text") for _ in range(5)))
+        self.assertEqual(results, ["Hello"] * 5)
+        self.assertEqual(self.backend.open_calls, 1)
+
+    async def test_read_after_set(self) -> None:
+        """A read started before a set is not shared with reads after it."""
+        await aio.set_clipboard("Hello")
+        before = asyncio.ensure_future(aio.get_clipboard("text"))
+        await asyncio.sleep(0)
+        await aio.set_clipboard("World")
+        self.assertEqual(await aio.get_clipboard("text"), "World")
+        await before
+
+    async def test_retries(self) -> None:
+        """Opening is retried while another thread holds the clipboard."""
+        self.assertTrue(self.backend.open_clipboard())
+        try:
+            with self.assertRaises(OpenClipboardError):
+                await aio.get_clipboard("text")
+        finally:
+            self.backend.close_clipboard()
+        self.assertEqual(self.backend.open_calls, 1 + get_retry_policy().max_attempts)
+
+    async def test_clipboard_retry_policy(self) -> None:
+        """The retry policy of the clipboard given is used."""
+        clipboard = Clipboard(
+            backend=self.backend, retry_policy=RetryPolicy(max_attempts=2, delay=0)
+        )
+        self.assertTrue(self.backend.open_clipboard())
+        try:
+            with self.assertRaises(OpenClipboardError):
+                await aio.get_clipboard("text", clipboard=clipboard)
+        finally:
+            self.backend.close_clipboard()
+        self.assertEqual(self.backend.open_calls, 1 + 2)
+
+    async def test_clipboard_backend(self) -> None:
+        backend = MemoryBackend()
+        clipboard = Clipboard(backend=backend)
+        await aio.set_clipboard("Hello", clipboard=clipboard)
+        self.assertEqual(await aio.get_clipboard(clipboard=clipboard), "Hello")
+        snapshot = await aio.snapshot(["text"], clipboard=clipboard)
+        self.assertEqual(dict(snapshot), {ClipboardFormat.CF_UNICODETEXT: "Hello"})
+        # Not the process-wide backend.
+        self.assertIsNone(await aio.get_clipboard())
+
+    async def test_changes(self) -> None:
+        changes = aio.changes(formats=["text"])
+        # Started once the first event is awaited.
+        next_event = asyncio.ensure_future(changes.__anext__())
+        await asyncio.sleep(0.05)
+        await aio.set_clipboard("Hello")
+        event = await asyncio.wait_for(next_event, 5.0)
+        await changes.aclose()
+
+        assert event.snapshot is not None
+        self.assertEqual(event.snapshot[ClipboardFormat.CF_UNICODETEXT], "Hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Backend tests."""
+
+import ctypes
+import unittest
+
+from clipboard import Clipboard
+from clipboard import ClipboardFormat
+from clipboard.backends import get_backend
+from clipboard.backends import load_backend
+from clipboard.backends import set_backend
+from clipboard.backends.memory import MemoryBackend
+
+
+class TestBackendSelection(unittest.TestCase):
+    def test_default(self) -> None:
+        self.assertIs(get_backend(), get_backend())
+        self.assertIs(Clipboard().backend, get_backend())
+
+    def test_load(self) -> None:
+        self.assertIsInstance(load_backend("memory"), MemoryBackend)
+        with self.assertRaises(ValueError):
+            load_backend("missing")
+
+    def test_set(self) -> None:
+        previous = get_backend()
+        backend = MemoryBackend()
+        try:
+            set_backend(backend)
+            self.assertIs(get_backend(), backend)
+        finally:
+            set_backend(previous)
+
+
+class TestMemoryBackend(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = MemoryBackend()
+
+    def test_open_close(self) -> None:
+        self.assertFalse(self.backend.close_clipboard())
+        self.assertTrue(self.backend.open_clipboard())
+        self.assertTrue(self.backend.close_clipboard())
+
+    def test_requires_open(self) -> None:
+        handle = self.backend.global_alloc(0, 4)
+        self.assertIsNone(self.backend.set_clipboard_data(1, handle))
+        self.assertFalse(self.backend.empty_clipboard())
+        self.assertIsNone(self.backend.get_clipboard_data(1))
+
+    def test_global_memory(self) -> None:
+        handle = self.backend.global_alloc(0, 6)
+        assert handle is not None
+        address = self.backend.global_lock(handle)
+        assert address is not None
+        ctypes.memmove(address, b"hello", 5)
+        self.assertTrue(self.backend.global_unlock(handle))
+        self.assertFalse(self.backend.global_unlock(handle))
+        self.assertEqual(self.backend.global_size(handle), 6)
+        self.assertEqual(ctypes.string_at(address, 6), b"hello\x00")
+
+    def test_global_realloc(self) -> None:
+        handle = self.backend.global_alloc(0, 3)
+        assert handle is not None
+        ctypes.memmove(self.backend.global_lock(handle), b"abc", 3)
+        # Locked memory can not be resized.
+        self.assertIsNone(self.backend.global_realloc(handle, 6, 0))
+        self.backend.global_unlock(handle)
+
+        self.assertEqual(self.backend.global_realloc(handle, 6, 0), handle)
+        self.assertEqual(self.backend.global_size(handle), 6)
+        address = self.backend.global_lock(handle)
+        self.assertEqual(ctypes.string_at(address, 6), b"abc\x00\x00\x00")
+
+    def test_global_free(self) -> None:
+        handle = self.backend.global_alloc(0, 4)
+        assert handle is not None
+        self.assertTrue(self.backend.global_free(handle))
+        self.assertFalse(self.backend.global_free(handle))
+
+        handle = self.backend.global_alloc(0, 4)
+        self.backend.open_clipboard()
+        self.backend.set_clipboard_data(1, handle)
+        self.backend.close_clipboard()
+        self.assertFalse(self.backend.global_free(handle))
+
+    def test_enum_formats(self) -> None:
+        self.backend.open_clipboard()
+        for format in (13, 1, 7):
+            handle = self.backend.global_alloc(0, 2)
+            self.backend.set_clipboard_data(format, handle)
+        formats = [self.backend.enum_clipboard_formats(0)]
+        while formats[-1]:
+            formats.append(self.backend.enum_clipboard_formats(formats[-1]))
+        self.assertEqual(formats, [13, 1, 7, 0])
+        self.assertTrue(self.backend.empty_clipboard())
+        self.assertEqual(self.backend.enum_clipboard_formats(0), 0)
+        self.backend.close_clipboard()
+
+    def test_register_format(self) -> None:
+        format = self.backend.register_clipboard_format("Custom Format")
+        self.assertGreaterEqual(format, 0xC000)
+        self.assertEqual(
+            self.backend.register_clipboard_format("custom format"), format
+        )
+        self.assertEqual(
+            self.backend.get_clipboard_format_name(format), "Custom Format"
+        )
+        self.assertIsNone(self.backend.get_clipboard_format_name(format + 1))
+
+    def test_clipboard(self) -> None:
+        with Clipboard(backend=self.backend) as clipboard:
+            clipboard[ClipboardFormat.CF_UNICODETEXT] = "Hello World!"
+            self.assertEqual(clipboard.available_formats(), [13])
+            self.assertEqual(clipboard["text"], "Hello World!")
+
+
+if __name__ == "__main__":
+    unittest.main()
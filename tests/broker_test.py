@@ -0,0 +1,85 @@
+"""Clipboard broker tests."""
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from clipboard import ClipboardBroker
+from clipboard import get_broker
+from clipboard import get_clipboard
+from clipboard import set_clipboard
+
+
+class TestClipboardBroker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.broker = ClipboardBroker()
+
+    def tearDown(self) -> None:
+        self.broker.shutdown()
+
+    def test_single_worker(self) -> None:
+        threads = {
+            self.broker.submit(threading.current_thread).result() for _ in range(10)
+        }
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads.pop(), threading.current_thread())
+
+    def test_in_order(self) -> None:
+        order: List[int] = []
+        futures = [self.broker.submit(order.append, i) for i in range(100)]
+        for future in futures:
+            future.result()
+        self.assertEqual(order, list(range(100)))
+
+    def test_exception(self) -> None:
+        with self.assertRaises(ZeroDivisionError):
+            self.broker.call(lambda: 1 / 0)
+        self.assertEqual(self.broker.metrics()["failed"], 1)
+
+    def test_reentrant(self) -> None:
+        """Work submitting work runs it immediately, instead of deadlocking."""
+        self.assertEqual(self.broker.call(lambda: self.broker.call(lambda: 1)), 1)
+
+    def test_metrics(self) -> None:
+        release = threading.Event()
+        blocked = self.broker.submit(release.wait)
+        queued = [self.broker.submit(int) for _ in range(3)]
+        self.assertGreaterEqual(self.broker.metrics()["queue_depth"], 3)
+        release.set()
+        blocked.result()
+        for future in queued:
+            future.result()
+
+        metrics = self.broker.metrics()
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertGreaterEqual(metrics["max_queue_depth"], 3)
+        self.assertEqual(metrics["submitted"], 4)
+        self.assertEqual(metrics["completed"], 4)
+        self.assertGreater(metrics["max_wait_time"], 0)
+
+    def test_shutdown(self) -> None:
+        self.broker.call(int)
+        self.broker.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.broker.submit(int)
+
+
+class TestConvenienceFunctions(unittest.TestCase):
+    def test_process_wide(self) -> None:
+        self.assertIs(get_broker(), get_broker())
+
+    def test_threads(self) -> None:
+        """Threads using the convenience functions do not race to open."""
+
+        def round_trip(i: int) -> bool:
+            set_clipboard(f"Hello {i}")
+            return get_clipboard("text").startswith("Hello")  # type: ignore
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(round_trip, range(200)))
+        self.assertTrue(all(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Read cache tests."""
+
+import contextlib
+import io
+import unittest
+from typing import Optional
+from unittest import mock
+
+from clipboard import Clipboard
+from clipboard import ReadCache
+from clipboard import get_clipboard
+from clipboard import set_clipboard
+from clipboard.backends import get_backend
+from clipboard.backends.memory import MemoryBackend
+
+
+class CountingBackend(MemoryBackend):
+    """Counts the calls opening the clipboard."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.open_calls: int = 0
+
+    def open_clipboard(self, hwnd: Optional[int] = None) -> bool:
+        self.open_calls += 1
+        return super().open_clipboard(hwnd)
+
+
+class TestReadCache(unittest.TestCase):
+    def test_sequence_number(self) -> None:
+        cache = ReadCache()
+        cache.put(13, 1, "Hello")
+
+        self.assertEqual(cache.get(13, 1), "Hello")
+        self.assertIsNone(cache.get(13, 2))
+        self.assertIsNone(cache.get(1, 1))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_lru(self) -> None:
+        cache = ReadCache(maxsize=2)
+        cache.put(1, 1, "one")
+        cache.put(2, 1, "two")
+        cache.get(1, 1)
+        cache.put(3, 1, "three")
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(1, 1), "one")
+        self.assertIsNone(cache.get(2, 1))
+
+    def test_maxsize(self) -> None:
+        with self.assertRaises(ValueError):
+            ReadCache(maxsize=0)
+
+
+class TestClipboardCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = CountingBackend()
+        self.cache = ReadCache()
+        self.clipboard = Clipboard(backend=self.backend, cache=self.cache)
+        self.clipboard.set_clipboard("Hello")
+        self.backend.open_calls = 0
+
+    def test_unchanged(self) -> None:
+        for _ in range(5):
+            self.assertEqual(self.clipboard.get_clipboard(), "Hello")
+        self.assertEqual(self.backend.open_calls, 1)
+        self.assertEqual(self.cache.hits, 4)
+
+    def test_changed(self) -> None:
+        self.assertEqual(self.clipboard.get_clipboard(), "Hello")
+        Clipboard(backend=self.backend).set_clipboard("World")
+        self.assertEqual(self.clipboard.get_clipboard(), "World")
+        self.assertEqual(self.clipboard.get_clipboard(), "World")
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_sequence_number(self) -> None:
+        sequence_number = self.backend.get_clipboard_sequence_number()
+        self.clipboard.set_many({"text": "Hello", "rtf": "{\\rtf1}"})
+        # Emptied, then two formats set
+        self.assertEqual(
+            self.backend.get_clipboard_sequence_number(), sequence_number + 3
+        )
+
+    def test_convenience_function(self) -> None:
+        set_clipboard("Hello")
+        cache = ReadCache()
+        self.assertEqual(get_clipboard("text", cache=cache), get_clipboard("text"))
+        get_clipboard("text", cache=cache)
+        self.assertEqual(cache.hits, 1)
+
+    def test_convenience_function_no_format(self) -> None:
+        set_clipboard("Hello")
+        cache = ReadCache()
+        backend = get_backend()
+        with mock.patch.object(
+            backend, "open_clipboard", wraps=backend.open_clipboard
+        ) as open_clipboard:
+            # Polled, as a clipboard watcher would.
+            for _ in range(10):
+                self.assertEqual(get_clipboard(cache=cache), "Hello")
+            # Enumerating the formats, then reading the text.
+            self.assertEqual(open_clipboard.call_count, 2)
+
+            set_clipboard("World")
+            open_clipboard.reset_mock()
+            self.assertEqual(get_clipboard(cache=cache), "World")
+            self.assertEqual(open_clipboard.call_count, 2)
+        self.assertEqual(cache.hits, 9)
+
+    def test_missing_format(self) -> None:
+        """None, with the read cache or without it."""
+        set_clipboard("Hello")
+        uncached = Clipboard(backend=self.backend)
+        with contextlib.redirect_stderr(io.StringIO()):
+            for cache in (None, ReadCache()):
+                with self.subTest(cache=cache is not None):
+                    self.assertIsNone(get_clipboard("html", cache=cache))
+            self.assertIsNone(uncached.get_clipboard("html"))
+            self.assertIsNone(self.clipboard.get_clipboard("html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
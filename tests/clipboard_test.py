@@ -1,4 +1,5 @@
-import platform
+import contextlib
+import io
 import random
 import string
 import unittest
@@ -6,17 +7,15 @@ from typing import List
 
 from clipboard import Clipboard
 from clipboard import ClipboardFormat
+from clipboard import GetClipboardError
 from clipboard import get_clipboard
 from clipboard import set_clipboard
+from clipboard.backends.memory import MemoryBackend
 
 
 # Platform Settings
-if platform.system() == "Windows":
-    html_type_1 = ClipboardFormat.HTML_Format
-elif platform.system() == "Linux":
-    raise unittest.SkipTest("Platform not supported, but is planned.")
-else:
-    raise unittest.SkipTest(f"Platform not supported {platform.system()}.")
+# Off Windows, tests run against the in-memory backend.
+html_type_1 = ClipboardFormat.HTML_Format
 
 
 class TestClipboard(unittest.TestCase):
@@ -86,5 +85,243 @@ class TestClipboard(unittest.TestCase):
             clipboard._empty()
 
 
+class TestSetMany(unittest.TestCase):
+    contents = {
+        ClipboardFormat.CF_UNICODETEXT: "Hello World!",
+        ClipboardFormat.CF_HTML: "<h1>Hello World!</h1>",
+        ClipboardFormat.CF_RTF: r"{\rtf1\ansi Hello World!}",
+    }
+
+    def test_set_many(self) -> None:
+        clipboard = Clipboard()
+        handles = clipboard.set_many(self.contents)
+
+        self.assertEqual(len(handles), 3)
+        self.assertFalse(clipboard.opened)
+        with Clipboard() as clipboard:
+            formats: List[int] = clipboard.available_formats()
+            for format in self.contents:
+                self.assertIn(format, formats)
+            self.assertEqual(clipboard["text"], "Hello World!")
+            self.assertEqual(clipboard["rtf"], r"{\rtf1\ansi Hello World!}")
+
+    def test_empties_once(self) -> None:
+        with Clipboard() as clipboard:
+            clipboard.set_clipboard("Old")
+            clipboard.set_many({"rtf": "{\\rtf1 New}", "text": "New"})
+            self.assertEqual(len(clipboard.available_formats()), 2)
+            self.assertEqual(clipboard["text"], "New")
+
+    def test_convenience_function(self) -> None:
+        set_clipboard({"text": "Hello", "rtf": "{\\rtf1 Hello}"})
+        self.assertEqual(get_clipboard("text"), "Hello")
+        self.assertEqual(get_clipboard("rtf"), "{\\rtf1 Hello}")
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        set_clipboard(
+            {
+                ClipboardFormat.CF_UNICODETEXT: "Hello World!",
+                ClipboardFormat.CF_RTF: r"{\rtf1 Hello World!}",
+            }
+        )
+
+    def test_snapshot(self) -> None:
+        snapshot = Clipboard().snapshot()
+
+        self.assertEqual(
+            snapshot.formats,
+            (ClipboardFormat.CF_UNICODETEXT.value, ClipboardFormat.CF_RTF.value),
+        )
+        text, rtf = snapshot.formats
+        self.assertEqual(snapshot[text], "Hello World!")
+        self.assertEqual(snapshot[rtf], r"{\rtf1 Hello World!}")
+        self.assertEqual(snapshot.sizes[text], 26)
+        self.assertEqual(snapshot.total_size, 26 + 21)
+
+    def test_selected_formats(self) -> None:
+        snapshot = Clipboard().snapshot(["rtf", ClipboardFormat.CF_HTML])
+
+        self.assertEqual(list(snapshot), [ClipboardFormat.CF_RTF.value])
+
+    def test_immutable(self) -> None:
+        snapshot = Clipboard().snapshot()
+
+        with self.assertRaises(TypeError):
+            snapshot[1] = "text"  # type: ignore
+        with self.assertRaises(TypeError):
+            snapshot.sizes[1] = 1  # type: ignore
+
+
+class CountingBackend(MemoryBackend):
+    """Counts the calls enumerating formats."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.enum_calls: int = 0
+        self.available_calls: int = 0
+
+    def enum_clipboard_formats(self, format: int) -> int:
+        self.enum_calls += 1
+        return super().enum_clipboard_formats(format)
+
+    def is_clipboard_format_available(self, format: int) -> bool:
+        self.available_calls += 1
+        return super().is_clipboard_format_available(format)
+
+
+class TestFormatCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = CountingBackend()
+        Clipboard(backend=self.backend).set_many({"text": "Hello", "rtf": "{\\rtf1}"})
+        self.backend.enum_calls = 0
+
+    def test_get_does_not_enumerate(self) -> None:
+        with Clipboard(backend=self.backend) as clipboard:
+            for _ in range(5):
+                self.assertEqual(clipboard["text"], "Hello")
+        self.assertEqual(self.backend.enum_calls, 0)
+        self.assertEqual(self.backend.available_calls, 5)
+
+    def test_enumerates_once(self) -> None:
+        with Clipboard(backend=self.backend) as clipboard:
+            formats: List[int] = clipboard.available_formats()
+            self.assertEqual(clipboard.available_formats(), formats)
+            self.assertTrue(clipboard.has_format("rtf"))
+            self.assertFalse(clipboard.has_format(ClipboardFormat.CF_HTML))
+            self.assertEqual(clipboard["text"], "Hello")
+        # Two formats, and the terminating zero
+        self.assertEqual(self.backend.enum_calls, 3)
+        self.assertEqual(self.backend.available_calls, 0)
+
+    def test_invalidated(self) -> None:
+        with Clipboard(backend=self.backend) as clipboard:
+            self.assertEqual(len(clipboard.available_formats()), 2)
+            clipboard.set_clipboard("World")
+            self.assertEqual(len(clipboard.available_formats()), 1)
+            clipboard._empty()
+            self.assertEqual(clipboard.available_formats(), [])
+
+        with Clipboard(backend=self.backend) as clipboard:
+            self.assertEqual(clipboard.available_formats(), [])
+
+
+class TestView(unittest.TestCase):
+    def test_view(self) -> None:
+        set_clipboard("Hello World!", ClipboardFormat.CF_UNICODETEXT)
+        clipboard = Clipboard()
+
+        with clipboard.view(ClipboardFormat.CF_UNICODETEXT) as view:
+            self.assertTrue(view.readonly)
+            self.assertEqual(bytes(view[:-2]), "Hello World!".encode("UTF-16LE"))
+            self.assertTrue(clipboard.opened)
+            self.assertTrue(clipboard.locked)
+
+        self.assertFalse(clipboard.opened)
+        self.assertFalse(clipboard.locked)
+        with self.assertRaises(ValueError):
+            view[0]
+
+    def test_view_opened(self) -> None:
+        with Clipboard() as clipboard:
+            clipboard.set_clipboard("Hello World!")
+            with clipboard.view() as view:
+                self.assertEqual(len(view), len("Hello World!") * 2 + 2)
+            self.assertTrue(clipboard.opened)
+            self.assertFalse(clipboard.locked)
+
+    def test_view_slice_kept(self) -> None:
+        """Slices are views of the same memory, so can not outlive the block."""
+        clipboard = Clipboard()
+        clipboard.set_clipboard("Hello World!")
+        with self.assertRaises(BufferError):
+            with clipboard.view() as view:
+                kept = view[:10]
+        self.assertFalse(clipboard.opened)
+        self.assertFalse(clipboard.locked)
+
+        del kept
+        with clipboard.view() as view:
+            copied = bytes(view[:10])
+        self.assertEqual(copied, "Hello".encode("UTF-16LE"))
+
+    def test_view_unlocks_on_error(self) -> None:
+        clipboard = Clipboard()
+        clipboard.set_clipboard("Hello World!")
+        with self.assertRaises(RuntimeError):
+            with clipboard.view():
+                raise RuntimeError
+        self.assertFalse(clipboard.opened)
+        self.assertFalse(clipboard.locked)
+
+
+class TestDelayedRendering(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = MemoryBackend()
+        self.clipboard = Clipboard(backend=self.backend)
+        self.rendered: List[str] = []
+
+    def provider(self, content: str):
+        def render() -> str:
+            self.rendered.append(content)
+            return content
+
+        return render
+
+    def test_rendered_when_requested(self) -> None:
+        handles = self.clipboard.set_many(
+            {"text": "Hello", "html": self.provider("<p>Hello</p>")}
+        )
+        self.assertIsNone(handles[ClipboardFormat.CF_HTML.value])
+        self.assertTrue(self.clipboard.has_format("html"))
+
+        self.assertEqual(self.clipboard.get_clipboard("text"), "Hello")
+        self.assertEqual(self.rendered, [])
+
+        self.assertIn("<p>Hello</p>", self.clipboard.get_clipboard("html"))
+        self.clipboard.get_clipboard("html")
+        self.assertEqual(self.rendered, ["<p>Hello</p>"])
+
+    def test_never_requested(self) -> None:
+        self.clipboard.set_many({"text": "Hello", "rtf": self.provider("{\\rtf1}")})
+        self.clipboard.set_clipboard("World")
+        self.backend.render_all_formats()
+        self.assertEqual(self.rendered, [])
+
+    def test_render_all_formats(self) -> None:
+        self.clipboard.set_many({"rtf": self.provider("{\\rtf1}")})
+        self.backend.render_all_formats()
+        self.assertEqual(self.rendered, ["{\\rtf1}"])
+        self.assertEqual(self.clipboard.get_clipboard("rtf"), "{\\rtf1}")
+        self.assertEqual(self.rendered, ["{\\rtf1}"])
+
+    def test_sequence_number(self) -> None:
+        """Rendering does not change the clipboard."""
+        self.clipboard.set_many({"rtf": self.provider("{\\rtf1}")})
+        sequence_number = self.backend.get_clipboard_sequence_number()
+        self.clipboard.get_clipboard("rtf")
+        self.assertEqual(self.backend.get_clipboard_sequence_number(), sequence_number)
+
+    def test_failed_provider(self) -> None:
+        def fail() -> str:
+            raise RuntimeError
+
+        self.clipboard.set_many({"rtf": fail})
+        with (
+            Clipboard(backend=self.backend) as clipboard,
+            self.assertRaises(GetClipboardError),
+            contextlib.redirect_stderr(io.StringIO()),
+        ):
+            clipboard.get_clipboard("rtf")
+
+    def test_unsupported(self) -> None:
+        """Without delayed rendering, providers are called right away."""
+        backend = MemoryBackend()
+        backend.delay_render = lambda format, render: False  # type: ignore
+        Clipboard(backend=backend).set_many({"rtf": self.provider("{\\rtf1}")})
+        self.assertEqual(self.rendered, ["{\\rtf1}"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,80 @@
+"""CF_HDROP tests."""
+
+import pathlib
+import struct
+import unittest
+
+from clipboard import Clipboard
+from clipboard import ClipboardFormat
+from clipboard import DropFilesParseError
+from clipboard.backends.memory import MemoryBackend
+from clipboard.files import DROPFILES_SIZE
+from clipboard.files import decode_dropfiles
+from clipboard.files import encode_dropfiles
+
+
+PATHS = [r"C:\Users\me\report.docx", r"C:\Users\me\Größe ✓.txt", "D:\\"]
+
+
+class TestDropFiles(unittest.TestCase):
+    def test_encode(self) -> None:
+        data = encode_dropfiles([r"C:\a", r"C:\b"])
+        self.assertEqual(struct.unpack_from("<IiiII", data), (20, 0, 0, 0, 1))
+        self.assertEqual(data[DROPFILES_SIZE:], "C:\\a\0C:\\b\0\0".encode("utf-16-le"))
+
+    def test_round_trip(self) -> None:
+        self.assertEqual(decode_dropfiles(encode_dropfiles(PATHS)), PATHS)
+        self.assertEqual(decode_dropfiles(encode_dropfiles([])), [])
+
+    def test_path_like(self) -> None:
+        path = pathlib.PureWindowsPath(r"C:\a.txt")
+        self.assertEqual(decode_dropfiles(encode_dropfiles([path])), [r"C:\a.txt"])
+
+    def test_many(self) -> None:
+        paths = [rf"C:\files\{i:05}.txt" for i in range(50_000)]
+        self.assertEqual(decode_dropfiles(memoryview(encode_dropfiles(paths))), paths)
+
+    def test_trailing_memory(self) -> None:
+        # Clipboard memory can be larger, and is not always zeroed.
+        data = encode_dropfiles(PATHS) + b"\x00\xd8garbage\x00"
+        self.assertEqual(decode_dropfiles(data), PATHS)
+
+    def test_ansi(self) -> None:
+        header = struct.pack("<IiiII", 24, 0, 0, 0, 0) + b"\0" * 4
+        data = header + "C:\\a\0C:\\é\0\0".encode("cp1252")
+        self.assertEqual(decode_dropfiles(data, "cp1252"), ["C:\\a", "C:\\é"])
+        self.assertEqual(decode_dropfiles(header + b"\0\0"), [])
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(DropFilesParseError):
+            decode_dropfiles(b"short")
+        with self.assertRaises(DropFilesParseError):
+            decode_dropfiles(struct.pack("<IiiII", 1000, 0, 0, 0, 1))
+        with self.assertRaises(DropFilesParseError):
+            # No end
+            decode_dropfiles(encode_dropfiles(PATHS)[:-2])
+        for path in ("", "a\0b"):
+            with self.assertRaises(ValueError):
+                encode_dropfiles([path])
+
+
+class TestClipboardFiles(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clipboard = Clipboard(backend=MemoryBackend())
+
+    def test_set_and_get(self) -> None:
+        self.clipboard.set_files(PATHS)
+        self.assertEqual(
+            self.clipboard.available_formats(), [ClipboardFormat.CF_HDROP.value]
+        )
+        self.assertEqual(self.clipboard.get_files(), PATHS)
+
+        # Raw, rather than mangled by decoding it as text.
+        data = self.clipboard.get_clipboard(ClipboardFormat.CF_HDROP)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(decode_dropfiles(data), PATHS)
+
+    def test_no_files(self) -> None:
+        self.assertIsNone(self.clipboard.get_files())
+        self.clipboard.set_clipboard("Hello")
+        self.assertIsNone(self.clipboard.get_files())
@@ -1,18 +1,22 @@
 """Test available formats for the clipboard"""
 
-import platform
 import unittest
+from unittest import mock
 
+from clipboard import Clipboard
 from clipboard import ClipboardFormat  # type: ignore
+from clipboard import FormatNotSupportedError
+from clipboard import FormatRegistry
+from clipboard import get_format_name
+from clipboard import get_format_names
+from clipboard import get_format_registry
+from clipboard.backends import get_backend
+from clipboard.backends.memory import MemoryBackend
 
 
 # Platform Settings
-if platform.system() == "Windows":
-    html_type_1 = ClipboardFormat.HTML_Format
-elif platform.system() == "Linux":
-    raise unittest.SkipTest("Platform not supported, but is planned.")
-else:
-    raise unittest.SkipTest(f"Platform not supported {platform.system()}.")
+# Off Windows, tests run against the in-memory backend.
+html_type_1 = ClipboardFormat.HTML_Format
 
 
 class TestInterface(unittest.TestCase):
@@ -40,3 +44,132 @@ class TestFormats(unittest.TestCase):
         self.assertIn("CF_HTML", ClipboardFormat)
         self.assertIn("HTML_Format", ClipboardFormat)
         self.assertIn(ClipboardFormat.CF_HTML, ClipboardFormat)
+
+    def test_contains(self) -> None:
+        self.assertIn(1, ClipboardFormat)
+        self.assertIn("text", ClipboardFormat)
+        self.assertNotIn(0, ClipboardFormat)
+        self.assertNotIn("Not A Format", ClipboardFormat)
+        self.assertNotIn([1], ClipboardFormat)
+
+
+class TestFormatRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = MemoryBackend()
+        self.registry = get_format_registry(self.backend)
+        # Registered first, as in every session, so custom formats get other ids.
+        self.registry.register("HTML Format")
+        self.registry.register("Rich Text Format")
+        self.registry.register("PNG")
+
+    def test_per_backend(self) -> None:
+        self.assertIs(get_format_registry(self.backend), self.registry)
+        self.assertIsNot(get_format_registry(MemoryBackend()), self.registry)
+        self.assertIs(get_format_registry(), get_format_registry(get_backend()))
+
+    def test_register(self) -> None:
+        with mock.patch.object(
+            self.backend,
+            "register_clipboard_format",
+            wraps=self.backend.register_clipboard_format,
+        ) as register:
+            format = self.registry.register("Custom Format")
+            self.assertEqual(self.registry.register("custom format"), format)
+        register.assert_called_once_with("Custom Format")
+        self.assertEqual(self.registry.name(format), "Custom Format")
+        self.assertEqual(self.registry.register(""), 0)
+
+    def test_name(self) -> None:
+        self.assertEqual(self.registry.name(13), "CF_UNICODETEXT")
+        self.assertIsNone(self.registry.name(0xBFFF))
+        self.assertEqual(get_format_name(1), "CF_TEXT")
+
+    def test_resolve(self) -> None:
+        self.assertEqual(self.registry.resolve(ClipboardFormat.CF_TEXT), 1)
+        self.assertEqual(self.registry.resolve(13), 13)
+        self.assertEqual(self.registry.resolve("text"), 13)
+        self.assertIsNone(self.registry.resolve("Custom Format"))
+
+        format = self.registry.register("Custom Format")
+        self.assertEqual(self.registry.resolve("CUSTOM FORMAT"), format)
+
+    def test_clipboard_resolves_registered_names(self) -> None:
+        format = self.registry.register("Custom Format")
+        clipboard = Clipboard(backend=self.backend)
+        clipboard.set_clipboard(b"data", format="Custom Format")
+        self.assertEqual(clipboard.get_clipboard(format), "data")
+        self.assertEqual(clipboard.resolve_format("custom format"), format)
+        with self.assertRaises(FormatNotSupportedError):
+            clipboard.resolve_format("Not A Format")
+
+    def test_html_format(self) -> None:
+        # FIXME: HTML_Format resolves to CF_HTML, see `FormatRegistry.resolve`.
+        self.assertEqual(
+            self.registry.resolve(ClipboardFormat.HTML_Format),
+            ClipboardFormat.CF_HTML.value,
+        )
+
+
+class TestFormatNameCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = MemoryBackend()
+        self.registry = FormatRegistry(self.backend, maxsize=2)
+        self.registered = {
+            self.registry.register("HTML Format"): "HTML Format",
+            self.registry.register("Rich Text Format"): "Rich Text Format",
+            self.registry.register("PNG"): "PNG",
+        }
+        # Registered by another application, so not known to the registry.
+        self.formats = [
+            self.backend.register_clipboard_format(f"Format {i}") for i in range(3)
+        ]
+
+    def test_memoized(self) -> None:
+        with mock.patch.object(
+            self.backend,
+            "get_clipboard_format_name",
+            wraps=self.backend.get_clipboard_format_name,
+        ) as lookup:
+            self.assertEqual(self.registry.name(self.formats[0]), "Format 0")
+            self.assertEqual(self.registry.name(self.formats[0]), "Format 0")
+        lookup.assert_called_once_with(self.formats[0])
+        self.assertEqual(
+            self.registry.cache_info(),
+            {"hits": 1, "misses": 1, "maxsize": 2, "size": 1},
+        )
+
+    def test_not_found_is_not_cached(self) -> None:
+        self.assertIsNone(self.registry.name(0xBFFF))
+        self.assertEqual(self.registry.cache_info()["size"], 0)
+
+    def test_bounded(self) -> None:
+        self.registry.warm(self.formats)
+        self.assertEqual(
+            self.registry.cached_names(),
+            {
+                **self.registered,
+                self.formats[1]: "Format 1",
+                self.formats[2]: "Format 2",
+            },
+        )
+
+    def test_names(self) -> None:
+        self.assertEqual(
+            self.registry.names([1, self.formats[0], 0xBFFF]),
+            {1: "CF_TEXT", self.formats[0]: "Format 0", 0xBFFF: None},
+        )
+
+    def test_clear_cache(self) -> None:
+        registered = self.registry.register("Registered")
+        self.registry.warm(self.formats[:1])
+        self.registry.clear_cache()
+        self.assertEqual(
+            self.registry.cached_names(),
+            {**self.registered, registered: "Registered"},
+        )
+        self.assertEqual(self.registry.cache_info()["misses"], 0)
+
+    def test_get_format_names(self) -> None:
+        self.assertEqual(
+            get_format_names([1, 13]), {1: "CF_TEXT", 13: "CF_UNICODETEXT"}
+        )
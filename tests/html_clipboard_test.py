@@ -1,17 +1,17 @@
-import platform
 import unittest
 
 from clipboard import Clipboard
 from clipboard import ClipboardFormat
 from clipboard import get_clipboard
 from clipboard import set_clipboard
+from clipboard.errors import HTMLParseError
 from clipboard.html_clipboard import HTMLTemplate
+from clipboard.html_clipboard import parse_html_clipboard
 
 
 # Platform Settings
-if platform.system() != "Windows":
-    html_type_1 = ClipboardFormat.HTML_Format
-    raise unittest.SkipTest(f"Platform not supported {platform.system()}.")
+# Off Windows, tests run against the in-memory backend.
+html_type_1 = ClipboardFormat.HTML_Format
 
 
 class TestHTMLClipboard(unittest.TestCase):
@@ -88,6 +88,166 @@ EndFragment:0000000194
         )
 
 
+class TestEncode(unittest.TestCase):
+    contents = [
+        "",
+        "<h1>Hello World</h1>",
+        "<html><head></head><body><h1>Hello World</h1></body></html>",
+        "<p>Héllo Wörld ✓</p>\n<p>Second line</p>\n",
+    ]
+
+    def test_matches_generate(self) -> None:
+        for content in self.contents:
+            with self.subTest(content=content):
+                expected: bytes = HTMLTemplate(content).generate().encode()
+                self.assertEqual(HTMLTemplate(content).encode(), expected)
+
+    def test_fragments(self) -> None:
+        template: HTMLTemplate = HTMLTemplate()
+        template.fragments = ["<b>one</b>", "<i>twö</i>"]
+        expected: bytes = template.generate().encode()
+        self.assertEqual(template.encode(), expected)
+
+    def test_byte_counts(self) -> None:
+        content: str = "<p>Héllo Wörld ✓</p>"
+        template: HTMLTemplate = HTMLTemplate(content)
+        encoded: bytes = template.encode()
+
+        fragment = encoded[template.start_fragment : template.end_fragment]
+        self.assertEqual(fragment.decode(), content)
+        self.assertTrue(encoded[template.start_html :].startswith(b"<html>"))
+        self.assertEqual(template.end_html, len(encoded))
+
+    def test_source_url(self) -> None:
+        template: HTMLTemplate = HTMLTemplate("<h1>Hello World</h1>")
+        template.source_url = "https://example.com/"
+        encoded: bytes = template.encode()
+
+        self.assertIn(b"\nSourceURL:https://example.com/\n", encoded)
+        self.assertEqual(encoded, template.generate().encode())
+
+    def test_encode_into(self) -> None:
+        template: HTMLTemplate = HTMLTemplate("<h1>Hello World</h1>")
+        encoded: bytes = template.encode()
+        buffer: bytearray = bytearray(len(encoded) + 4)
+
+        written: int = template.encode_into(buffer, offset=2)
+        self.assertEqual(written, len(encoded))
+        self.assertEqual(bytes(buffer[2 : 2 + written]), encoded)
+        with self.assertRaises(ValueError):
+            template.encode_into(bytearray(len(encoded) - 1))
+
+
+def build_cf_html(
+    header: str, body: str, newline: str = "\r\n", padding: str = "0"
+) -> bytes:
+    """Build CF_HTML data, filling in the offsets named in `header`."""
+    body_bytes: bytes = body.encode()
+    lines = header.split("|")
+    # Offsets are padded to 10 characters, so the header size is known.
+    filled_header: str = newline.join(line.replace("{}", "0" * 10) for line in lines)
+    header_size = len((filled_header + newline).encode())
+    offsets = {
+        "StartHTML": header_size + body_bytes.find(b"<html"),
+        "EndHTML": header_size + len(body_bytes),
+        "StartFragment": header_size
+        + body_bytes.find(b"<!--StartFragment-->")
+        + len(b"<!--StartFragment-->"),
+        "EndFragment": header_size + body_bytes.find(b"<!--EndFragment-->"),
+        "StartSelection": header_size + body_bytes.find(b"<b>"),
+        "EndSelection": header_size + body_bytes.find(b"</b>") + len(b"</b>"),
+    }
+    filled = [
+        line.format(f"{offsets[line.split(':')[0]]:{padding}>10}")
+        if line.endswith(":{}")
+        else line
+        for line in lines
+    ]
+    return (newline.join(filled) + newline).encode() + body_bytes + b"\x00"
+
+
+class TestParse(unittest.TestCase):
+    def test_template(self) -> None:
+        content: str = "<p>Héllo Wörld ✓</p>"
+        template: HTMLTemplate = HTMLTemplate(content)
+        template.source_url = "https://example.com/"
+        parsed = parse_html_clipboard(template.encode() + b"\x00")
+
+        self.assertEqual(parsed.version, "1.0")
+        self.assertEqual(parsed.source_url, "https://example.com/")
+        self.assertEqual(parsed.fragment_text(), content)
+        self.assertEqual(parsed.selection_text(), content)
+        self.assertTrue(parsed.html_text().startswith("<html>"))
+        self.assertTrue(parsed.html_text().endswith("</html>"))
+
+    def test_zero_copy(self) -> None:
+        data: bytearray = bytearray(HTMLTemplate("<p>Hello</p>").encode())
+        parsed = parse_html_clipboard(data)
+        fragment = parsed.fragment
+        data[parsed.start_fragment] = ord("P")
+
+        self.assertIsInstance(fragment, memoryview)
+        self.assertEqual(bytes(fragment), b"Pp>Hello</p>")
+
+    def test_chrome(self) -> None:
+        data: bytes = build_cf_html(
+            "Version:0.9|StartHTML:{}|EndHTML:{}|StartFragment:{}|EndFragment:{}"
+            "|SourceURL:https://example.com/page?q=1",
+            "<html>\r\n<body>\r\n<!--StartFragment--><b>Hello</b>"
+            "<!--EndFragment-->\r\n</body>\r\n</html>",
+        )
+        parsed = parse_html_clipboard(data)
+
+        self.assertEqual(parsed.version, "0.9")
+        self.assertEqual(parsed.source_url, "https://example.com/page?q=1")
+        self.assertEqual(parsed.fragment_text(), "<b>Hello</b>")
+        self.assertTrue(parsed.html_text().endswith("</html>"))
+
+    def test_word(self) -> None:
+        data: bytes = build_cf_html(
+            "Version:1.0|StartHTML:{}|EndHTML:{}|StartFragment:{}|EndFragment:{}"
+            "|StartSelection:{}|EndSelection:{}",
+            '<html xmlns:o="urn:schemas-microsoft-com:office:office">'
+            "<body><!--StartFragment--><p>Say <b>Hello</b></p><!--EndFragment-->"
+            "</body></html>",
+        )
+        parsed = parse_html_clipboard(data)
+
+        self.assertEqual(parsed.fragment_text(), "<p>Say <b>Hello</b></p>")
+        self.assertEqual(parsed.selection_text(), "<b>Hello</b>")
+
+    def test_excel_space_padding(self) -> None:
+        data: bytes = build_cf_html(
+            "Version:1.0|StartHTML:{}|EndHTML:{}|StartFragment:{}|EndFragment:{}",
+            "<html><body><table><!--StartFragment--><tr><td>1</td></tr>"
+            "<!--EndFragment--></table></body></html>",
+            padding=" ",
+        )
+        parsed = parse_html_clipboard(data)
+
+        self.assertEqual(parsed.fragment_text(), "<tr><td>1</td></tr>")
+
+    def test_missing_offsets(self) -> None:
+        data: bytes = (
+            b"Version:1.0\nStartHTML:-1\nEndHTML:-1\nStartFragment:-1\n"
+            b"EndFragment:-1\n<html><body><!--StartFragment--><i>Hi</i>"
+            b"<!--EndFragment--></body></html>\x00\x00"
+        )
+        parsed = parse_html_clipboard(data)
+
+        self.assertEqual(parsed.fragment_text(), "<i>Hi</i>")
+        self.assertEqual(
+            parsed.html_text(),
+            "<html><body><!--StartFragment--><i>Hi</i><!--EndFragment--></body></html>",
+        )
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(HTMLParseError):
+            parse_html_clipboard(b"<html><body>Hello</body></html>")
+        with self.assertRaises(HTMLParseError):
+            parse_html_clipboard(b"Version:1.0\n<html><body>Hello</body></html>")
+
+
 class TestMore(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -0,0 +1,492 @@
+"""Image tests."""
+
+import io
+import os
+import struct
+import unittest
+import zlib
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+from unittest import mock
+
+from clipboard import Clipboard
+from clipboard import ClipboardFormat
+from clipboard import ImageParseError
+from clipboard.backends.memory import MemoryBackend
+from clipboard.images import BGRA_MASKS
+from clipboard.images import BI_BITFIELDS
+from clipboard.images import PNG_SIGNATURE
+from clipboard.images import _add
+from clipboard.images import _dib_header
+from clipboard.images import _subtract
+from clipboard.images import decode_png
+from clipboard.images import parse_bmp
+from clipboard.images import parse_dib
+from clipboard.images import parse_image
+from clipboard.images import png_size
+
+
+def make_dib(
+    width: int,
+    height: int,
+    bit_count: int,
+    pixels: List[bytes],
+    palette: bytes = b"",
+    v5: bool = False,
+) -> bytes:
+    """A bitmap from rows of pixels, top first, stored bottom-up if `height` > 0."""
+    stride = (width * bit_count + 31) // 32 * 4
+    colors = len(palette) // 4
+    compression, masks = (BI_BITFIELDS, BGRA_MASKS) if v5 else (0, ())
+    header = _dib_header(width, height, bit_count, compression, colors, v5, masks)
+    rows = [row.ljust(stride, b"\x00") for row in pixels]
+    if height > 0:
+        rows.reverse()
+    return header + palette + b"".join(rows)
+
+
+def read_png(data: bytes) -> Tuple[Tuple[int, ...], List[bytes]]:
+    """IHDR fields and unfiltered rows, checking every CRC."""
+    assert data[:8] == PNG_SIGNATURE
+    offset = 8
+    ihdr: Tuple[int, ...] = ()
+    idat = b""
+    while offset < len(data):
+        length, kind = struct.unpack_from(">I4s", data, offset)
+        body = data[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack_from(">I", data, offset + 8 + length)
+        assert crc == zlib.crc32(kind + body)
+        if kind == b"IHDR":
+            ihdr = struct.unpack(">IIBBBBB", body)
+        elif kind == b"IDAT":
+            idat += body
+        offset += 12 + length
+
+    width, height, depth, color_type = ihdr[:4]
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color_type]
+    size = (width * channels * depth + 7) // 8
+    raw = zlib.decompress(idat)
+    rows: List[bytes] = []
+    prior = bytes(size)
+    for y in range(height):
+        kind = raw[y * (size + 1)]
+        row = raw[y * (size + 1) + 1 : (y + 1) * (size + 1)]
+        assert kind in (0, 2)
+        if kind == 2:
+            row = bytes((a + b) & 0xFF for a, b in zip(row, prior))
+        rows.append(row)
+        prior = row
+    return ihdr, rows
+
+
+def write_png(
+    width: int,
+    height: int,
+    color_type: int,
+    depth: int,
+    rows: List[bytes],
+    filter_type: Union[int, Sequence[int]],
+    palette: Optional[bytes] = None,
+    chunk_size: int = 1 << 20,
+) -> bytes:
+    """A PNG file, with its rows filtered the simple way."""
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color_type]
+    bpp = max(1, channels * depth // 8)
+    if isinstance(filter_type, int):
+        filter_types: Sequence[int] = [filter_type] * len(rows)
+    else:
+        filter_types = filter_type
+    prior = bytes(len(rows[0]))
+    raw = b""
+    for row, filter_type in zip(rows, filter_types):
+        filtered = bytearray()
+        for i, value in enumerate(row):
+            left = row[i - bpp] if i >= bpp else 0
+            up = prior[i]
+            upper_left = prior[i - bpp] if i >= bpp else 0
+            if filter_type == 0:
+                predictor = 0
+            elif filter_type == 1:
+                predictor = left
+            elif filter_type == 2:
+                predictor = up
+            elif filter_type == 3:
+                predictor = (left + up) // 2
+            else:
+                estimate = left + up - upper_left
+                predictor = min((left, up, upper_left), key=lambda p: abs(estimate - p))
+            filtered.append((value - predictor) & 0xFF)
+        raw += bytes([filter_type]) + filtered
+        prior = row
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        crc = zlib.crc32(kind + body)
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
+
+    png = PNG_SIGNATURE + chunk(
+        b"IHDR", struct.pack(">IIBBBBB", width, height, depth, color_type, 0, 0, 0)
+    )
+    if palette is not None:
+        png += chunk(b"PLTE", palette)
+    compressed = zlib.compress(raw)
+    for start in range(0, len(compressed), chunk_size):
+        png += chunk(b"IDAT", compressed[start : start + chunk_size])
+    return png + chunk(b"IEND", b"")
+
+
+class TestBitwise(unittest.TestCase):
+    def test_subtract_and_add(self) -> None:
+        for size in (1, 3, 64, 1000):
+            a, b = os.urandom(size), os.urandom(size)
+            difference = _subtract(a, b)
+            self.assertEqual(difference, bytes((x - y) & 0xFF for x, y in zip(a, b)))
+            self.assertEqual(_add(difference, b), a)
+
+
+class TestParseDIB(unittest.TestCase):
+    def test_bottom_up(self) -> None:
+        # 3 pixels of 24 bits pad each row from 9 to 12 bytes.
+        top, bottom = b"\x01\x02\x03" * 3, b"\x04\x05\x06" * 3
+        bitmap = parse_dib(make_dib(3, 2, 24, [top, bottom]))
+
+        self.assertEqual((bitmap.width, bitmap.height), (3, 2))
+        self.assertFalse(bitmap.top_down)
+        self.assertEqual(bitmap.stride, 12)
+        self.assertEqual(bitmap.row(0), top)
+        self.assertEqual(bitmap.row(1), bottom)
+        self.assertEqual(len(bitmap.pixels), 24)
+        with self.assertRaises(IndexError):
+            bitmap.row(2)
+
+    def test_top_down(self) -> None:
+        top, bottom = b"\x01\x02\x03", b"\x04\x05\x06"
+        bitmap = parse_dib(make_dib(1, -2, 24, [top, bottom]))
+        self.assertTrue(bitmap.top_down)
+        self.assertEqual(list(bitmap.rows()), [top, bottom])
+
+    def test_zero_copy(self) -> None:
+        data = bytearray(make_dib(1, 1, 32, [b"\x01\x02\x03\x04"]))
+        bitmap = parse_dib(data)
+        data[-4] = 9
+        self.assertEqual(bitmap.row(0)[0], 9)
+
+    def test_palette(self) -> None:
+        palette = b"\x00\x00\xff\x00" + b"\x00\xff\x00\x00"
+        dib = make_dib(2, 1, 8, [b"\x00\x01"], palette=palette)
+        # 2 colors used.
+        dib = dib[:32] + struct.pack("<I", 2) + dib[36:]
+        bitmap = parse_dib(dib)
+        self.assertEqual(bitmap.colors, 2)
+        self.assertEqual(bitmap.palette, palette)
+        self.assertEqual(bitmap.row(0), b"\x00\x01")
+
+    def test_bitfields(self) -> None:
+        # RGBA, as some applications put on the clipboard.
+        masks = struct.pack("<III", 0xFF, 0xFF00, 0xFF0000)
+        header = _dib_header(1, 1, 32, BI_BITFIELDS, 0)
+        bitmap = parse_dib(header + masks + b"\x10\x20\x30\x00")
+        self.assertEqual(bitmap.masks, (0xFF, 0xFF00, 0xFF0000, 0))
+        self.assertEqual(bitmap.pixels_offset, 52)
+        _, rows = read_png(bitmap.to_png())
+        self.assertEqual(rows, [b"\x10\x20\x30"])
+
+    def test_v5(self) -> None:
+        bitmap = parse_dib(make_dib(1, 1, 32, [b"\x01\x02\x03\x80"], v5=True))
+        self.assertEqual(bitmap.header_size, 124)
+        self.assertEqual(bitmap.masks, BGRA_MASKS)
+        self.assertTrue(bitmap.has_alpha)
+
+    def test_has_alpha(self) -> None:
+        opaque = parse_dib(make_dib(2, 1, 32, [b"\x01\x02\x03\x00" * 2]))
+        self.assertFalse(opaque.has_alpha)
+        alpha = parse_dib(make_dib(2, 1, 32, [b"\x01\x02\x03\x00\x01\x02\x03\x01"]))
+        self.assertTrue(alpha.has_alpha)
+
+    def test_has_alpha_cached(self) -> None:
+        """The pixels are only scanned once."""
+        data = bytearray(make_dib(1, 2, 32, [b"\x01\x02\x03\x00"] * 2))
+        bitmap = parse_dib(data)
+        self.assertFalse(bitmap.has_alpha)
+        data[-1] = 0xFF
+        self.assertFalse(bitmap.has_alpha)
+        self.assertTrue(parse_dib(data).has_alpha)
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ImageParseError):
+            parse_dib(b"short")
+        with self.assertRaises(ImageParseError):
+            # Too short for its pixels.
+            parse_dib(make_dib(4, 4, 24, [b""] * 4)[:-1])
+        with self.assertRaises(ImageParseError):
+            parse_dib(struct.pack("<I", 12) + bytes(36))
+        with self.assertRaises(ImageParseError):
+            parse_bmp(make_dib(1, 1, 24, [b"\x00\x00\x00"]))
+
+
+class TestConvert(unittest.TestCase):
+    def test_bmp(self) -> None:
+        dib = make_dib(3, 2, 24, [b"\x01\x02\x03" * 3, b"\x04\x05\x06" * 3])
+        bmp = parse_dib(dib).to_bmp()
+        self.assertEqual(bmp[:2], b"BM")
+        self.assertEqual(struct.unpack_from("<I", bmp, 2)[0], len(bmp))
+        self.assertEqual(struct.unpack_from("<I", bmp, 10)[0], 54)
+        self.assertEqual(parse_bmp(bmp).to_dib(), dib)
+
+    def test_png_rgb(self) -> None:
+        rows = [b"\x01\x02\x03\x04\x05\x06", b"\x07\x08\x09\x0a\x0b\x0c"]
+        png = parse_dib(make_dib(2, 2, 24, rows)).to_png()
+        ihdr, png_rows = read_png(png)
+        self.assertEqual(ihdr, (2, 2, 8, 2, 0, 0, 0))
+        # BGR to RGB
+        self.assertEqual(
+            png_rows, [b"\x03\x02\x01\x06\x05\x04", b"\x09\x08\x07\x0c\x0b\x0a"]
+        )
+
+    def test_png_rgba(self) -> None:
+        png = parse_dib(make_dib(1, 1, 32, [b"\x01\x02\x03\x80"], v5=True)).to_png()
+        ihdr, rows = read_png(png)
+        self.assertEqual(ihdr[3], 6)
+        self.assertEqual(rows, [b"\x03\x02\x01\x80"])
+
+    def test_png_palette(self) -> None:
+        palette = bytes(range(8))
+        rows = [b"\x50", b"\xa0"]
+        png = parse_dib(make_dib(4, 2, 1, rows, palette=palette)).to_png()
+        ihdr, png_rows = read_png(png)
+        self.assertEqual(ihdr, (4, 2, 1, 3, 0, 0, 0))
+        self.assertEqual(png_rows, rows)
+        self.assertIn(b"PLTE\x02\x01\x00\x06\x05\x04", png)
+
+    def test_png_streaming(self) -> None:
+        width, height = 256, 300
+        rows = [os.urandom(width * 3) for _ in range(height)]
+        bitmap = parse_dib(make_dib(width, height, 24, rows))
+        parts = list(bitmap.iter_png(level=1))
+        # Signature and IHDR, several IDAT chunks, IEND.
+        self.assertGreater(len(parts), 4)
+
+        file = io.BytesIO()
+        self.assertEqual(bitmap.write_png(file, level=1), len(b"".join(parts)))
+        self.assertEqual(file.getvalue(), b"".join(parts))
+        round_trip = decode_png(file.getvalue())
+        self.assertEqual(list(round_trip.rows()), rows)
+
+    def test_round_trip(self) -> None:
+        rows = [os.urandom(5 * 4) for _ in range(3)]
+        for v5 in (False, True):
+            with self.subTest(v5=v5):
+                bitmap = parse_dib(make_dib(5, 3, 32, rows, v5=v5))
+                decoded = decode_png(bitmap.to_png())
+                self.assertTrue(decoded.has_alpha)
+                self.assertEqual(decoded.header_size, 124)
+                self.assertEqual(list(decoded.rows()), rows)
+                self.assertEqual(parse_dib(decoded.to_dib()).to_png(), bitmap.to_png())
+
+    def test_16_bit(self) -> None:
+        # 5 bits per channel: red, green, and blue at about half.
+        pixels = b"\x00\x7c\xe0\x03\x10\x00\x00\x00"
+        bitmap = parse_dib(make_dib(4, 1, 16, [pixels]))
+        self.assertTrue(bitmap.supports_png)
+        expected = b"\xff\x00\x00\x00\xff\x00\x00\x00\x84\x00\x00\x00"
+        self.assertEqual(read_png(bitmap.to_png())[1], [expected])
+
+    def test_16_bit_masks(self) -> None:
+        # 5, 6 and 5 bits: white, then green at about half.
+        masks = (0xF800, 0x07E0, 0x001F, 0)
+        header = _dib_header(2, -1, 16, BI_BITFIELDS, 0, True, masks)
+        bitmap = parse_dib(header + b"\xff\xff\x00\x04")
+        self.assertEqual(read_png(bitmap.to_png())[1], [b"\xff\xff\xff\x00\x82\x00"])
+
+    def test_unsupported(self) -> None:
+        # 10 bits per channel.
+        masks = (0x3FF00000, 0x000FFC00, 0x000003FF, 0)
+        header = _dib_header(1, 1, 32, BI_BITFIELDS, 0, True, masks)
+        bitmap = parse_dib(header + bytes(4))
+        self.assertFalse(bitmap.supports_png)
+        with self.assertRaises(ImageParseError):
+            bitmap.to_png()
+
+
+class TestDecodePNG(unittest.TestCase):
+    def test_filters(self) -> None:
+        width, height = 7, 5
+        rows = [os.urandom(width * 4) for _ in range(height)]
+        expected = [bytearray(row) for row in rows]
+        for row in expected:
+            row[0::4], row[2::4] = row[2::4], row[0::4]
+        for filter_type in range(5):
+            with self.subTest(filter_type=filter_type):
+                png = write_png(width, height, 6, 8, rows, filter_type, chunk_size=7)
+                bitmap = decode_png(png)
+                self.assertFalse(bitmap.top_down)
+                self.assertEqual(list(bitmap.rows()), expected)
+
+    def test_mixed_filters(self) -> None:
+        # Undone a diagonal at a time, as Average and Paeth rows are mixed in.
+        width, height = 9, 10
+        rows = [os.urandom(width * 3) for _ in range(height)]
+        filter_types = [y % 5 for y in range(height)]
+        png = write_png(width, height, 2, 8, rows, filter_types, chunk_size=5)
+        expected = [bytearray(row) for row in rows]
+        for row in expected:
+            row[0::3], row[2::3] = row[2::3], row[0::3]
+        self.assertEqual(list(decode_png(png).rows()), expected)
+
+    def test_filters_bytes_per_pixel(self) -> None:
+        height = 6
+        for color_type, depth, width in ((0, 8, 11), (6, 16, 4), (2, 8, 1)):
+            channels = {0: 1, 2: 3, 6: 4}[color_type]
+            rows = [os.urandom(width * channels * depth // 8) for _ in range(height)]
+            simple = decode_png(write_png(width, height, color_type, depth, rows, 0))
+            for filter_type in (3, 4):
+                with self.subTest(color_type=color_type, filter_type=filter_type):
+                    png = write_png(width, height, color_type, depth, rows, filter_type)
+                    self.assertEqual(list(decode_png(png).rows()), list(simple.rows()))
+
+    def test_rgb(self) -> None:
+        png = write_png(3, 1, 2, 8, [b"\x01\x02\x03\x04\x05\x06\x07\x08\x09"], 1)
+        bitmap = decode_png(png)
+        self.assertEqual(bitmap.bit_count, 24)
+        self.assertEqual(bitmap.stride, 12)
+        self.assertFalse(bitmap.has_alpha)
+        self.assertEqual(bitmap.row(0), b"\x03\x02\x01\x06\x05\x04\x09\x08\x07")
+
+    def test_gray(self) -> None:
+        bitmap = decode_png(write_png(2, 1, 0, 8, [b"\x10\x20"], 4))
+        self.assertEqual(bitmap.bit_count, 8)
+        self.assertEqual(bitmap.palette[0x10 * 4 : 0x11 * 4], b"\x10\x10\x10\x00")
+        self.assertEqual(bitmap.row(0), b"\x10\x20")
+
+    def test_gray_alpha(self) -> None:
+        bitmap = decode_png(write_png(1, 1, 4, 8, [b"\x10\x80"], 0))
+        self.assertEqual(bitmap.row(0), b"\x10\x10\x10\x80")
+        self.assertTrue(bitmap.has_alpha)
+
+    def test_palette(self) -> None:
+        png = write_png(4, 1, 3, 4, [b"\x01\x23"], 0, palette=b"\x01\x02\x03" * 4)
+        bitmap = decode_png(png)
+        self.assertEqual(bitmap.bit_count, 4)
+        self.assertEqual(bitmap.colors, 16)
+        self.assertEqual(bitmap.palette[:8], b"\x03\x02\x01\x00" * 2)
+        self.assertEqual(bitmap.row(0), b"\x01\x23")
+
+    def test_16_bit(self) -> None:
+        png = write_png(1, 1, 2, 16, [b"\x01\xff\x02\xff\x03\xff"], 3)
+        self.assertEqual(decode_png(png).row(0), b"\x03\x02\x01")
+
+    def test_invalid(self) -> None:
+        png = write_png(1, 1, 2, 8, [b"\x01\x02\x03"], 0)
+        with self.assertRaises(ImageParseError):
+            decode_png(b"not a png")
+        with self.assertRaises(ImageParseError):
+            # Cut short
+            decode_png(png[:40])
+        with self.assertRaises(ImageParseError):
+            # Interlaced
+            decode_png(png[:28] + b"\x01" + png[29:])
+        with self.assertRaises(ImageParseError):
+            decode_png(write_png(8, 1, 0, 2, [b"\x00\x00"], 0))
+        with self.assertRaises(ImageParseError):
+            # Filter type
+            decode_png(write_png(1, 1, 2, 8, [b"\x01\x02\x03"], 5))
+
+    def test_parse_image(self) -> None:
+        dib = make_dib(1, 1, 24, [b"\x01\x02\x03"])
+        png = write_png(1, 1, 2, 8, [b"\x03\x02\x01"], 0)
+        bmp = parse_dib(dib).to_bmp()
+        for data in (dib, png, bmp):
+            self.assertEqual(parse_image(data).row(0), b"\x01\x02\x03")
+
+
+class TestClipboardImages(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clipboard = Clipboard(backend=MemoryBackend())
+        self.png = ClipboardFormat.CF_PNG.value
+        self.dib = ClipboardFormat.CF_DIB.value
+        self.dib_v5 = ClipboardFormat.CF_DIBV5.value
+
+    def test_set_bitmap(self) -> None:
+        rows = [b"\x01\x02\x03" * 3, b"\x04\x05\x06" * 3]
+        dib = make_dib(3, 2, 24, rows)
+        handles = self.clipboard.set_image(dib)
+        # PNG is only encoded once requested.
+        self.assertEqual(handles, {self.dib: mock.ANY, self.png: None})
+
+        self.assertEqual(self.clipboard.get_clipboard(self.dib)[:-1], dib)
+        self.assertEqual(parse_bmp(self.clipboard.get_image("bmp")).row(1), rows[1])
+        png = self.clipboard.get_image()
+        self.assertEqual(decode_png(png).to_dib(), dib)
+        self.assertEqual(self.clipboard.get_clipboard(self.png), png)
+
+    def test_set_bitmap_without_png(self) -> None:
+        """Bitmaps that can not be encoded as PNG are only placed as CF_DIB."""
+        masks = (0x3FF00000, 0x000FFC00, 0x000003FF, 0)
+        dib = _dib_header(1, 1, 32, BI_BITFIELDS, 0, False, masks)
+        dib += struct.pack("<III", *masks[:3]) + bytes(4)
+        handles = self.clipboard.set_image(dib)
+        self.assertEqual(handles, {self.dib: mock.ANY})
+
+    def test_set_bitmap_with_alpha(self) -> None:
+        rows = [b"\x01\x02\x03\x80"]
+        self.clipboard.set_image(make_dib(1, 1, 32, rows, v5=True))
+        self.assertEqual(
+            self.clipboard.available_formats(), [self.dib, self.dib_v5, self.png]
+        )
+        self.assertEqual(read_png(self.clipboard.get_image())[1], [b"\x03\x02\x01\x80"])
+
+    def test_set_png(self) -> None:
+        png = write_png(1, 1, 2, 8, [b"\x03\x02\x01"], 0)
+        with mock.patch("clipboard.images.decode_png", wraps=decode_png) as decode:
+            handles = self.clipboard.set_image(png)
+            self.assertEqual(handles, {self.png: mock.ANY, self.dib: None})
+
+            # Untouched, so never decoded.
+            self.assertEqual(self.clipboard.get_image(), png)
+            self.assertEqual(self.clipboard.get_clipboard(self.png), png)
+            decode.assert_not_called()
+
+            # Synthesized on demand.
+            bitmap = parse_dib(self.clipboard.get_clipboard(self.dib))
+            self.assertEqual(bitmap.row(0), b"\x01\x02\x03")
+            self.assertEqual(
+                parse_bmp(self.clipboard.get_image("bmp")).row(0), b"\x01\x02\x03"
+            )
+            decode.assert_called_once()
+
+    def test_set_png_with_alpha(self) -> None:
+        png = write_png(1, 1, 6, 8, [b"\x03\x02\x01\x80"], 0)
+        with mock.patch("clipboard.images.decode_png", wraps=decode_png) as decode:
+            self.clipboard.set_image(png)
+            self.assertEqual(
+                self.clipboard.available_formats(), [self.png, self.dib, self.dib_v5]
+            )
+            v5 = parse_dib(self.clipboard.get_clipboard(self.dib_v5))
+            dib = parse_dib(self.clipboard.get_clipboard(self.dib))
+            decode.assert_called_once()
+        self.assertEqual(v5.header_size, 124)
+        self.assertEqual(dib.header_size, 40)
+        self.assertEqual(v5.row(0), dib.row(0))
+
+    def test_png_trailing_memory(self) -> None:
+        png = write_png(1, 1, 2, 8, [b"\x03\x02\x01"], 0)
+        self.clipboard.set_clipboard(png + bytes(16), format=self.png)
+        self.assertEqual(self.clipboard.get_clipboard(self.png), png)
+        self.assertEqual(self.clipboard.get_image(), png)
+        self.assertEqual(png_size(png + bytes(16)), len(png))
+        with self.assertRaises(ImageParseError):
+            png_size(png[:-12])
+
+    def test_no_image(self) -> None:
+        self.clipboard.set_clipboard("Hello")
+        self.assertIsNone(self.clipboard.get_image())
+        with self.assertRaises(ValueError):
+            self.clipboard.get_image("gif")
+        with self.assertRaises(ImageParseError):
+            self.clipboard.set_image(b"not an image")
+        with self.assertRaises(ImageParseError):
+            # Interlaced, so it could never be converted to a bitmap.
+            png = write_png(1, 1, 2, 8, [b"\x03\x02\x01"], 0)
+            self.clipboard.set_image(png[:28] + b"\x01" + png[29:])
@@ -0,0 +1,73 @@
+"""Import time tests.
+
+Each test runs in a fresh interpreter, so the modules imported by other tests
+do not interfere.
+"""
+
+import subprocess
+import sys
+import unittest
+
+
+def run(code: str) -> str:
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return process.stdout.strip()
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_import(self) -> None:
+        loaded = run(
+            "import sys, clipboard;"
+            "print(sorted(m for m in sys.modules if m.startswith('clipboard')))"
+        )
+        self.assertEqual(loaded, "['clipboard']")
+
+    def test_import_names(self) -> None:
+        """Importing the functions does not load the backend or formats."""
+        loaded = run(
+            "import sys;"
+            "from clipboard import Clipboard, get_clipboard, set_clipboard;"
+            "import clipboard.backends as b;"
+            "print(b._backend is None, 'clipboard.formats' in sys.modules)"
+        )
+        self.assertEqual(loaded, "True False")
+
+    def test_import_function(self) -> None:
+        """Images, streams and the broker are only imported on first use."""
+        loaded = run(
+            "import sys;"
+            "from clipboard import get_clipboard;"
+            "print([m for m in ('clipboard.images', 'clipboard.streams',"
+            " 'clipboard.broker', 'concurrent.futures') if m in sys.modules])"
+        )
+        self.assertEqual(loaded, "[]")
+
+    def test_first_use(self) -> None:
+        loaded = run(
+            "import clipboard;"
+            "clipboard.set_clipboard('text');"
+            "print(clipboard.get_clipboard('text'))"
+        )
+        self.assertEqual(loaded, "text")
+
+    def test_clipboard_format(self) -> None:
+        """Still importable from `clipboard.clipboard`, but only on use."""
+        loaded = run(
+            "import sys, clipboard.clipboard;"
+            "print('clipboard.formats' in sys.modules);"
+            "from clipboard.clipboard import ClipboardFormat;"
+            "print(ClipboardFormat.CF_TEXT.value)"
+        )
+        self.assertEqual(loaded, "False\n1")
+
+    def test_missing_attribute(self) -> None:
+        import clipboard
+
+        with self.assertRaises(AttributeError):
+            clipboard.missing  # noqa: B018
+
+
+if __name__ == "__main__":
+    unittest.main()
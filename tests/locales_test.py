@@ -0,0 +1,144 @@
+"""CF_LOCALE, CF_TEXT and CF_OEMTEXT tests."""
+
+import struct
+import unittest
+from unittest import mock
+
+from clipboard import Clipboard
+from clipboard import ClipboardFormat
+from clipboard.backends.memory import MemoryBackend
+from clipboard.locales import DEFAULT_ANSI_ENCODING
+from clipboard.locales import DEFAULT_OEM_ENCODING
+from clipboard.locales import CodePages
+from clipboard.locales import decode_text
+from clipboard.locales import encode_text
+from clipboard.locales import get_code_pages
+from clipboard.locales import get_text_encoding
+from clipboard.locales import parse_locale
+
+
+RUSSIAN = 0x0419
+JAPANESE = 0x0411
+HINDI = 0x0439
+
+
+class TestCodePages(unittest.TestCase):
+    def test_code_pages(self) -> None:
+        self.assertEqual(get_code_pages(0x0407), CodePages(1252, 850))
+        self.assertEqual(get_code_pages(0x0409), CodePages(1252, 437))
+        self.assertEqual(get_code_pages(RUSSIAN), CodePages(1251, 866))
+        self.assertEqual(get_code_pages(0x0804), CodePages(936, 936))
+        self.assertEqual(get_code_pages(0x0404), CodePages(950, 950))
+        # Serbian, in Latin and in Cyrillic
+        self.assertEqual(get_code_pages(0x081A), CodePages(1250, 852))
+        self.assertEqual(get_code_pages(0x0C1A), CodePages(1251, 855))
+        # Unicode only
+        self.assertIsNone(get_code_pages(HINDI))
+
+    def test_text_encoding(self) -> None:
+        self.assertEqual(get_text_encoding(RUSSIAN), "cp1251")
+        self.assertEqual(get_text_encoding(RUSSIAN, oem=True), "cp866")
+        self.assertEqual(get_text_encoding(JAPANESE), "cp932")
+        self.assertEqual(get_text_encoding(), DEFAULT_ANSI_ENCODING)
+        self.assertEqual(get_text_encoding(HINDI, oem=True), DEFAULT_OEM_ENCODING)
+
+        hits = get_text_encoding.cache_info().hits
+        get_text_encoding(RUSSIAN)
+        self.assertEqual(get_text_encoding.cache_info().hits, hits + 1)
+
+    def test_parse_locale(self) -> None:
+        self.assertEqual(parse_locale(struct.pack("<I", RUSSIAN) + b"\0"), RUSSIAN)
+        self.assertIsNone(parse_locale(b"\0"))
+
+
+class TestText(unittest.TestCase):
+    def test_decode(self) -> None:
+        text = "Привет, мир"
+        self.assertEqual(decode_text(text.encode("cp1251") + b"\0", RUSSIAN), text)
+        self.assertEqual(
+            decode_text(memoryview(text.encode("cp866")), RUSSIAN, oem=True), text
+        )
+        self.assertEqual(
+            decode_text("こんにちは".encode("cp932"), JAPANESE), "こんにちは"
+        )
+
+    def test_trailing_memory(self) -> None:
+        self.assertEqual(decode_text(b"abc\0\x98garbage", RUSSIAN), "abc")
+
+    def test_encode(self) -> None:
+        self.assertEqual(encode_text("Привет", RUSSIAN), "Привет".encode("cp1251"))
+        # Not in the code page
+        self.assertEqual(encode_text("a✓", RUSSIAN), b"a?")
+
+
+class TestClipboardText(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clipboard = Clipboard(backend=MemoryBackend())
+
+    def set_text(self, text: bytes, lcid: int, oem: bool = False) -> None:
+        format = ClipboardFormat.CF_OEMTEXT if oem else ClipboardFormat.CF_TEXT
+        self.clipboard.set_many(
+            {format: text, ClipboardFormat.CF_LOCALE: struct.pack("<I", lcid)}
+        )
+
+    def test_locale(self) -> None:
+        self.set_text("Привет".encode("cp1251"), RUSSIAN)
+        self.assertEqual(self.clipboard.get_locale(), RUSSIAN)
+        self.assertEqual(
+            self.clipboard.get_clipboard(ClipboardFormat.CF_TEXT), "Привет"
+        )
+        self.assertEqual(
+            self.clipboard.get_clipboard(ClipboardFormat.CF_LOCALE),
+            struct.pack("<I", RUSSIAN) + b"\0",
+        )
+
+    def test_oem(self) -> None:
+        self.set_text("Привет".encode("cp866"), RUSSIAN, oem=True)
+        self.assertEqual(
+            self.clipboard.get_clipboard(ClipboardFormat.CF_OEMTEXT), "Привет"
+        )
+
+    def test_synthesize_unicode(self) -> None:
+        self.set_text("Привет".encode("cp1251"), RUSSIAN)
+        # Asserted after, as the clipboard's `__exit__` swallows errors.
+        with self.clipboard as clipboard:
+            with mock.patch.object(
+                clipboard.backend,
+                "get_clipboard_data",
+                wraps=clipboard.backend.get_clipboard_data,
+            ) as get_data:
+                texts = [clipboard.get_clipboard(), clipboard.get_clipboard("text")]
+        self.assertEqual(texts, ["Привет", "Привет"])
+        # The locale is read once for the session.
+        self.assertEqual(
+            [call.args[0] for call in get_data.call_args_list],
+            [
+                ClipboardFormat.CF_TEXT.value,
+                ClipboardFormat.CF_LOCALE.value,
+                ClipboardFormat.CF_TEXT.value,
+            ],
+        )
+
+    def test_no_locale(self) -> None:
+        text = "café"
+        self.clipboard.set_clipboard(text, format=ClipboardFormat.CF_TEXT)
+        self.assertIsNone(self.clipboard.get_locale())
+        self.assertEqual(self.clipboard.get_clipboard(ClipboardFormat.CF_TEXT), text)
+        with self.clipboard.view(ClipboardFormat.CF_TEXT) as view:
+            self.assertEqual(view.tobytes(), text.encode(DEFAULT_ANSI_ENCODING) + b"\0")
+
+    def test_iter_chunks(self) -> None:
+        self.set_text("Привет".encode("cp1251") + b"\0", RUSSIAN)
+        chunks = self.clipboard.iter_chunks(
+            ClipboardFormat.CF_TEXT, chunk_size=4, decode=True
+        )
+        self.assertEqual("".join(chunks).rstrip("\0"), "Привет")
+
+    def test_unicode_preferred(self) -> None:
+        self.clipboard.set_many(
+            {
+                ClipboardFormat.CF_UNICODETEXT: "Unicode",
+                ClipboardFormat.CF_TEXT: b"ANSI",
+            }
+        )
+        self.assertEqual(self.clipboard.get_clipboard(), "Unicode")
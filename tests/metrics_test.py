@@ -0,0 +1,174 @@
+"""Metrics tests."""
+
+import unittest
+from typing import Optional
+
+from clipboard import Clipboard
+from clipboard import MetricsRegistry
+from clipboard import OpenClipboardError
+from clipboard import RetryPolicy
+from clipboard import add_trace_hook
+from clipboard import disable_metrics
+from clipboard import enable_metrics
+from clipboard import get_metrics
+from clipboard import remove_trace_hook
+from clipboard import tracing
+from clipboard.backends.memory import MemoryBackend
+from clipboard.formats import get_format_registry
+from clipboard.metrics import Counter
+from clipboard.metrics import Histogram
+
+
+class FlakyBackend(MemoryBackend):
+    """Fails to open the clipboard a number of times first."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures: int = failures
+
+    def open_clipboard(self, hwnd: Optional[int] = None) -> bool:
+        if self.failures:
+            self.failures -= 1
+            return False
+        return super().open_clipboard(hwnd)
+
+
+class TestCounter(unittest.TestCase):
+    def test_inc(self) -> None:
+        counter = Counter("test_total", "Test.")
+        counter.inc()
+        counter.inc(2, format="CF_TEXT")
+        counter.inc(3, format="CF_TEXT")
+        self.assertEqual(counter.value(), 1)
+        self.assertEqual(counter.value(format="CF_TEXT"), 5)
+        with self.assertRaises(ValueError):
+            counter.inc(-1)
+
+    def test_samples(self) -> None:
+        counter = Counter("test_total", "Test.")
+        counter.inc(1.5, format='a "b"')
+        self.assertEqual(counter.samples(), ['test_total{format="a \\"b\\""} 1.5'])
+
+
+class TestHistogram(unittest.TestCase):
+    def test_observe(self) -> None:
+        histogram = Histogram("test_seconds", "Test.", (1, 2, 4))
+        for value in (0.5, 1, 1.5, 3, 10):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()[()]
+        self.assertEqual(snapshot["count"], 5)
+        self.assertEqual(snapshot["sum"], 16)
+        self.assertEqual(snapshot["buckets"], {1: 2, 2: 3, 4: 4, float("inf"): 5})
+
+    def test_quantile(self) -> None:
+        histogram = Histogram("test_seconds", "Test.", (1, 2))
+        self.assertIsNone(histogram.quantile(0.5))
+        for _ in range(100):
+            histogram.observe(1.5)
+        self.assertEqual(histogram.quantile(0.5), 1.5)
+        self.assertEqual(histogram.quantile(0.99), 1.99)
+
+    def test_buckets(self) -> None:
+        with self.assertRaises(ValueError):
+            Histogram("test_seconds", "Test.", ())
+        with self.assertRaises(ValueError):
+            Histogram("test_seconds", "Test.", (2, 1))
+
+    def test_samples(self) -> None:
+        histogram = Histogram("test_seconds", "Test.", (1,))
+        histogram.observe(0.5, operation="get")
+        self.assertEqual(
+            histogram.samples(),
+            [
+                'test_seconds_bucket{operation="get",le="1"} 1',
+                'test_seconds_bucket{operation="get",le="+Inf"} 1',
+                'test_seconds_sum{operation="get"} 0.5',
+                'test_seconds_count{operation="get"} 1',
+            ],
+        )
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metrics = MetricsRegistry()
+        add_trace_hook(self.metrics)
+        self.addCleanup(remove_trace_hook, self.metrics)
+
+    def test_get_and_set(self) -> None:
+        clipboard = Clipboard(backend=MemoryBackend())
+        clipboard.set_clipboard("Hello")
+        clipboard.get_clipboard()
+
+        self.assertEqual(self.metrics.opens.value(), 2)
+        self.assertEqual(self.metrics.written_bytes.value(format="CF_UNICODETEXT"), 10)
+        self.assertEqual(self.metrics.read_bytes.value(format="CF_UNICODETEXT"), 12)
+        latency = self.metrics.latency.snapshot()
+        self.assertEqual(latency[(("operation", "get"),)]["count"], 1)
+        self.assertEqual(latency[(("operation", "set"),)]["count"], 1)
+
+    def test_writer(self) -> None:
+        clipboard = Clipboard(backend=MemoryBackend())
+        with clipboard.open_writer() as writer:
+            writer.write("Hello")
+            writer.write(", World")
+        self.assertEqual(self.metrics.written_bytes.value(format="CF_UNICODETEXT"), 24)
+
+    def test_format_name(self) -> None:
+        """Named as registered with the clipboard's own backend."""
+        clipboard = Clipboard(backend=MemoryBackend())
+        registry = get_format_registry(clipboard.backend)
+        # Registered in the same order as the process-wide formats, so their
+        # ids match `ClipboardFormat`.
+        for name in ("HTML Format", "Rich Text Format", "PNG"):
+            registry.register(name)
+        format = registry.register("Custom Format")
+        clipboard.set_clipboard(b"data", format=format)
+        clipboard.get_clipboard(format)
+        self.assertEqual(self.metrics.written_bytes.value(format="Custom Format"), 4)
+        self.assertEqual(self.metrics.read_bytes.value(format="Custom Format"), 5)
+
+    def test_retries(self) -> None:
+        clipboard = Clipboard(
+            backend=FlakyBackend(failures=2),
+            retry_policy=RetryPolicy(max_attempts=3, delay=0),
+        )
+        clipboard.set_clipboard("Hello")
+        self.assertEqual(self.metrics.open_retries.value(), 2)
+        self.assertEqual(self.metrics.open_attempts.quantile(1.0), 3)
+
+    def test_open_errors(self) -> None:
+        clipboard = Clipboard(
+            backend=FlakyBackend(failures=2),
+            retry_policy=RetryPolicy(max_attempts=2, delay=0),
+        )
+        with self.assertRaises(OpenClipboardError):
+            clipboard.__enter__()
+        self.assertEqual(self.metrics.open_errors.value(), 1)
+
+    def test_export(self) -> None:
+        Clipboard(backend=MemoryBackend()).set_clipboard("Hello")
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["clipboard_opens_total"], {(): 1})
+
+        text = self.metrics.to_prometheus()
+        self.assertIn("# TYPE clipboard_opens_total counter\n", text)
+        self.assertIn("clipboard_opens_total 1\n", text)
+        self.assertIn(
+            'clipboard_written_bytes_total{format="CF_UNICODETEXT"} 10\n', text
+        )
+        self.assertIn('clipboard_operation_seconds_count{operation="set"} 1\n', text)
+
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot()["clipboard_opens_total"], {})
+
+
+class TestEnableMetrics(unittest.TestCase):
+    def test_enable(self) -> None:
+        self.assertNotIn(get_metrics(), tracing._hooks)
+        self.assertIs(enable_metrics(), get_metrics())
+        enable_metrics()
+        try:
+            self.assertEqual(tracing._hooks.count(get_metrics()), 1)
+        finally:
+            disable_metrics()
+        self.assertNotIn(get_metrics(), tracing._hooks)
@@ -0,0 +1,176 @@
+"""Clipboard monitor tests."""
+
+import asyncio
+import queue
+import threading
+import unittest
+from typing import List
+from unittest import mock
+
+from clipboard import Clipboard
+from clipboard import ClipboardEvent
+from clipboard import ClipboardFormat
+from clipboard import ClipboardMonitor
+from clipboard import FormatNotSupportedError
+from clipboard import get_broker
+from clipboard.backends.memory import MemoryBackend
+
+
+TIMEOUT = 5.0
+
+
+class TestWaitForChange(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = MemoryBackend()
+
+    def test_timeout(self) -> None:
+        sequence_number = self.backend.get_clipboard_sequence_number()
+        self.assertEqual(
+            self.backend.wait_for_change(sequence_number, 0.01), sequence_number
+        )
+
+    def test_published_on_close(self) -> None:
+        """Waiters see a change once the clipboard is closed."""
+        sequence_number = self.backend.get_clipboard_sequence_number()
+        self.backend.open_clipboard()
+        self.backend.empty_clipboard()
+        self.assertEqual(
+            self.backend.wait_for_change(sequence_number, 0.01), sequence_number
+        )
+        self.backend.close_clipboard()
+        self.assertEqual(
+            self.backend.wait_for_change(sequence_number, 0.01),
+            self.backend.get_clipboard_sequence_number(),
+        )
+
+    def test_wakes_waiter(self) -> None:
+        sequence_number = self.backend.get_clipboard_sequence_number()
+        results: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+        thread = threading.Thread(
+            target=lambda: results.put(
+                self.backend.wait_for_change(sequence_number, TIMEOUT)
+            )
+        )
+        thread.start()
+        Clipboard(backend=self.backend).set_clipboard("Hello")
+        thread.join()
+        self.assertNotEqual(results.get(), sequence_number)
+
+
+class TestClipboardMonitor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = MemoryBackend()
+        self.clipboard = Clipboard(backend=self.backend)
+
+    def test_callback(self) -> None:
+        events: "queue.SimpleQueue[ClipboardEvent]" = queue.SimpleQueue()
+        with ClipboardMonitor(events.put, formats=["text"], backend=self.backend):
+            self.clipboard.set_clipboard("Hello")
+            event = events.get(timeout=TIMEOUT)
+
+        self.assertEqual(
+            event.sequence_number, self.backend.get_clipboard_sequence_number()
+        )
+        assert event.snapshot is not None
+        self.assertEqual(event.snapshot[ClipboardFormat.CF_UNICODETEXT], "Hello")
+
+    def test_snapshot_on_broker(self) -> None:
+        on_broker: "queue.SimpleQueue[bool]" = queue.SimpleQueue()
+        snapshot = Clipboard.snapshot
+
+        def recording_snapshot(clipboard: Clipboard, *args, **kwargs):
+            on_broker.put(get_broker().on_worker_thread)
+            return snapshot(clipboard, *args, **kwargs)
+
+        events: "queue.SimpleQueue[ClipboardEvent]" = queue.SimpleQueue()
+        with mock.patch.object(Clipboard, "snapshot", recording_snapshot):
+            with ClipboardMonitor(events.put, formats=["text"], backend=self.backend):
+                self.clipboard.set_clipboard("Hello")
+                events.get(timeout=TIMEOUT)
+
+        self.assertTrue(on_broker.get_nowait())
+
+    def test_no_formats(self) -> None:
+        events: "queue.SimpleQueue[ClipboardEvent]" = queue.SimpleQueue()
+        with ClipboardMonitor(events.put, backend=self.backend):
+            self.clipboard.set_clipboard("Hello")
+            self.assertIsNone(events.get(timeout=TIMEOUT).snapshot)
+
+    def test_one_event_per_update(self) -> None:
+        """Setting several formats together is a single change."""
+        events: "queue.SimpleQueue[ClipboardEvent]" = queue.SimpleQueue()
+        with ClipboardMonitor(events.put, backend=self.backend):
+            self.clipboard.set_many({"text": "Hello", "rtf": "{\\rtf1}"})
+            events.get(timeout=TIMEOUT)
+            self.clipboard.set_clipboard("World")
+            events.get(timeout=TIMEOUT)
+        self.assertTrue(events.empty())
+
+    def test_debounce(self) -> None:
+        events: "queue.SimpleQueue[ClipboardEvent]" = queue.SimpleQueue()
+        monitor = ClipboardMonitor(
+            events.put, formats=["text"], debounce=0.2, backend=self.backend
+        )
+        with monitor:
+            for text in ("one", "two", "three"):
+                self.clipboard.set_clipboard(text)
+            event = events.get(timeout=TIMEOUT)
+        self.assertTrue(events.empty())
+        assert event.snapshot is not None
+        self.assertEqual(event.snapshot[ClipboardFormat.CF_UNICODETEXT], "three")
+
+    def test_polling(self) -> None:
+        events: "queue.SimpleQueue[ClipboardEvent]" = queue.SimpleQueue()
+        monitor = ClipboardMonitor(
+            events.put, backend=self.backend, poll=True, poll_interval=0.01
+        )
+        with monitor:
+            self.clipboard.set_clipboard("Hello")
+            events.get(timeout=TIMEOUT)
+
+    def test_remove_callback(self) -> None:
+        calls: List[ClipboardEvent] = []
+        monitor = ClipboardMonitor(backend=self.backend)
+        monitor.add_callback(calls.append)
+        monitor.remove_callback(calls.append)
+        with self.assertRaises(ValueError):
+            monitor.remove_callback(calls.append)
+
+    def test_iterator(self) -> None:
+        monitor = ClipboardMonitor(formats=["text"], backend=self.backend)
+        events = iter(monitor)
+        self.assertTrue(monitor.running)
+        self.clipboard.set_clipboard("Hello")
+        event = next(events)
+        assert event.snapshot is not None
+        self.assertEqual(event.snapshot[ClipboardFormat.CF_UNICODETEXT], "Hello")
+
+        monitor.stop()
+        self.assertFalse(monitor.running)
+        self.assertEqual(list(events), [])
+
+    def test_async_iterator(self) -> None:
+        monitor = ClipboardMonitor(formats=["text"], backend=self.backend)
+
+        async def first_event() -> ClipboardEvent:
+            events = monitor.__aiter__()
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.clipboard.set_clipboard, "Hello"
+            )
+            event = await asyncio.wait_for(events.__anext__(), TIMEOUT)
+            monitor.stop()
+            async for _ in events:
+                self.fail("Iteration continued after the monitor stopped.")
+            return event
+
+        event = asyncio.run(first_event())
+        assert event.snapshot is not None
+        self.assertEqual(event.snapshot[ClipboardFormat.CF_UNICODETEXT], "Hello")
+
+    def test_invalid_format(self) -> None:
+        with self.assertRaises(FormatNotSupportedError):
+            ClipboardMonitor(formats=["missing"], backend=self.backend)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,3 @@
-import platform
 import unittest
 
 from clipboard import Clipboard
@@ -8,12 +7,8 @@ from clipboard import set_clipboard
 
 
 # Platform Settings
-if platform.system() == "Windows":
-    html_type_1 = ClipboardFormat.HTML_Format
-elif platform.system() == "Linux":
-    raise unittest.SkipTest(f"Platform not supported {platform.system()}.")
-else:
-    raise unittest.SkipTest(f"Platform not supported {platform.system()}.")
+# Off Windows, tests run against the in-memory backend.
+html_type_1 = ClipboardFormat.HTML_Format
 
 
 class TestReadme(unittest.TestCase):
@@ -52,6 +47,97 @@ class TestReadme(unittest.TestCase):
             # HTML
             clipboard["html"] = "<h1>Hello World</h1>"
 
+    def test_snapshots(self) -> None:
+        """https://github.com/AceofSpades5757/clip-util?tab=readme-ov-file#snapshots"""
+        from clipboard import ClipboardSnapshot
+
+        set_clipboard("Hello World!")
+
+        snapshot: ClipboardSnapshot = Clipboard().snapshot()
+        for format_id, content in snapshot.items():
+            print(format_id, snapshot.sizes[format_id], content)
+
+        # Selected Formats
+        snapshot = Clipboard().snapshot(["text", "html"])
+        self.assertEqual(list(snapshot.values()), ["Hello World!"])
+
+    def test_reading_without_copying(self) -> None:
+        """https://github.com/AceofSpades5757/clip-util?tab=readme-ov-file#reading-without-copying"""
+        import hashlib
+
+        from clipboard.html_clipboard import parse_html_clipboard
+
+        clipboard = Clipboard()
+        clipboard["text"] = "Hello World!"
+
+        with clipboard.view(ClipboardFormat.CF_UNICODETEXT) as view:
+            digest = hashlib.sha256(view).hexdigest()
+        self.assertTrue(bool(digest))
+
+        clipboard["html"] = "<h1>Hello World</h1>"
+        with clipboard.view(ClipboardFormat.CF_HTML) as view:
+            fragment: str = parse_html_clipboard(view).fragment_text()
+        self.assertEqual(fragment, "<h1>Hello World</h1>")
+
+    def test_images(self) -> None:
+        """https://github.com/AceofSpades5757/clip-util?tab=readme-ov-file#images"""
+        import io
+
+        from clipboard import get_image
+        from clipboard import set_image
+        from clipboard.images import parse_dib
+
+        # A 1x1, 24-bit bitmap.
+        bmp = bytes.fromhex(
+            "424d3a000000000000003600000028000000010000000100000001001800"
+            "00000000040000000000000000000000000000000000000001020300"
+        )
+        set_image(bmp)
+
+        png: bytes = get_image()
+        self.assertTrue(png.startswith(b"\x89PNG"))
+        self.assertEqual(Clipboard().get_image("bmp"), bmp)
+
+        with Clipboard().view(ClipboardFormat.CF_DIB) as view:
+            bitmap = parse_dib(view)
+            self.assertEqual(bitmap.row(0), b"\x01\x02\x03")
+            file = io.BytesIO()
+            bitmap.write_png(file)
+            del bitmap
+        self.assertEqual(file.getvalue(), png)
+
+    def test_files(self) -> None:
+        """https://github.com/AceofSpades5757/clip-util?tab=readme-ov-file#files"""
+        from clipboard import get_files
+        from clipboard import set_files
+
+        set_files([r"C:\Users\me\report.docx", r"C:\Users\me\photo.png"])
+
+        paths: list[str] = get_files()
+        self.assertEqual(paths, [r"C:\Users\me\report.docx", r"C:\Users\me\photo.png"])
+
+    def test_text_encodings(self) -> None:
+        """https://github.com/AceofSpades5757/clip-util?tab=readme-ov-file#text-encodings"""
+        import struct
+        from typing import Optional
+
+        with Clipboard() as clipboard:
+            clipboard.set_many(
+                {
+                    ClipboardFormat.CF_TEXT: "Привет".encode("cp1251"),
+                    ClipboardFormat.CF_LOCALE: struct.pack("<I", 0x0419),
+                }
+            )
+
+        with Clipboard() as clipboard:
+            # The locale identifier (LCID), None if there is none
+            lcid: Optional[int] = clipboard.get_locale()
+
+            text: str = clipboard.get_clipboard(ClipboardFormat.CF_TEXT)
+
+        self.assertEqual(lcid, 0x0419)
+        self.assertEqual(text, "Привет")
+
     def test_clipboard_formats(self) -> None:
         """https://github.com/AceofSpades5757/clip-util?tab=readme-ov-file#clipboard-formats"""
         from clipboard import ClipboardFormat
@@ -0,0 +1,106 @@
+"""Retry policy tests."""
+
+import unittest
+from typing import List
+from typing import Optional
+
+from clipboard import Clipboard
+from clipboard import OpenClipboardError
+from clipboard import RetryPolicy
+from clipboard import get_contention_stats
+from clipboard import get_retry_policy
+from clipboard import set_retry_policy
+from clipboard.backends.memory import MemoryBackend
+
+
+class FlakyBackend(MemoryBackend):
+    """Fails to open the clipboard a number of times first."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures: int = failures
+
+    def open_clipboard(self, hwnd: Optional[int] = None) -> bool:
+        if self.failures:
+            self.failures -= 1
+            return False
+        return super().open_clipboard(hwnd)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_default(self) -> None:
+        self.assertEqual(list(RetryPolicy().waits()), [0.0, 0.01, 0.01])
+
+    def test_backoff(self) -> None:
+        policy = RetryPolicy(max_attempts=5, delay=0.01, backoff=2, max_delay=0.05)
+        self.assertEqual(list(policy.waits()), [0.0, 0.01, 0.02, 0.04, 0.05])
+
+    def test_jitter(self) -> None:
+        policy = RetryPolicy(max_attempts=50, delay=0.01, jitter=0.5)
+        waits: List[float] = list(policy.waits())[1:]
+        self.assertTrue(all(0.005 <= wait <= 0.015 for wait in waits))
+        self.assertGreater(len(set(waits)), 1)
+
+    def test_deadline(self) -> None:
+        policy = RetryPolicy(max_attempts=None, deadline=0.05, delay=0.01)
+        self.assertLessEqual(sum(policy.waits()), 0.05)
+
+    def test_invalid(self) -> None:
+        for kwargs in (
+            {"max_attempts": None},
+            {"max_attempts": 0},
+            {"delay": -1},
+            {"backoff": 0.5},
+            {"jitter": 2},
+        ):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                RetryPolicy(**kwargs)  # type: ignore
+
+    def test_global(self) -> None:
+        policy = RetryPolicy(max_attempts=5)
+        try:
+            set_retry_policy(policy)
+            self.assertIs(get_retry_policy(), policy)
+        finally:
+            set_retry_policy(None)
+        self.assertEqual(get_retry_policy().max_attempts, 3)
+
+
+class TestClipboardRetries(unittest.TestCase):
+    def setUp(self) -> None:
+        get_contention_stats().reset()
+
+    def test_retries(self) -> None:
+        clipboard = Clipboard(
+            backend=FlakyBackend(failures=2),
+            retry_policy=RetryPolicy(max_attempts=3, delay=0.001),
+        )
+        with clipboard:
+            self.assertTrue(clipboard.opened)
+        self.assertEqual(clipboard.open_attempts, 3)
+        self.assertGreater(clipboard.open_wait, 0)
+
+        stats = get_contention_stats().snapshot()
+        self.assertEqual(stats["opens"], 1)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["failures"], 0)
+
+    def test_failure(self) -> None:
+        clipboard = Clipboard(
+            backend=FlakyBackend(failures=5),
+            retry_policy=RetryPolicy(max_attempts=2, delay=0.001),
+        )
+        with self.assertRaises(OpenClipboardError):
+            clipboard.__enter__()
+        self.assertEqual(clipboard.open_attempts, 2)
+        self.assertEqual(get_contention_stats().snapshot()["failures"], 1)
+
+    def test_uncontended(self) -> None:
+        clipboard = Clipboard(backend=MemoryBackend())
+        with clipboard:
+            pass
+        self.assertEqual((clipboard.open_attempts, clipboard.open_wait), (1, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
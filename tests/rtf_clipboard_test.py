@@ -1,6 +1,5 @@
 """RTF tests."""
 
-import platform
 import unittest
 
 from clipboard import Clipboard
@@ -10,11 +9,6 @@ from clipboard import get_clipboard
 from clipboard import set_clipboard
 
 
-# Platform Settings
-if platform.system() != "Windows":
-    raise unittest.SkipTest(f"Platform not supported {platform.system()}.")
-
-
 class TestRTFClipboard(unittest.TestCase):
     def test_simple(self) -> None:
         rtf: str = r"{\rtf1\ansi \b hello world \b0 }"
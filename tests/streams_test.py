@@ -0,0 +1,179 @@
+"""Streaming tests."""
+
+import io
+import unittest
+
+from clipboard import Clipboard
+from clipboard import ClipboardFormat
+from clipboard.backends.memory import MemoryBackend
+from clipboard.html_clipboard import HTMLTemplate
+from clipboard.streams import MIN_CAPACITY
+
+
+class ReallocCountingBackend(MemoryBackend):
+    """Counts the calls resizing memory."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.realloc_calls: int = 0
+
+    def global_realloc(self, handle, size, flags):
+        self.realloc_calls += 1
+        return super().global_realloc(handle, size, flags)
+
+
+class TestClipboardWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = ReallocCountingBackend()
+        self.clipboard = Clipboard(backend=self.backend)
+
+    def test_text(self) -> None:
+        with self.clipboard.open_writer("text") as writer:
+            writer.write("Hello ")
+            writer.writelines(["Wörld", "!"])
+        self.assertTrue(writer.closed)
+        self.assertEqual(self.clipboard.get_clipboard("text"), "Hello Wörld!")
+
+    def test_split_surrogates(self) -> None:
+        """Chunks are encoded incrementally, so can split characters."""
+        with self.clipboard.open_writer("text") as writer:
+            writer.writelines("😀 emoji")
+        self.assertEqual(self.clipboard.get_clipboard("text"), "😀 emoji")
+
+    def test_growth(self) -> None:
+        chunk = b"x" * 1000
+        with self.clipboard.open_writer("rtf") as writer:
+            for _ in range(MIN_CAPACITY // 100):
+                writer.write(chunk)
+        content = self.clipboard.get_clipboard("rtf")
+        self.assertEqual(content, "x" * 1000 * (MIN_CAPACITY // 100))
+
+    def test_size_hint(self) -> None:
+        """Given the exact size, the memory is never grown."""
+        data = b"y" * (MIN_CAPACITY * 4)
+        with self.clipboard.open_writer("rtf", size_hint=len(data)) as writer:
+            writer.write_from(io.BytesIO(data), chunk_size=4096)
+        self.assertEqual(self.backend.realloc_calls, 0)
+
+        with self.clipboard.view("rtf") as view:
+            self.assertEqual(len(view), len(data) + 1)
+            self.assertEqual(bytes(view[:-1]), data)
+
+    def test_write_from_text(self) -> None:
+        with self.clipboard.open_writer("text") as writer:
+            writer.write_from(io.StringIO("Hello World!"), chunk_size=5)
+        self.assertEqual(self.clipboard.get_clipboard("text"), "Hello World!")
+
+    def test_html(self) -> None:
+        html = "<p>Hello</p>"
+        with self.clipboard.open_writer("html") as writer:
+            writer.write("<p>")
+            writer.write(b"Hello")
+            writer.write("</p>")
+        self.assertEqual(
+            self.clipboard.get_clipboard("html"), HTMLTemplate(html).encode().decode()
+        )
+
+    def test_empty(self) -> None:
+        self.clipboard.set_clipboard("Hello")
+        with self.clipboard as clipboard:
+            with clipboard.open_writer("rtf", empty=False) as writer:
+                writer.write("{\\rtf1}")
+            self.assertEqual(
+                clipboard.available_formats(),
+                [ClipboardFormat.CF_UNICODETEXT, ClipboardFormat.CF_RTF],
+            )
+
+    def test_abort(self) -> None:
+        self.clipboard.set_clipboard("Hello")
+        with self.assertRaises(RuntimeError):
+            with self.clipboard.open_writer("text") as writer:
+                writer.write("World")
+                raise RuntimeError
+        self.assertEqual(self.clipboard.get_clipboard("text"), "Hello")
+        with self.assertRaises(ValueError):
+            writer.write("!")
+        # Only the clipboard's own memory is left.
+        self.assertEqual(len(self.backend._buffers), 1)
+
+
+class TestChunkedRead(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clipboard = Clipboard(backend=MemoryBackend())
+
+    def test_iter_chunks(self) -> None:
+        self.clipboard.set_clipboard("Hello World!")
+        chunks = list(self.clipboard.iter_chunks("text", chunk_size=5))
+        self.assertEqual([len(chunk) for chunk in chunks], [5, 5, 5, 5, 4])
+        expected = "Hello World!".encode("utf-16-le")
+        self.assertEqual(b"".join(chunks), expected)  # type: ignore
+        self.assertFalse(self.clipboard.opened)
+        self.assertFalse(self.clipboard.locked)
+
+    def test_decode(self) -> None:
+        """Characters split between chunks are decoded whole."""
+        text = "😀 Hello Wörld!" * 10
+        self.clipboard.set_clipboard(text)
+        chunks = list(self.clipboard.iter_chunks("text", chunk_size=3, decode=True))
+        self.assertEqual("".join(chunks), text)  # type: ignore
+
+    def test_decode_html(self) -> None:
+        self.clipboard.set_clipboard("<p>Hello</p>", "html")
+        chunks = self.clipboard.iter_chunks("html", chunk_size=7, decode=True)
+        expected = self.clipboard.get_clipboard("html")
+        self.assertEqual("".join(chunks), expected)  # type: ignore
+
+    def test_raw(self) -> None:
+        data = bytes(range(256))
+        self.clipboard.set_clipboard(data, "rtf")
+        # Everything, but the terminator
+        chunks = self.clipboard.iter_chunks("rtf")
+        self.assertEqual(b"".join(chunks), data)  # type: ignore
+
+    def test_rtf(self) -> None:
+        rtf = "{\\rtf1\\ansi Hello World!}"
+        self.clipboard.set_clipboard(rtf, "rtf")
+        binary = io.BytesIO()
+        self.clipboard.read_into(binary, "rtf", chunk_size=4)
+        self.assertEqual(binary.getvalue(), rtf.encode())
+        text = io.StringIO()
+        self.clipboard.read_into(text, "rtf", chunk_size=4, decode=True)
+        self.assertEqual(text.getvalue(), self.clipboard.get_clipboard("rtf"))
+        self.assertEqual(text.getvalue(), rtf)
+
+    def test_ansi_text(self) -> None:
+        """CF_TEXT ends at its first null character, like `get_clipboard`."""
+        self.clipboard.set_clipboard(b"Hello\x00World", ClipboardFormat.CF_TEXT)
+        chunks = self.clipboard.iter_chunks(ClipboardFormat.CF_TEXT)
+        self.assertEqual(b"".join(chunks), b"Hello")  # type: ignore
+        chunks = self.clipboard.iter_chunks(ClipboardFormat.CF_TEXT, decode=True)
+        self.assertEqual("".join(chunks), "Hello")  # type: ignore
+
+    def test_closed_early(self) -> None:
+        self.clipboard.set_clipboard("Hello World!")
+        chunks = self.clipboard.iter_chunks("text", chunk_size=2)
+        next(chunks)
+        self.assertTrue(self.clipboard.locked)
+        chunks.close()
+        self.assertFalse(self.clipboard.opened)
+        self.assertFalse(self.clipboard.locked)
+
+    def test_read_into(self) -> None:
+        self.clipboard.set_clipboard("Hello World!")
+        binary = io.BytesIO()
+        self.assertEqual(self.clipboard.read_into(binary, "text", chunk_size=4), 24)
+        self.assertEqual(binary.getvalue(), "Hello World!".encode("utf-16-le"))
+
+        text = io.StringIO()
+        written = self.clipboard.read_into(text, "text", chunk_size=4, decode=True)
+        self.assertEqual(written, 12)
+        self.assertEqual(text.getvalue(), "Hello World!")
+
+    def test_invalid_chunk_size(self) -> None:
+        self.clipboard.set_clipboard("Hello World!")
+        with self.assertRaises(ValueError):
+            self.clipboard.read_into(io.BytesIO(), "text", chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
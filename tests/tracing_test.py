@@ -0,0 +1,122 @@
+"""Tracing tests."""
+
+import logging
+import unittest
+from typing import List
+from unittest import mock
+
+from clipboard import Clipboard
+from clipboard import OpenClipboardError
+from clipboard import RetryPolicy
+from clipboard import Span
+from clipboard import add_trace_hook
+from clipboard import remove_trace_hook
+from clipboard.backends.memory import MemoryBackend
+from clipboard.tracing import current_span
+from clipboard.tracing import trace
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.spans: List[Span] = []
+        add_trace_hook(self.spans.append)
+        self.addCleanup(remove_trace_hook, self.spans.append)
+        self.clipboard = Clipboard(backend=MemoryBackend())
+
+    def names(self) -> List[str]:
+        return [span.name for span in self.spans]
+
+    def test_get(self) -> None:
+        self.clipboard.set_clipboard("Hello")
+        del self.spans[:]
+
+        self.assertEqual(self.clipboard.get_clipboard(), "Hello")
+        self.assertEqual(self.names(), ["open", "lock", "decode", "close", "get"])
+        get = self.spans[-1]
+        lock, decode = self.spans[1:3]
+        self.assertIs(lock.parent, get)
+        self.assertEqual(lock.attributes, {"format": 13, "bytes": 12})
+        self.assertEqual(decode.attributes, {"format": 13, "bytes": 12})
+        self.assertEqual(self.spans[0].attributes, {"attempts": 1, "wait": 0.0})
+        self.assertGreaterEqual(get.duration, decode.duration)
+        self.assertIsNone(current_span())
+
+    def test_enumerate(self) -> None:
+        self.clipboard.set_clipboard("Hello")
+        self.clipboard.available_formats()
+        self.assertEqual(self.spans[-2].name, "enumerate")
+        self.assertEqual(self.spans[-2].attributes, {"formats": 1})
+
+    def test_set(self) -> None:
+        self.clipboard.set_clipboard("Hello")
+        self.assertEqual(self.names(), ["open", "empty", "copy", "close", "set"])
+        self.assertEqual(self.spans[2].attributes, {"format": 13, "bytes": 10})
+
+    def test_error(self) -> None:
+        clipboard = Clipboard(
+            backend=MemoryBackend(), retry_policy=RetryPolicy(max_attempts=2)
+        )
+        clipboard.backend.open_clipboard = lambda hwnd=None: False  # type: ignore
+        with self.assertRaises(OpenClipboardError):
+            clipboard.__enter__()
+        span = self.spans[-1]
+        self.assertEqual(span.name, "open")
+        self.assertIsInstance(span.error, OpenClipboardError)
+        self.assertEqual(span.attributes["attempts"], 2)
+
+    def test_failing_hook(self) -> None:
+        def fail(span: Span) -> None:
+            raise RuntimeError
+
+        add_trace_hook(fail)
+        self.addCleanup(remove_trace_hook, fail)
+        with self.assertLogs("clipboard.tracing", logging.ERROR):
+            self.clipboard.set_clipboard("Hello")
+        self.assertIn("set", self.names())
+
+    def test_remove(self) -> None:
+        remove_trace_hook(self.spans.append)
+        self.addCleanup(add_trace_hook, self.spans.append)
+        self.clipboard.set_clipboard("Hello")
+        self.assertEqual(self.spans, [])
+        with self.assertRaises(ValueError):
+            remove_trace_hook(self.spans.append)
+
+
+class TestDisabled(unittest.TestCase):
+    def test_no_span(self) -> None:
+        span = trace("get")
+        self.assertNotIsInstance(span, Span)
+        with span:
+            span.set(bytes=1)
+        self.assertIsNone(current_span())
+
+    def test_hot_path(self) -> None:
+        """Reading and writing do not build spans for locks, copies and decoding."""
+        from clipboard import tracing
+
+        self.assertFalse(tracing.active)
+        clipboard = Clipboard(backend=MemoryBackend())
+        with mock.patch("clipboard.clipboard.trace", wraps=trace) as traced:
+            clipboard.set_clipboard("Hello")
+            self.assertEqual(clipboard.get_clipboard(), "Hello")
+        names = [call.args[0] for call in traced.call_args_list]
+        self.assertNotIn("lock", names)
+        self.assertNotIn("copy", names)
+        self.assertNotIn("decode", names)
+
+    def test_active(self) -> None:
+        from clipboard import tracing
+
+        def hook(span: Span) -> None:
+            pass
+
+        add_trace_hook(hook)
+        self.assertTrue(tracing.active)
+        remove_trace_hook(hook)
+        self.assertFalse(tracing.active)
+
+    def test_no_handlers(self) -> None:
+        import clipboard.clipboard
+
+        self.assertEqual(logging.getLogger(clipboard.clipboard.__name__).handlers, [])